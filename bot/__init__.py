@@ -18,6 +18,8 @@ from time import sleep, time
 from tzlocal import get_localzone
 from uvloop import install
 
+from bot.helper.ext_utils.task_registry import TaskDict
+
 
 # from faulthandler import enable as faulthandler_enable
 # faulthandler_enable()
@@ -45,7 +47,7 @@ aria2 = ariaAPI(ariaClient(host='http://localhost', port=6800, secret=''))
 
 load_dotenv('config.env', override=True)
 
-Intervals = {'status': {}, 'qb': '', 'jd': ''}
+Intervals = {'status': '', 'qb': '', 'jd': ''}
 QbTorrents = {}
 jd_downloads = {}
 DRIVES_NAMES = []
@@ -71,7 +73,7 @@ cpu_eater_lock = Lock()
 subprocess_lock = Lock()
 bot_lock = Lock()
 status_dict = {}
-task_dict = {}
+task_dict = TaskDict()
 rss_dict = {}
 bot_dict = {}
 
@@ -220,6 +222,9 @@ PING_URL = environ.get('PING_URL', '')
 ENABLE_STREAM_LINK = environ.get('ENABLE_STREAM_LINK', 'False').lower() == 'true'
 STREAM_BASE_URL = environ.get('STREAM_BASE_URL', '').rstrip('/')
 STREAM_PORT = _to_int(environ.get('STREAM_PORT'), 80)
+STREAM_READ_AHEAD = _to_int(environ.get('STREAM_READ_AHEAD'), 4)
+STREAM_CACHE_MEMORY = _to_int(environ.get('STREAM_CACHE_MEMORY'), 128)
+STREAM_CACHE_DISK = _to_int(environ.get('STREAM_CACHE_DISK'), 512)
 QUEUE_COMPLETE = environ.get('QUEUE_COMPLETE', 'True').lower() == 'true'
 DISABLE_MIRROR_LEECH = environ.get('DISABLE_MIRROR_LEECH', '')
 INDEX_URL = environ.get('INDEX_URL', '').rstrip('/')
@@ -240,6 +245,8 @@ AS_DOCUMENT = environ.get('AS_DOCUMENT', 'False').lower() == 'true'
 SAVE_MESSAGE = environ.get('SAVE_MESSAGE', 'True').lower() == 'true'
 LEECH_FILENAME_PREFIX = environ.get('LEECH_FILENAME_PREFIX', '')
 LEECH_INFO_PIN = environ.get('LEECH_INFO_PIN', 'False').lower() == 'true'
+LEECH_UPLOAD_WORKERS = _to_int(environ.get('LEECH_UPLOAD_WORKERS'), 1)
+LEECH_HELPER_TOKENS = environ.get('LEECH_HELPER_TOKENS', '')
 USER_SESSION_STRING = environ.get('USER_SESSION_STRING', '')
 SAVE_SESSION_STRING = environ.get('SAVE_SESSION_STRING', '')
 USERBOT_LEECH = environ.get('USERBOT_LEECH', 'False').lower() == 'true'
@@ -290,6 +297,8 @@ LINK_LOG = _to_int(environ.get('LINK_LOG'), '')
 # ============================= LIMITS =================================
 EQUAL_SPLITS = environ.get('EQUAL_SPLITS', 'False').lower() == 'true'
 
+VIRTUAL_SPLIT = environ.get('VIRTUAL_SPLIT', 'True').lower() == 'true'
+
 CLONE_LIMIT = ''
 
 LEECH_LIMIT = environ.get('LEECH_LIMIT', '')
@@ -535,6 +544,9 @@ config_dict = {'BOT_TOKEN': BOT_TOKEN,
                'ENABLE_STREAM_LINK': ENABLE_STREAM_LINK,
                'STREAM_BASE_URL': STREAM_BASE_URL,
                'STREAM_PORT': STREAM_PORT,
+               'STREAM_READ_AHEAD': STREAM_READ_AHEAD,
+               'STREAM_CACHE_MEMORY': STREAM_CACHE_MEMORY,
+               'STREAM_CACHE_DISK': STREAM_CACHE_DISK,
                'DISABLE_MIRROR_LEECH': DISABLE_MIRROR_LEECH,
                'AUTHORIZED_CHATS': AUTHORIZED_CHATS,
                'SUDO_USERS': SUDO_USERS,
@@ -554,6 +566,8 @@ config_dict = {'BOT_TOKEN': BOT_TOKEN,
                'SAVE_MESSAGE': SAVE_MESSAGE,
                'LEECH_FILENAME_PREFIX': LEECH_FILENAME_PREFIX,
                'LEECH_INFO_PIN': LEECH_INFO_PIN,
+               'LEECH_UPLOAD_WORKERS': LEECH_UPLOAD_WORKERS,
+               'LEECH_HELPER_TOKENS': LEECH_HELPER_TOKENS,
                'USER_SESSION_STRING': USER_SESSION_STRING,
                'SAVE_SESSION_STRING': SAVE_SESSION_STRING,
                'USERBOT_LEECH': USERBOT_LEECH,
@@ -587,6 +601,7 @@ config_dict = {'BOT_TOKEN': BOT_TOKEN,
                'LINK_LOG': LINK_LOG,
                # LIMITS
                'EQUAL_SPLITS': EQUAL_SPLITS,
+               'VIRTUAL_SPLIT': VIRTUAL_SPLIT,
                'DAILY_LIMIT_SIZE': DAILY_LIMIT_SIZE,
                'CLONE_LIMIT': CLONE_LIMIT,
                'LEECH_LIMIT': LEECH_LIMIT,
@@ -4,7 +4,6 @@ from asyncio import create_subprocess_exec, gather
 from heroku3 import from_key
 from os import execl as osexecl
 from platform import system, architecture, release
-from psutil import disk_usage, cpu_percent, swap_memory, cpu_count, virtual_memory, net_io_counters, boot_time
 from pyrogram import Client
 from pyrogram.filters import command, regex, new_chat_members, left_chat_member
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
@@ -15,11 +14,11 @@ from sys import executable
 from time import time
 from uuid import uuid4
 
-from psutil import boot_time, cpu_count, cpu_freq, cpu_percent, disk_usage, swap_memory, virtual_memory, net_io_counters
+from psutil import boot_time, cpu_count
 from bot import bot, bot_loop, bot_dict, bot_lock, bot_name, botStartTime, Intervals, user_data, config_dict, scheduler, LOGGER, DATABASE_URL, INCOMPLETE_TASK_NOTIFIER, ARIA_NAME, QBIT_NAME, FFMPEG_NAME
 from bot.helper.ext_utils.argo_tunnel import ping_base_route, kill_route
 from bot.helper.ext_utils.bot_utils import cmd_exec, sync_to_async, new_task, update_user_ldata
-from bot.helper.ext_utils.conf_loads import intialize_userbot, intialize_savebot
+from bot.helper.ext_utils.conf_loads import intialize_userbot, intialize_savebot, intialize_helpers
 from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.files_utils import clean_all, exit_clean_up, clean_target
 from bot.helper.ext_utils.help_messages import HelpString, get_help_button
@@ -27,15 +26,17 @@ from bot.helper.ext_utils.jdownloader_booter import jdownloader
 from bot.helper.ext_utils.links_utils import is_media
 from bot.helper.ext_utils.shortenurl import short_url
 from bot.helper.ext_utils.status_utils import get_readable_file_size, get_readable_time, get_progress_bar_string
+from bot.helper.ext_utils.sys_metrics import sys_metrics
 from bot.helper.ext_utils.telegraph_helper import telegraph
 from bot.helper.listeners.aria2_listener import start_aria2_listener
 from bot.helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
+from bot.helper.stream_utils.chunk_cache import chunk_cache
 from bot.helper.stream_utils.file_properties import gen_link
 from bot.helper.stream_utils.web_services import start_server, server
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.filters import CustomFilters
-from bot.helper.telegram_helper.message_utils import limit, sendMessage, editMessage, sendFile, auto_delete_message, sendingMessage, deleteMessage, editMarkup, editPhoto, sendCustom, editCustom, copyMessage
+from bot.helper.telegram_helper.message_utils import limit, sendMessage, editMessage, sendFile, auto_delete_message, sendingMessage, deleteMessage, editMarkup, editPhoto, sendCustom, editCustom, copyMessage, request_scheduler
 from bot.modules import (authorize, bot_settings, clone, gd_count, gd_delete, multi_search, cancel_task, mirror_leech, speed_test, status, torrent_search, torrent_select, fast_download, resume_task,
                          user_settings, ytdlp, shell, rss, wayback, hash, bypass, scrapper, purge, broadcase, info, misc_tools, backup, join_chat, media_info, ddls, save_message)
 
@@ -47,7 +48,9 @@ async def stats(_, message: Message):
         last_commit = last_commit[0]
     else:
         last_commit = 'No UPSTREAM_REPO'
-    cpu, mem, disk, swap = f'{cpu_percent(interval=1)}%', f'{virtual_memory().percent}%', f'{disk_usage("/")[3]}%', f'{swap_memory().percent}%'
+    sample, rates = sys_metrics.latest(), sys_metrics.rates()
+    cpu, mem, disk, swap = f'{sample.cpu}%', f'{sample.mem}%', f'{sample.disk}%', f'{sample.swap}%'
+    queue, cache = request_scheduler.stats(), chunk_cache.stats()
     msg = f'''
 <b>UPSTREAM REPO AND BOT STATUS</b>
 <b>🌚 Commit Date:</b> {last_commit}
@@ -56,20 +59,22 @@ async def stats(_, message: Message):
 <b>SYSTEM STATUS</b>
 <b>🌚 Total Cores:</b> {cpu_count(logical=True)}
 <b>🌚 Physical Cores:</b> {cpu_count(logical=False)}
-<b>🌚 Upload:</b> {get_readable_file_size(net_io_counters().bytes_sent)}
-<b>🌚 Download:</b> {get_readable_file_size(net_io_counters().bytes_recv)}
-<b>🌚 Disk Free:</b> {get_readable_file_size(disk_usage('/')[2])}
-<b>🌚 Disk Used:</b> {get_readable_file_size(disk_usage('/')[1])}
-<b>🌚 Disk Space:</b> {get_readable_file_size(disk_usage('/')[0])}
-<b>🌚 Memory Free:</b> {get_readable_file_size(virtual_memory().available)}
-<b>🌚 Memory Used:</b> {get_readable_file_size(virtual_memory().used)}
-<b>🌚 Memory Swap:</b> {get_readable_file_size(swap_memory().total)}
-<b>🌚 Memory Total:</b> {get_readable_file_size(virtual_memory().total)}
+<b>🌚 Upload:</b> {get_readable_file_size(sample.sent)} ({get_readable_file_size(rates.ul)}/s)
+<b>🌚 Download:</b> {get_readable_file_size(sample.recv)} ({get_readable_file_size(rates.dl)}/s)
+<b>🌚 Disk Free:</b> {get_readable_file_size(sample.disk_free)}
+<b>🌚 Disk Used:</b> {get_readable_file_size(sample.disk_used)}
+<b>🌚 Disk Space:</b> {get_readable_file_size(sample.disk_total)}
+<b>🌚 Memory Free:</b> {get_readable_file_size(sample.mem_free)}
+<b>🌚 Memory Used:</b> {get_readable_file_size(sample.mem_used)}
+<b>🌚 Memory Swap:</b> {get_readable_file_size(sample.swap_total)}
+<b>🌚 Memory Total:</b> {get_readable_file_size(sample.mem_total)}
 <b>🌚 CPU:</b> {get_progress_bar_string(cpu)} {cpu}
 <b>🌚 RAM:</b> {get_progress_bar_string(mem)} {mem}
 <b>🌚 DISK:</b> {get_progress_bar_string(disk)} {disk}
 <b>🌚 SWAP:</b> {get_progress_bar_string(swap)} {swap}
-<b>🌚 OS:</b> {system()}, {architecture()[0]}, {release()}\n
+<b>🌚 OS:</b> {system()}, {architecture()[0]}, {release()}
+<b>🌚 Send Queue:</b> {sum(queue['queued'])} ({'/'.join(map(str, queue['queued']))}), wait {queue['avg_wait']:.2f}s avg / {queue['max_wait']:.2f}s max
+<b>🌚 Stream Cache:</b> {cache['hits']} hits / {cache['misses']} misses, {get_readable_file_size(cache['memory_bytes'])} RAM, {get_readable_file_size(cache['disk_bytes'])} disk\n
 '''
     statsmsg = await sendingMessage(msg, message, config_dict['IMAGE_STATS'])
     await auto_delete_message(message, statsmsg)
@@ -186,8 +191,7 @@ async def restart(_, message: Message):
         if jd := Intervals['jd']:
             jd.cancel()
         if st := Intervals['status']:
-            for intvl in list(st.values()):
-                intvl.cancel()
+            st.cancel()
         await gather(sync_to_async(clean_all), server.cleanup())
         proc1 = await create_subprocess_exec('pkill', '-9', '-f', f'gunicorn|{ARIA_NAME}|{QBIT_NAME}|{FFMPEG_NAME}|gclone|java|alass')
         proc2 = await create_subprocess_exec('python3', 'update.py')
@@ -298,10 +302,11 @@ async def restart_notification():
         for cid, data in notifier_dict.items():
             msg = 'Restarted Successfully!' if cid == chat_id else 'Bot Restarted!'
             msg += premium_message
-            for tag, links in data.items():
+            for tag, tasks in data.items():
                 msg += f'\n\n{tag}: '
-                for index, link in enumerate(links, start=1):
-                    await resume_task.set_incomplte_task(cid, link)
+                for index, task in enumerate(tasks, start=1):
+                    link = task['_id'].split('#', 1)[0]
+                    await resume_task.set_incomplte_task(cid, link, task.get('text'), task.get('reply'))
                     msg += f" <a href='{link}'>{index}</a> |"
                     limit.text(msg)
                     if len(msg) - limit.total > 4090:
@@ -328,6 +333,7 @@ async def restart_notification():
 
 async def main():
     jdownloader.initiate()
+    sys_metrics.start()
     bot.add_handler(MessageHandler(start, filters=command(BotCommands.StartCommand)))
     bot.add_handler(MessageHandler(log, filters=command(BotCommands.LogCommand) & CustomFilters.owner))
     bot.add_handler(MessageHandler(restart, filters=command(BotCommands.RestartCommand) & CustomFilters.sudo))
@@ -340,6 +346,7 @@ async def main():
     await gather(set_command(),
                  start_server(),
                  intialize_userbot(False),
+                 intialize_helpers(False),
                  sync_to_async(clean_all),
                  torrent_search.initiate_search_tools(),
                  telegraph.create_account(),
@@ -348,6 +355,7 @@ async def main():
                  return_exceptions=True)
     await gather(intialize_savebot(config_dict['SAVE_SESSION_STRING'], False), restart_notification(), ping_base_route(), return_exceptions=True)
     LOGGER.info('Bot @%s Started!', bot_name)
+    bot_loop.create_task(broadcase.resume_broadcast())
     signal(SIGINT, exit_clean_up)
 
 
@@ -1,8 +1,10 @@
 from aiofiles.os import path as aiopath, makedirs, rename as aiorename
 from aioshutil import move
-from asyncio import sleep, gather, create_subprocess_exec
+from asyncio import gather, create_subprocess_exec
 from asyncio.subprocess import PIPE
+from copy import copy
 from glob import glob
+from itertools import count
 from natsort import natsorted
 from os import walk, path as ospath
 from pyrogram import Client
@@ -10,12 +12,12 @@ from pyrogram.enums import ChatMemberStatus
 from pyrogram.types import Message
 from secrets import token_urlsafe
 
-from bot import bot_name, bot_dict, bot_lock, config_dict, user_data, multi_tags, task_dict, task_dict_lock, cpu_eater_lock, subprocess_lock, GLOBAL_EXTENSION_FILTER, LOGGER, DEFAULT_SPLIT_SIZE, FFMPEG_NAME
+from bot import bot_name, bot_dict, bot_lock, config_dict, user_data, multi_tags, queued_dl, queue_dict_lock, task_dict, task_dict_lock, cpu_eater_lock, subprocess_lock, GLOBAL_EXTENSION_FILTER, LOGGER, DEFAULT_SPLIT_SIZE, FFMPEG_NAME
 from bot.helper.ext_utils.bot_utils import new_task, sync_to_async, is_premium_user, update_user_ldata, getSizeBytes
 from bot.helper.ext_utils.bulk_links import extractBulkLinks
 from bot.helper.ext_utils.conf_loads import intialize_savebot
 from bot.helper.ext_utils.exceptions import NotSupportedExtractionArchive
-from bot.helper.ext_utils.files_utils import is_archive, is_archive_split, is_first_archive_split, get_base_name, clean_target, get_path_size
+from bot.helper.ext_utils.files_utils import is_archive, is_archive_split, is_first_archive_split, get_archive_volumes, get_base_name, clean_target, get_path_size, communicate_7z
 from bot.helper.ext_utils.links_utils import is_gdrive_id, is_rclone_path, is_gdrive_link, is_tele_link
 from bot.helper.ext_utils.media_utils import createThumb, get_document_type, SampleVideo, createArchive, split_file
 from bot.helper.mirror_utils.gdrive_utlis.list import gdriveList
@@ -25,13 +27,16 @@ from bot.helper.mirror_utils.status_utils.ffmpeg_status import FFMpegStatus
 from bot.helper.mirror_utils.status_utils.split_status import SplitStatus
 from bot.helper.mirror_utils.status_utils.zip_status import ZipStatus
 from bot.helper.telegram_helper.bot_commands import BotCommands
-from bot.helper.telegram_helper.message_utils import deleteMessage, sendMessage, sendStatusMessage, get_tg_link_message, update_dynamic_status
+from bot.helper.telegram_helper.message_utils import deleteMessage, editMessage, sendMessage, sendStatusMessage, get_tg_link_message, update_dynamic_status
 from bot import bot_loop
 
+_sub_ids = count(1)
+_multi_notices = {}
+
 
 class TaskConfig:
     def __init__(self):
-        self.mid: int = self.message.id
+        self.mid: int = getattr(self.message, 'task_id', None) or self.message.id
         self.user_id: int = None
         self.user_dict: dict = {}
         self.dir: str | dict = f'{config_dict["DOWNLOAD_DIR"]}{self.mid}'
@@ -44,6 +49,7 @@ class TaskConfig:
         self.isRename: str = ''
         self.splitSize: int = 0
         self.maxSplitSize: int = 0
+        self.virtualSplits: dict = {}
         self.multi: int = 0
         self.isLeech = False
         self.isQbit = False
@@ -229,50 +235,72 @@ class TaskConfig:
         else:
             self.tag = self.message.from_user.mention
 
+    def _sub_message(self, text: str, reply_to: Message=None):
+        """In-process copy of the command message for one bulk/multi entry, with its own task id."""
+        message = copy(self.message)
+        message.text = text
+        message.reply_to_message = reply_to
+        message.reply_to_message_id = reply_to.id if reply_to else None
+        message.task_id = -next(_sub_ids)
+        return message
+
+    async def _next_replies(self):
+        start = self.message.reply_to_message_id + 1
+        try:
+            msgs = await self.client.get_messages(self.message.chat.id, list(range(start, start + min(self.multi + 2, 200))))
+        except Exception as e:
+            LOGGER.error(e)
+            return []
+        return [msg for msg in msgs if msg and not msg.empty and (msg.text or msg.caption or msg.media)]
+
+    async def _finish_multi(self, reason: str=''):
+        """Edit the bulk/multi notice into a summary once the last entry has been submitted or the chain stopped."""
+        if not (notice := _multi_notices.pop(self.multiTag, None)):
+            return
+        async with queue_dict_lock:
+            queued = sum(mid in queued_dl for mid in notice['mids'])
+        submitted = len(notice['mids'])
+        text = f'{self.tag}, submitted {submitted}/{notice["total"]} tasks, {queued} queued.'
+        if failed := notice['total'] - submitted:
+            text += f'\n{failed} not submitted: {reason}'
+        await editMessage(text, notice['msg'])
+
     @new_task
-    async def run_multi(self, input_list: list, folder_name: str, obj, retry=0):
-        await sleep(config_dict['MULTI_TIMEGAP'])
+    async def run_multi(self, input_list: list, folder_name: str, obj):
         if not self.multiTag and self.multi > 1:
             self.multiTag = token_urlsafe(3)
             multi_tags.add(self.multiTag)
-        elif self.multi <= 1:
+            msg = await sendMessage(f'{self.tag}, submitting {self.multi} tasks...\nCancel Multi: <code>/{BotCommands.CancelTaskCommand} {self.multiTag}</code>', self.message)
+            if isinstance(msg, Message):
+                _multi_notices[self.multiTag] = {'msg': msg, 'total': self.multi, 'mids': []}
+        if notice := _multi_notices.get(self.multiTag):
+            notice['mids'].append(self.mid)
+        if self.multi <= 1:
             multi_tags.discard(self.multiTag)
+            await self._finish_multi()
             return
         if self.multiTag and self.multiTag not in multi_tags:
-            await gather(sendMessage(f'{self.tag}, Multi Task has been cancelled!', self.message), sendStatusMessage(self.message))
+            await gather(sendMessage(f'{self.tag}, Multi Task has been cancelled!', self.message), sendStatusMessage(self.message),
+                         self._finish_multi('cancelled'))
             return
         if len(self.bulk) != 0:
             msg = input_list[:1]
             msg.append(f"{self.bulk[0]} -i {self.multi - 1} {self.options}")
-            msgts = ' '.join(msg)
-            if self.multi > 2:
-                msgts += f'\nCancel Multi: <code>/{BotCommands.CancelTaskCommand} {self.multiTag}</code>'
-            nextmsg = await sendMessage(msgts, self.message)
+            nextmsg = self._sub_message(' '.join(msg))
         else:
             msg = [s.strip() for s in input_list]
             index = msg.index('-i')
             msg[index + 1] = f'{self.multi - 1}'
-            try:
-                nextmsg = await self.client.get_messages(self.message.chat.id, self.message.reply_to_message_id + 1)
-            except Exception as e:
-                LOGGER.error(e)
-                await sendMessage(f'Failed fetch next message to run multi, ERROR: {e}!', self.message)
-                return
-            msgts = ' '.join(msg)
-            if self.multi > 2:
-                msgts += f'\nCancel Multi: <code>/{BotCommands.CancelTaskCommand} {self.multiTag}</code>'
-            nextmsg = await sendMessage(msgts, nextmsg)
-            if not nextmsg:
-                if retry < 3:
-                    self.message.reply_to_message_id = self.message.reply_to_message_id + 1
-                    self.run_multi(input_list, folder_name, obj, retry + 1)
-                else:
-                    await sendMessage('Failed fetch next message to run multi, mostly have empty/invalid message between link/file!', self.message)
+            if not (replies := getattr(self.message, 'multi_replies', None)):
+                replies = await self._next_replies()
+            if not replies:
+                await gather(sendMessage('Failed fetch next message to run multi, mostly have empty/invalid message between link/file!', self.message),
+                             self._finish_multi('failed to fetch the next message'))
                 return
-        nextmsg = await self.client.get_messages(self.message.chat.id, nextmsg.id)
+            nextmsg = self._sub_message(' '.join(msg), replies[0])
+            nextmsg.multi_replies = replies[1:]
         if folder_name:
-            self.sameDir['tasks'].add(nextmsg.id)
-        nextmsg.from_user = self.message.from_user
+            self.sameDir['tasks'].add(nextmsg.task_id)
         obj(self.client, nextmsg, self.isQbit, self.isJd, self.isLeech, self.vidMode, self.sameDir, self.bulk, self.multiTag, self.options).newEvent()
 
     async def initBulk(self, input_list: list[str], bulk_start: str, bulk_end: str, obj):
@@ -288,9 +316,7 @@ class TaskConfig:
                 del self.options[index]
             self.options = ' '.join(self.options)
             b_msg.append(f'{self.bulk[0]} -i {len(self.bulk)} {self.options}')
-            nextmsg = await sendMessage(' '.join(b_msg), self.message)
-            nextmsg = await self.client.get_messages(self.message.chat.id, nextmsg.id)
-            nextmsg.from_user = self.message.from_user
+            nextmsg = self._sub_message(' '.join(b_msg))
             obj(self.client, nextmsg, self.isQbit, self.isJd, self.isLeech, self.vidMode, self.sameDir, self.bulk, self.multiTag, self.options).newEvent()
         except Exception as e:
             LOGGER.error(e)
@@ -317,9 +343,12 @@ class TaskConfig:
     async def preName(self, path: str):
         return path
 
-    async def editMetadata(self, path: str, gid: str):
+    async def editMetadata(self, path: str, gid: str, plan=None):
         if not (metadata := self.user_dict.get('metadata')):
             return
+        if plan and plan.path == path:
+            plan.title, plan.clean_metadata = metadata, bool(self.user_dict.get('clean_metadata'))
+            return
         self.newDir = f'{self.dir}10000'
         await makedirs(self.newDir, exist_ok=True)
 
@@ -379,19 +408,22 @@ class TaskConfig:
                     up_path = ospath.join(self.newDir, self.name)
                 else:
                     up_path = dl_path
+                offset = 0
                 for dirpath, _, files in await sync_to_async(walk, dl_path, topdown=False):
                     for file_ in natsorted(files):
                         if is_first_archive_split(file_) or is_archive(file_) and not file_.endswith('.rar'):
                             f_path = ospath.join(dirpath, file_)
                             t_path = dirpath.replace(self.dir, self.newDir) if self.seed else dirpath
-                            cmd = ['7z', 'x', f'-p{pswd}', f_path, f'-o{t_path}', '-aot', '-xr!@PaxHeader']
+                            cmd = ['7z', 'x', f'-p{pswd}', f_path, f'-o{t_path}', '-aot', '-xr!@PaxHeader', '-bsp1', '-bso0']
                             if not pswd:
                                 del cmd[2]
+                            part_size = sum([await aiopath.getsize(ospath.join(dirpath, volume)) for volume in get_archive_volumes(file_, files)])
                             async with subprocess_lock:
                                 if self.suproc == 'cancelled':
                                     return
-                                self.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
-                            _, stderr = await self.suproc.communicate()
+                                self.suproc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+                            stderr = await communicate_7z(self.suproc, status, part_size, offset)
+                            offset += part_size
                             code = self.suproc.returncode
                             if code == -9:
                                 return
@@ -408,14 +440,14 @@ class TaskConfig:
                 if self.seed:
                     self.newDir = f'{self.dir}10000'
                     up_path = up_path.replace(self.dir, self.newDir)
-                cmd = ['7z', 'x', f'-p{pswd}', dl_path, f'-o{up_path}', '-aot', '-xr!@PaxHeader']
+                cmd = ['7z', 'x', f'-p{pswd}', dl_path, f'-o{up_path}', '-aot', '-xr!@PaxHeader', '-bsp1', '-bso0']
                 if not pswd:
                     del cmd[2]
                 async with subprocess_lock:
                     if self.suproc == 'cancelled':
                         return
-                    self.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
-                _, stderr = await self.suproc.communicate()
+                    self.suproc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+                stderr = await communicate_7z(self.suproc, status, size)
                 code = self.suproc.returncode
                 if code == -9:
                     return
@@ -460,13 +492,13 @@ class TaskConfig:
                 up_path = ospath.join(zfpart, f'{self.name}.zip')
             else:
                 up_path = f'{dl_path}.zip'
-            res = await createArchive(self, dl_path, up_path, size, pswd, zipmode == 'zfpart')
+            res = await createArchive(self, status, dl_path, up_path, size, pswd, zipmode == 'zfpart')
             if not res:
                 return
             return zfpart or up_path
 
         self.seed = False
-        org_path, archived = dl_path, []
+        org_path, org_size, archived = dl_path, size, []
         for dirpath, _, files in await sync_to_async(walk, self.dir):
             for file_ in natsorted(files):
                 if self.suproc == 'cancelled':
@@ -480,12 +512,13 @@ class TaskConfig:
                 size = await get_path_size(fpath)
                 self.newDir = f'{self.dir}10000'
                 dest_path = ospath.join(self.newDir, f'{file_}.zip')
+                status = ZipStatus(self, size, gid, fpath, org_size)
                 async with task_dict_lock:
-                    task_dict[self.mid] = ZipStatus(self, size, gid, fpath)
+                    task_dict[self.mid] = status
                 if zipmode == 'zeach':
-                    archived.append(await createArchive(self, fpath, dest_path, size, pswd))
+                    archived.append(await createArchive(self, status, fpath, dest_path, size, pswd))
                 elif zipmode == 'zpart' or (zipmode == 'auto' and int(size) > self.splitSize):
-                    archived.append(await createArchive(self, fpath, dest_path, size, pswd, True))
+                    archived.append(await createArchive(self, status, fpath, dest_path, size, pswd, True))
                 for item in glob(f'{self.newDir}/*'):
                     await move(item, dirpath)
                 await clean_target(self.newDir)
@@ -506,9 +539,11 @@ class TaskConfig:
                         async with task_dict_lock:
                             task_dict[self.mid] = sp
                         LOGGER.info('Splitting (%s): %s', self.splitSize, self.name)
-                    res = await split_file(f_path, f_size, dirpath, self.splitSize, self, sp)
+                    res = await split_file(f_path, f_size, self.splitSize, self, sp)
                     if not res:
                         return
+                    if res == 'virtual':
+                        continue
                     if res == 'errored':
                         if f_size <= self.maxSplitSize:
                             continue
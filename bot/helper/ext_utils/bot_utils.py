@@ -30,6 +30,44 @@ class setInterval:
         self.task.cancel()
 
 
+class TokenBucket:
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.blocked_until = 0
+        self._tokens = capacity
+        self._stamp = time()
+
+    def _refill(self):
+        now = time()
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def try_acquire(self):
+        if time() < self.blocked_until:
+            return False
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self):
+        while not self.try_acquire():
+            await sleep(max(self.blocked_until - time(), (1 - self._tokens) / self.rate, 0.05))
+
+    def idle(self):
+        """Full and not blocked, so indistinguishable from a fresh bucket."""
+        self._refill()
+        return self._tokens >= self.capacity and time() >= self.blocked_until
+
+    def refund(self):
+        self._tokens = min(self.capacity, self._tokens + 1)
+
+    def penalize(self, seconds):
+        self.blocked_until = max(self.blocked_until, time() + seconds)
+
+
 class UserDaily:
     def __init__(self, user_id):
         self._user_id = user_id
@@ -68,8 +106,7 @@ def bt_selection_buttons(id_: int):
 
 async def get_user_task(user_id: int):
     async with task_dict_lock:
-        uid_count = sum(task.listener.user_id == user_id for task in task_dict.values())
-    return uid_count
+        return task_dict.user_count(user_id)
 
 
 def presuf_remname_name(user_dict: int, name: str):
@@ -0,0 +1,40 @@
+from aiofiles import open as aiopen
+from aiofiles.os import makedirs, remove, replace, path as aiopath
+from json import dumps, loads
+from os import path as ospath
+
+
+class Checkpoints:
+    """Small JSON progress records for long running owner commands.
+
+    Each record is rewritten atomically after every batch, so a stopped or
+    crashed run can pick up where it left off."""
+
+    def __init__(self, path='checkpoints'):
+        self._path = path
+
+    def _file(self, name, key):
+        return ospath.join(self._path, f'{name}_{key}.json')
+
+    async def load(self, name, key):
+        if not await aiopath.exists(file := self._file(name, key)):
+            return None
+        try:
+            async with aiopen(file, 'r') as f:
+                return loads(await f.read())
+        except (OSError, ValueError):
+            return None
+
+    async def save(self, name, key, data):
+        await makedirs(self._path, exist_ok=True)
+        file = self._file(name, key)
+        async with aiopen(f'{file}.tmp', 'w') as f:
+            await f.write(dumps(data))
+        await replace(f'{file}.tmp', file)
+
+    async def clear(self, name, key):
+        if await aiopath.exists(file := self._file(name, key)):
+            await remove(file)
+
+
+checkpoints = Checkpoints()
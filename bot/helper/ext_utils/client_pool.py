@@ -0,0 +1,65 @@
+from asyncio import sleep
+from contextlib import contextmanager
+from time import time
+
+
+class ClientPool:
+    """Load and FloodWait bookkeeping for a set of interchangeable clients.
+
+    Load is whatever unit the caller accounts in (bytes in flight for leech
+    uploads, open streams for the stream server); FloodWait penalties are
+    tracked per client so one throttled account does not stall the others."""
+
+    def __init__(self):
+        self._load = {}
+        self._blocked_until = {}
+
+    def _key(self, client):
+        return id(client)
+
+    def load(self, client):
+        return self._load.get(self._key(client), 0)
+
+    def blocked_for(self, client):
+        return max(self._blocked_until.get(self._key(client), 0) - time(), 0)
+
+    def pick(self, clients):
+        clients = [client for client in clients if client]
+        if not clients:
+            return None
+        return min(clients, key=lambda client: (self.blocked_for(client), self.load(client)))
+
+    def acquire(self, client, size=1):
+        key = self._key(client)
+        self._load[key] = self._load.get(key, 0) + size
+
+    def release(self, client, size=1):
+        key = self._key(client)
+        if (load := self._load.get(key, 0) - size) > 0:
+            self._load[key] = load
+        else:
+            self._load.pop(key, None)
+
+    @contextmanager
+    def use(self, client, size=1):
+        self.acquire(client, size)
+        try:
+            yield client
+        finally:
+            self.release(client, size)
+
+    def forget(self, client):
+        key = self._key(client)
+        self._load.pop(key, None)
+        self._blocked_until.pop(key, None)
+
+    def penalize(self, client, seconds):
+        key = self._key(client)
+        self._blocked_until[key] = max(self._blocked_until.get(key, 0), time() + seconds)
+
+    async def wait(self, client):
+        if seconds := self.blocked_for(client):
+            await sleep(seconds)
+
+
+client_pool = ClientPool()
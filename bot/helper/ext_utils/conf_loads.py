@@ -7,12 +7,14 @@ from pyrogram import Client
 from bot import (bot_dict, bot_lock, aria2, aria2_options, config_dict, user_data, task_dict, images, Intervals, kwargs,
                  LOGGER, GLOBAL_EXTENSION_FILTER, DEFAULT_SPLIT_SIZE, DRIVES_IDS, DRIVES_NAMES, INDEX_URLS, SHORTENER_APIS, SHORTENERES)
 from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async
+from bot.helper.ext_utils.client_pool import client_pool
 from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.files_utils import clean_target
 from bot.helper.ext_utils.task_manager import start_from_queued
 from bot.helper.mirror_utils.rclone_utils.serve import rclone_serve_booter
+from bot.helper.stream_utils.custom_dl import ByteStreamer, stream_pool
 from bot.helper.stream_utils.web_services import start_server, server
-from bot.helper.telegram_helper.message_utils import update_status_message
+from bot.helper.telegram_helper.message_utils import update_status_messages
 from bot.modules.rss import addJob
 from bot.modules.torrent_search import initiate_search_tools
 
@@ -26,12 +28,16 @@ default_values = {'AUTO_DELETE_MESSAGE_DURATION': 30,
                   'DISABLE_MIRROR_LEECH': '',
                   'USER_SESSION_STRING': '',
                   'LEECH_SPLIT_SIZE': DEFAULT_SPLIT_SIZE,
+                  'LEECH_UPLOAD_WORKERS': 1,
                   'STATUS_UPDATE_INTERVAL': 10,
                   'SEARCH_LIMIT': 0,
                   'STATUS_LIMIT': 10,
                   'RSS_DELAY': 900,
                   'CLOUD_LINK_FILTERS': '',
                   'UPSTREAM_BRANCH': 'main',
+                  'STREAM_READ_AHEAD': 4,
+                  'STREAM_CACHE_MEMORY': 128,
+                  'STREAM_CACHE_DISK': 512,
                   'FSUB_BUTTON_NAME': 'Join Group',
                   'CHANNEL_USERNAME': 'Teamleech',
                   'AUTHOR_NAME': 'Teamleech',
@@ -191,6 +197,12 @@ async def load_config():
     ENABLE_STREAM_LINK = environ.get('ENABLE_STREAM_LINK', 'False').lower() == 'true'
     STREAM_BASE_URL = environ.get('STREAM_BASE_URL', '').rstrip('/')
     STREAM_PORT = environ.get('STREAM_PORT', '')
+    STREAM_READ_AHEAD = environ.get('STREAM_READ_AHEAD', '')
+    STREAM_READ_AHEAD = int(STREAM_READ_AHEAD) if STREAM_READ_AHEAD else 4
+    STREAM_CACHE_MEMORY = environ.get('STREAM_CACHE_MEMORY', '')
+    STREAM_CACHE_MEMORY = int(STREAM_CACHE_MEMORY) if STREAM_CACHE_MEMORY else 128
+    STREAM_CACHE_DISK = environ.get('STREAM_CACHE_DISK', '')
+    STREAM_CACHE_DISK = int(STREAM_CACHE_DISK) if STREAM_CACHE_DISK else 512
 
     DISABLE_MIRROR_LEECH = environ.get('DISABLE_MIRROR_LEECH', '')
     INDEX_URL = environ.get('INDEX_URL', '').rstrip('/')
@@ -208,6 +220,9 @@ async def load_config():
     SAVE_MESSAGE = environ.get('SAVE_MESSAGE', 'False').lower() == 'true'
     LEECH_FILENAME_PREFIX = environ.get('LEECH_FILENAME_PREFIX', '')
     LEECH_INFO_PIN = environ.get('LEECH_INFO_PIN', 'False').lower() == 'true'
+    LEECH_UPLOAD_WORKERS = environ.get('LEECH_UPLOAD_WORKERS', '')
+    LEECH_UPLOAD_WORKERS = int(LEECH_UPLOAD_WORKERS) if LEECH_UPLOAD_WORKERS else 1
+    LEECH_HELPER_TOKENS = environ.get('LEECH_HELPER_TOKENS', '')
     USER_SESSION_STRING = environ.get('USER_SESSION_STRING', '')
     SAVE_SESSION_STRING = environ.get('SAVE_SESSION_STRING', '')
     USERBOT_LEECH = environ.get('USERBOT_LEECH', 'False').lower() == 'true'
@@ -230,9 +245,8 @@ async def load_config():
     START_MESSAGE = environ.get('START_MESSAGE', '')
     STATUS_UPDATE_INTERVAL = int(environ.get('STATUS_UPDATE_INTERVAL', 5))
     if len(task_dict) != 0 and (st := Intervals['status']):
-        for key, intvl in list(st.items()):
-            intvl.cancel()
-            Intervals['status'][key] = setInterval(STATUS_UPDATE_INTERVAL, update_status_message, key)
+        st.cancel()
+        Intervals['status'] = setInterval(STATUS_UPDATE_INTERVAL, update_status_messages)
 
     INCOMPLETE_TASK_NOTIFIER = environ.get('INCOMPLETE_TASK_NOTIFIER', 'True').lower() == 'true'
     if not INCOMPLETE_TASK_NOTIFIER and DATABASE_URL:
@@ -267,6 +281,8 @@ async def load_config():
     # ============================= LIMITS =================================
     EQUAL_SPLITS = environ.get('EQUAL_SPLITS', 'False').lower() == 'true'
 
+    VIRTUAL_SPLIT = environ.get('VIRTUAL_SPLIT', 'True').lower() == 'true'
+
     CLONE_LIMIT = environ.get('CLONE_LIMIT', '')
     CLONE_LIMIT = float(CLONE_LIMIT) if CLONE_LIMIT else ''
 
@@ -522,6 +538,9 @@ async def load_config():
                         'ENABLE_STREAM_LINK': ENABLE_STREAM_LINK,
                         'STREAM_BASE_URL': STREAM_BASE_URL,
                         'STREAM_PORT': STREAM_PORT,
+                        'STREAM_READ_AHEAD': STREAM_READ_AHEAD,
+                        'STREAM_CACHE_MEMORY': STREAM_CACHE_MEMORY,
+                        'STREAM_CACHE_DISK': STREAM_CACHE_DISK,
                         'DISABLE_MIRROR_LEECH': DISABLE_MIRROR_LEECH,
                         'AUTHORIZED_CHATS': AUTHORIZED_CHATS,
                         'SUDO_USERS': SUDO_USERS,
@@ -539,6 +558,8 @@ async def load_config():
                         'SAVE_MESSAGE': SAVE_MESSAGE,
                         'LEECH_FILENAME_PREFIX': LEECH_FILENAME_PREFIX,
                         'LEECH_INFO_PIN': LEECH_INFO_PIN,
+                        'LEECH_UPLOAD_WORKERS': LEECH_UPLOAD_WORKERS,
+                        'LEECH_HELPER_TOKENS': LEECH_HELPER_TOKENS,
                         'USER_SESSION_STRING': USER_SESSION_STRING,
                         'SAVE_SESSION_STRING': SAVE_SESSION_STRING,
                         'USERBOT_LEECH': USERBOT_LEECH,
@@ -572,6 +593,7 @@ async def load_config():
                         'LINK_LOG': LINK_LOG,
                         # LIMITS
                         'EQUAL_SPLITS': EQUAL_SPLITS,
+                        'VIRTUAL_SPLIT': VIRTUAL_SPLIT,
                         'DAILY_LIMIT_SIZE': DAILY_LIMIT_SIZE,
                         'CLONE_LIMIT': CLONE_LIMIT,
                         'LEECH_LIMIT': LEECH_LIMIT,
@@ -706,7 +728,7 @@ async def load_config():
     if DATABASE_URL:
         await DbManager().update_config(config_dict)
         LOGGER.info('Config update in database!!')
-    await gather(server.cleanup(), intialize_userbot(), initiate_search_tools(), start_from_queued(), rclone_serve_booter())
+    await gather(server.cleanup(), intialize_userbot(), intialize_helpers(), initiate_search_tools(), start_from_queued(), rclone_serve_booter())
     await start_server()
     addJob()
 
@@ -746,6 +768,26 @@ async def intialize_userbot(check=True):
     LOGGER.info('Leech Split Size: %s.', config_dict["LEECH_SPLIT_SIZE"])
 
 
+async def intialize_helpers(check=True):
+    async with bot_lock:
+        for helper in bot_dict.get('HELPERS', []):
+            client_pool.forget(helper)
+            stream_pool.forget(helper)
+            await ByteStreamer.drop_sessions(helper)
+            if check and helper.is_connected:
+                await helper.stop()
+        bot_dict['HELPERS'] = []
+        for index, token in enumerate(config_dict['LEECH_HELPER_TOKENS'].split(), start=1):
+            try:
+                helper = await Client(f'helper{index}', config_dict['TELEGRAM_API'], config_dict['TELEGRAM_HASH'],
+                                      bot_token=token, no_updates=True, in_memory=True, **kwargs).start()
+                bot_dict['HELPERS'].append(helper)
+            except Exception as e:
+                LOGGER.error('Helper bot %s: %s', index, e)
+    if bot_dict['HELPERS']:
+        LOGGER.info('Leech helper bots: %s', ', '.join(f'@{helper.me.username}' for helper in bot_dict['HELPERS']))
+
+
 async def intialize_savebot(session_string=None, check=True, user_id=None):
     async with bot_lock:
         if session_string == config_dict['USER_SESSION_STRING'] and (userbot := bot_dict.get('USERBOT')):
@@ -139,38 +139,67 @@ class DbManager:
             return
         await self._db.rss[bot_id].delete_one({'_id': user_id})
 
-    async def add_incomplete_task(self, cid, link, tag):
+    async def add_incomplete_task(self, cid, key, tag, text=None, reply_id=None):
         if self._err:
             return
-        await self._db.tasks[bot_id].insert_one({'_id': link, 'cid': cid, 'tag': tag})
+        task = {'_id': key, 'cid': cid, 'tag': tag}
+        if text:
+            task.update(text=text, reply=reply_id)
+        await self._db.tasks[bot_id].insert_one(task)
 
-    async def rm_complete_task(self, link):
+    async def rm_complete_task(self, key):
         if self._err:
             return
-        await self._db.tasks[bot_id].delete_one({'_id': link})
+        await self._db.tasks[bot_id].delete_one({'_id': key})
 
     async def get_incomplete_tasks(self):
         notifier_dict = {}
         if self._err:
             return notifier_dict
         if await self._db.tasks[bot_id].find_one():
-            # return a dict ==> {_id, cid, tag}
+            # return a dict ==> {_id, cid, tag[, text, reply]}
             rows = self._db.tasks[bot_id].find({})
             async for row in rows:
                 if row['cid'] in list(notifier_dict):
                     if row['tag'] in list(notifier_dict[row['cid']]):
-                        notifier_dict[row['cid']][row['tag']].append(row['_id'])
+                        notifier_dict[row['cid']][row['tag']].append(row)
                     else:
-                        notifier_dict[row['cid']][row['tag']] = [row['_id']]
+                        notifier_dict[row['cid']][row['tag']] = [row]
                 else:
-                    notifier_dict[row['cid']] = {row['tag']: [row['_id']]}
+                    notifier_dict[row['cid']] = {row['tag']: [row]}
         await self._db.tasks[bot_id].drop()
-        return notifier_dict  # return a dict ==> {cid: {tag: [_id, _id, ...]}}
+        return notifier_dict  # return a dict ==> {cid: {tag: [row, row, ...]}}
 
     async def delete_user(self, user_id):
         if not self._err and user_data.pop(user_id, None):
             await self._db.users[bot_id].delete_one({'_id': user_id})
 
+    async def delete_users(self, user_ids):
+        for user_id in user_ids:
+            user_data.pop(user_id, None)
+        if not self._err and user_ids:
+            await self._db.users[bot_id].delete_many({'_id': {'$in': list(user_ids)}})
+
+    async def broadcast_save(self, job):
+        if self._err:
+            return
+        await self._db.broadcast[bot_id].replace_one({'_id': 'job'}, job, upsert=True)
+
+    async def broadcast_update(self, cursor, counts):
+        if self._err:
+            return
+        await self._db.broadcast[bot_id].update_one({'_id': 'job'}, {'$set': {'cursor': cursor, **counts}})
+
+    async def broadcast_get(self):
+        if self._err:
+            return None
+        return await self._db.broadcast[bot_id].find_one({'_id': 'job'})
+
+    async def broadcast_delete(self):
+        if self._err:
+            return
+        await self._db.broadcast[bot_id].delete_one({'_id': 'job'})
+
     async def trunc_table(self, name):
         if self._err:
             return
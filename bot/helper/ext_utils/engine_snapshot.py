@@ -0,0 +1,76 @@
+from abc import ABC, abstractmethod
+from aria2p import Client as ariaClient, Download
+from threading import Lock
+from time import time
+
+from bot import aria2, get_client, LOGGER
+
+
+class EngineSnapshot(ABC):
+    """Shared, timestamped view of every item an engine daemon knows about.
+
+    The first caller after `max_age` seconds refreshes the whole view with one
+    request; every other status object reads from the cached result. A failed
+    refresh keeps the previous view and marks it `stale` instead of emptying it.
+    refresh() blocks on the daemon, so it only runs in worker threads
+    (sync_to_async or a status snapshot), never on the bot loop."""
+
+    def __init__(self, max_age=1):
+        self.max_age = max_age
+        self.items = {}
+        self.time = 0
+        self.stale = False
+        self._lock = Lock()
+
+    @abstractmethod
+    def _fetch(self) -> dict:
+        ...
+
+    def _reset(self):
+        pass
+
+    def refresh(self, force=False):
+        with self._lock:
+            if force or time() - self.time >= self.max_age:
+                try:
+                    self.items = self._fetch()
+                    self.stale = False
+                except Exception as e:
+                    LOGGER.error('%s: %s, while refreshing snapshot', self.__class__.__name__, e)
+                    self.stale = True
+                    self._reset()
+                self.time = time()
+            return self.items
+
+    def get(self, key):
+        return self.refresh().get(key)
+
+
+class QbSnapshot(EngineSnapshot):
+    def __init__(self, max_age=1):
+        super().__init__(max_age)
+        self._client = None
+
+    def _fetch(self):
+        if self._client is None:
+            self._client = get_client()
+        return {tor.tags: tor for tor in self._client.torrents_info()}
+
+    def _reset(self):
+        self._client = None
+
+
+class Aria2Snapshot(EngineSnapshot):
+    def _fetch(self):
+        calls = [(ariaClient.TELL_ACTIVE, []), (ariaClient.TELL_WAITING, [0, 1000]), (ariaClient.TELL_STOPPED, [0, 1000])]
+        items = {}
+        for result in aria2.client.multicall2(calls):
+            if result and isinstance(result[0], list):
+                result = result[0]
+            for struct in result:
+                items[struct['gid']] = Download(aria2, struct)
+        return items
+
+
+qb_snapshot = QbSnapshot()
+aria2_snapshot = Aria2Snapshot()
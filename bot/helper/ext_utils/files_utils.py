@@ -1,10 +1,11 @@
 from aiofiles import open as aiopen
 from aiofiles.os import remove as aioremove, path as aiopath, listdir
+from asyncio import gather
 from aiohttp import ClientSession
 from aioshutil import rmtree as aiormtree, disk_usage
 from magic import Magic
 from os import walk, path as ospath, makedirs
-from re import split as re_split, search as re_search, escape, I
+from re import split as re_split, search as re_search, findall as re_findall, escape, I
 from subprocess import run as srun
 from sys import exit as sexit
 
@@ -27,6 +28,19 @@ def is_first_archive_split(file):
     return bool(re_search(FIRST_SPLIT_REGEX, file))
 
 
+def get_archive_volumes(file, files):
+    """Names in `files` that belong to the same multi-volume set as its first volume `file`."""
+    if match := re_search(r'^(.*(?:\.|_)part)0*1\.rar$', file):
+        regex = rf'^{escape(match.group(1))}\d+\.rar$'
+    elif match := re_search(r'^(.*\.(?:7z|zip))\.0*1$', file):
+        regex = rf'^{escape(match.group(1))}\.\d+$'
+    elif match := re_search(r'^(.*)\.(rar|zip)$', file):
+        regex = rf'^{escape(match.group(1))}\.({match.group(2)}|{match.group(2)[0]}\d+)$'
+    else:
+        return [file]
+    return [f for f in files if re_search(regex, f)]
+
+
 def is_archive(file):
     return file.endswith(tuple(ARCH_EXT))
 
@@ -35,6 +49,22 @@ def is_archive_split(file):
     return bool(re_search(SPLIT_REGEX, file))
 
 
+async def _read_7z_progress(stream, status, part_size, offset):
+    tail = b''
+    while chunk := await stream.read(1024):
+        data = tail + chunk
+        if pcts := re_findall(rb'(\d+)%', data):
+            status.set_processed(offset + part_size * int(pcts[-1]) / 100)
+        tail = data[-8:]
+
+
+async def communicate_7z(proc, status, part_size, offset=0):
+    """Wait for a 7z process started with -bsp1 and stdout=PIPE, feeding its progress to status."""
+    _, stderr = await gather(_read_7z_progress(proc.stdout, status, part_size, offset), proc.stderr.read())
+    await proc.wait()
+    return stderr
+
+
 async def clean_target(path, log=False):
     if not await aiopath.exists(str(path)):
         return False
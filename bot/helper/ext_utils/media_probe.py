@@ -0,0 +1,80 @@
+from aiofiles.os import stat as aiostat
+from asyncio import shield
+from collections import OrderedDict
+from json import loads, JSONDecodeError
+
+from bot import bot_loop, LOGGER
+from bot.helper.ext_utils.bot_utils import cmd_exec
+
+
+class MediaProbe:
+    """ffprobe format+streams results keyed by (path, size, mtime); URLs are probed uncached.
+
+    A file is probed once per content version: rewriting it changes the key,
+    and concurrent requests for the same version share one ffprobe run."""
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._pending = {}
+
+    @staticmethod
+    async def _key(path):
+        st = await aiostat(path)
+        return path, st.st_size, st.st_mtime_ns
+
+    @staticmethod
+    async def _probe(path):
+        try:
+            stdout, stderr, code = await cmd_exec(['ffprobe', '-hide_banner', '-loglevel', 'error', '-print_format', 'json', '-show_format', '-show_streams', path])
+        except Exception as e:
+            LOGGER.error('Probe: %s. Mostly File not found!', e)
+            return None
+        if stderr:
+            LOGGER.warning('Probe: %s. Path: %s', stderr, path)
+        try:
+            info = loads(stdout)
+        except JSONDecodeError:
+            LOGGER.error('Probe: invalid ffprobe output (code %s) for %s', code, path)
+            return None
+        if not isinstance(info, dict) or ('format' not in info and 'streams' not in info):
+            return None
+        return info
+
+    def _put(self, key, info):
+        self._entries[key] = info
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key):
+        info = await self._probe(key[0])
+        self._put(key, info)
+        return info
+
+    def _done(self, key, task):
+        if self._pending.get(key) is task:
+            del self._pending[key]
+
+    async def get(self, path) -> dict | None:
+        if '://' in path:
+            # remote input (e.g. /vidss <url>): nothing to stat, so probe it uncached
+            return await self._probe(path)
+        try:
+            key = await self._key(path)
+        except OSError as e:
+            LOGGER.error('Probe: %s', e)
+            return None
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        if not (task := self._pending.get(key)):
+            task = self._pending[key] = bot_loop.create_task(self._load(key))
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await shield(task)
+
+    async def streams(self, path) -> list:
+        return ((await self.get(path)) or {}).get('streams') or []
+
+
+media_probe = MediaProbe()
@@ -1,8 +1,9 @@
-from aiofiles.os import path as aiopath, makedirs
+from aiofiles.os import path as aiopath, makedirs, stat as aiostat
 from aioshutil import move
-from ast import literal_eval
 from asyncio import create_subprocess_exec, gather, sleep, wait_for
 from asyncio.subprocess import PIPE
+from json import loads
+from math import ceil
 from os import path as ospath, cpu_count
 from PIL import Image
 from pyrogram.types import Message
@@ -11,8 +12,9 @@ from time import time
 
 from bot import config_dict, subprocess_lock, LOGGER, DEFAULT_SPLIT_SIZE, FFMPEG_NAME
 from bot.helper.ext_utils.bot_utils import cmd_exec, sync_to_async, is_premium_user
-from bot.helper.ext_utils.files_utils import ARCH_EXT, get_mime_type, get_path_size, clean_target
+from bot.helper.ext_utils.files_utils import ARCH_EXT, get_mime_type, get_path_size, clean_target, communicate_7z
 from bot.helper.ext_utils.links_utils import get_url_name
+from bot.helper.ext_utils.media_probe import media_probe
 from bot.helper.ext_utils.status_utils import get_readable_file_size
 from bot.helper.ext_utils.telegraph_helper import TelePost
 
@@ -43,16 +45,8 @@ async def createThumb(msg: Message, _id: int=0):
 
 
 async def is_multi_streams(path):
-    try:
-        result = await cmd_exec(['ffprobe', '-hide_banner', '-loglevel', 'error', '-print_format', 'json', '-show_streams', path])
-        if res := result[1]:
-            LOGGER.warning('Get Video Streams: %s', res)
-    except Exception as e:
-        LOGGER.error('Get Video Streams: %s. Mostly File not found!', e)
-        return False
-    fields = literal_eval(result[0]).get('streams')
-    if fields is None:
-        LOGGER.error('Get Video Streams: %s', result)
+    if not (fields := await media_probe.streams(path)):
+        LOGGER.error('Get Video Streams: no streams found. Path: %s', path)
         return False
     videos = audios = 0
     for stream in fields:
@@ -64,27 +58,16 @@ async def is_multi_streams(path):
 
 
 async def get_media_info(path):
-    try:
-        result = await cmd_exec(['ffprobe', '-hide_banner', '-loglevel', 'error', '-print_format', 'json', '-show_format', '-show_streams', path])
-        if res := result[1]:
-            LOGGER.warning('Get Media Info: %s', res)
-            return 0, None, None, None
-    except Exception as e:
-        LOGGER.error('Get Media Info: %s. Mostly File not found!', e)
-        return 0, None, None, None
-
-    media_info = literal_eval(result[0])
-    fields = media_info.get('format')
-    streams = media_info.get('streams')
-    if fields is None:
-        LOGGER.error('Get_media_info: %s', media_info)
+    media_info = await media_probe.get(path) or {}
+    if (fields := media_info.get('format')) is None:
+        LOGGER.error('Get_media_info: %s', path)
         return 0, None, None, None
 
     duration = round(float(fields.get('duration', 0)))
     tags = fields.get('tags', {})
     artist = tags.get('artist') or tags.get('ARTIST') or tags.get('Artist')
     title = tags.get('title') or tags.get('TITLE') or tags.get('Title')
-    return duration, artist, title, streams
+    return duration, artist, title, media_info.get('streams')
 
 
 async def post_media_info(path: str, size: int, image=None, is_link=False):
@@ -121,16 +104,8 @@ async def get_document_type(path):
         return False, True, False
     if not mime_type.startswith('video') and not mime_type.endswith('octet-stream'):
         return is_video, is_audio, is_image
-    try:
-        result = await cmd_exec(['ffprobe', '-hide_banner', '-loglevel', 'error', '-print_format', 'json', '-show_streams', path])
-        if res := result[1]:
-            LOGGER.warning('Get Document Type: %s', res)
-    except Exception as e:
-        LOGGER.error('Get Document Type: %s. Mostly File not found!', e)
-        return is_video, is_audio, is_image
-    fields = literal_eval(result[0]).get('streams')
-    if fields is None:
-        LOGGER.error('Get_document_type: %s', result)
+    if not (fields := await media_probe.streams(path)):
+        LOGGER.error('Get_document_type: no streams found. Path: %s', path)
         return is_video, is_audio, is_image
     for stream in fields:
         if stream.get('codec_type') == 'video':
@@ -140,9 +115,39 @@ async def get_document_type(path):
     return is_video, is_audio, is_image
 
 
-async def take_ss(video_file, ss_nb) -> list:
+async def extract_frames(path, timestamps, outputs, filters=None) -> list:
+    """Grab one frame per timestamp in a single ffmpeg run, seeking each input separately; return the outputs written."""
+    cmd = [FFMPEG_NAME, '-hide_banner', '-loglevel', 'error', '-y']
+    for timestamp in timestamps:
+        cmd.extend(['-ss', f'{timestamp}', '-i', path])
+    for index, output in enumerate(outputs):
+        cmd.extend(['-map', f'{index}:v:0', '-frames:v', '1', '-q:v', '1'])
+        if filters:
+            cmd.extend(['-vf', filters[index]])
+        cmd.append(output)
+    _, stderr, code = await cmd_exec(cmd)
+    if code != 0:
+        LOGGER.error('Error while extracting frames. Path: %s. stderr: %s', path, stderr)
+    return [output for output in outputs if await aiopath.exists(output)]
+
+
+def make_grid(images, output, columns=3, width=1920):
+    frames = []
+    for image in images:
+        with Image.open(image) as img:
+            frames.append(img.convert('RGB').resize((width, round(img.height * width / img.width))))
+    height = max(frame.height for frame in frames)
+    grid = Image.new('RGB', (width * columns, height * -(-len(frames) // columns)))
+    for index, frame in enumerate(frames):
+        grid.paste(frame, ((index % columns) * width, (index // columns) * height))
+    grid.save(output, 'JPEG')
+    return output
+
+
+async def take_ss(video_file, ss_nb, duration=None) -> list:
     ss_nb = min(ss_nb, 10)
-    duration = (await get_media_info(video_file))[0]
+    if duration is None:
+        duration = (await get_media_info(video_file))[0]
     if duration == 0:
         LOGGER.error('Take SS: Can\'t get the duration of video')
         return []
@@ -151,140 +156,191 @@ async def take_ss(video_file, ss_nb) -> list:
     dirpath = f'{dirpath}/screenshots/'
     await makedirs(dirpath, exist_ok=True)
     interval = duration // (ss_nb + 1)
-    cap_time = interval
-    outputs, cmds = [], []
-    for i in range(ss_nb):
-        output = f'{dirpath}SS.{name}_{i:02}.png'
-        outputs.append(output)
-        cmd = [FFMPEG_NAME, '-hide_banner', '-loglevel', 'error', '-ss', f'{cap_time}', '-i', video_file, '-q:v', '1', '-frames:v', '1', output]
-        cap_time += interval
-        cmds.append(cmd_exec(cmd))
-    results = await gather(*cmds)
-    if results and results[0][2] != 0:
-        LOGGER.error('Error while creating sreenshots from video. Path: %s. stderr: %s', video_file, results[0][1])
-        return []
-    return outputs
+    outputs = [f'{dirpath}SS.{name}_{i:02}.png' for i in range(ss_nb)]
+    return await extract_frames(video_file, [interval * (i + 1) for i in range(ss_nb)], outputs)
 
 
-async def get_audio_thumb(audio_file):
-    des_dir = 'thumbnails'
-    await makedirs(des_dir, exist_ok=True)
-    des_dir = ospath.join(des_dir, f'{time()}.jpg')
-    cmd = [FFMPEG_NAME, '-hide_banner', '-loglevel', 'error', '-i', audio_file, '-an', '-vcodec', 'copy', des_dir]
-    status = await create_subprocess_exec(*cmd, stderr=PIPE)
-    if await status.wait() != 0 or not await aiopath.exists(des_dir):
-        err = (await status.stderr.read()).decode().strip()
-        LOGGER.error('Error while extracting thumbnail from audio. Name: %s stderr: %s', audio_file, err)
+_thumbnails = {}
+
+
+async def _cached_thumbnail(path, create):
+    """Default thumbnail of a file, generated once per file version so upload retries reuse it."""
+    try:
+        st = await aiostat(path)
+    except OSError:
         return None
-    return des_dir
+    version = (st.st_size, st.st_mtime_ns)
+    if (entry := _thumbnails.get(path)) and entry[0] == version and await aiopath.exists(entry[1]):
+        return entry[1]
+    await makedirs('thumbnails', exist_ok=True)
+    if thumb := await create(ospath.join('thumbnails', f'{time()}.jpg')):
+        _thumbnails[path] = (version, thumb)
+    return thumb
+
+
+async def drop_thumbnail(path):
+    if entry := _thumbnails.pop(path, None):
+        await clean_target(entry[1])
+
+
+async def get_audio_thumb(audio_file):
+    async def _create(des_dir):
+        cmd = [FFMPEG_NAME, '-hide_banner', '-loglevel', 'error', '-i', audio_file, '-an', '-vcodec', 'copy', des_dir]
+        _, err, code = await cmd_exec(cmd)
+        if code != 0 or not await aiopath.exists(des_dir):
+            LOGGER.error('Error while extracting thumbnail from audio. Name: %s stderr: %s', audio_file, err)
+            return None
+        return des_dir
+    return await _cached_thumbnail(audio_file, _create)
 
 
 async def create_thumbnail(video_file, duration):
-    try:
-        des_dir = 'thumbnails'
-        await makedirs(des_dir, exist_ok=True)
-        des_dir = ospath.join(des_dir, f'{time()}.jpg')
+    async def _create(des_dir):
+        nonlocal duration
         if duration is None:
             duration = (await get_media_info(video_file))[0]
         if duration == 0:
             duration = 3
-        duration = duration // 2
-        cmd = [FFMPEG_NAME, '-hide_banner', '-loglevel', 'error', '-ss', f'{duration}', '-i', video_file, '-vf', 'thumbnail', '-frames:v', '1', des_dir]
+        cmd = [FFMPEG_NAME, '-hide_banner', '-loglevel', 'error', '-ss', f'{duration // 2}', '-i', video_file, '-vf', 'thumbnail', '-frames:v', '1', des_dir]
         _, err, code = await cmd_exec(cmd)
         if code != 0 or not await aiopath.exists(des_dir):
             LOGGER.error('Error while extracting thumbnail from video. Name: %s stderr: %s', video_file, err)
             return None
         return des_dir
+    try:
+        return await _cached_thumbnail(video_file, _create)
     except Exception as e:
         LOGGER.error(f"Exception in thumbnail extraction for {video_file}: {e}")
         return None
 
 
-async def split_file(path, size, dirpath, split_size, listener, obj, start_time=0, i=1, inLoop=False, multi_streams=True):
-    if listener.seed and not listener.newDir:
-        dirpath = ospath.join(dirpath, 'splited_files_mltb')
-        await makedirs(dirpath, exist_ok=True)
-    parts = -(-size // split_size)
-    if listener.equalSplits and not inLoop:
-        split_size = ((size + parts - 1) // parts) + 1000
+async def get_keyframes(path, stream='v:0'):
+    """(pts_time, byte position) of every keyframe of `stream`, read once from the packet index."""
+    stdout, stderr, code = await cmd_exec(['ffprobe', '-hide_banner', '-loglevel', 'error', '-select_streams', stream,
+                                           '-show_entries', 'packet=pts_time,pos,flags', '-of', 'compact=p=0', path])
+    if code != 0:
+        LOGGER.error('Get Keyframes: %s. Path: %s', stderr, path)
+        return []
+    keyframes = []
+    for line in stdout.splitlines():
+        packet = dict(field.split('=', 1) for field in line.split('|') if '=' in field)
+        if 'K' in packet.get('flags', '') and packet.get('pts_time', 'N/A') != 'N/A' and packet.get('pos', 'N/A') != 'N/A':
+            keyframes.append((float(packet['pts_time']), int(packet['pos'])))
+    return sorted(keyframes)
+
+
+def get_cut_points(keyframes, budget):
+    """Keyframe timestamps that keep every part's byte span within `budget`."""
+    cuts, start_pos, prev = [], 0, None
+    for pts, pos in keyframes:
+        if pos - start_pos > budget and pts > 0:
+            cut_pts, cut_pos = prev if prev and prev[1] > start_pos else (pts, pos)
+            cuts.append(cut_pts)
+            start_pos = cut_pos
+        prev = pts, pos
+    return cuts
+
+
+async def _video_stream(path):
+    """Index of the first real video stream (cover art is an attached_pic video stream) and the container start time."""
+    info = await media_probe.get(path) or {}
+    index = next((str(s['index']) for s in info.get('streams') or [] if s.get('codec_type') == 'video'
+                  and not (s.get('disposition') or {}).get('attached_pic')), None)
+    try:
+        start_time = float((info.get('format') or {}).get('start_time', 0))
+    except ValueError:
+        start_time = 0
+    return index, start_time
+
+
+async def get_split_cuts(path, size, budget):
+    """Segment times, counted from the first packet, that keep every part of a video within `budget` bytes.
+
+    Cut points come from the keyframe index; without one they are spaced by the
+    average bitrate with a 10% margin, as the segment muxer cuts on the next keyframe."""
+    stream, start_time = await _video_stream(path)
+    keyframes = await get_keyframes(path, stream) if stream else []
+    # keyframe pts include the container's start_time, segment times don't
+    if cuts := [cut - start_time for cut in get_cut_points(keyframes, budget) if cut > start_time]:
+        return cuts
+    if size <= budget or not (duration := (await get_media_info(path))[0]):
+        return []
+    step = duration * budget * 0.9 / size
+    return [step * i for i in range(1, ceil(duration / step))]
+
+
+def get_split_size(size, split_size, equal_splits=False):
+    """Part size for a file, evened out across the parts for equal splits."""
+    if equal_splits:
+        parts = -(-size // split_size)
+        return ((size + parts - 1) // parts) + 1000
+    return split_size
+
+
+async def split_file(path, size, split_size, listener, obj, multi_streams=True):
+    split_size = get_split_size(size, split_size, listener.equalSplits)
     if (await get_document_type(path))[0]:
         if multi_streams:
             multi_streams = await is_multi_streams(path)
         obj.state = 'video'
-        duration = (await get_media_info(path))[0]
+        if not (cuts := await get_split_cuts(path, size, split_size - 5000000)):
+            LOGGER.warning('Unable to find split points for this video, if it\'s size less than {MAX_SPLIT_SIZE} will be uploaded as it is. Path: %s', path)
+            return 'errored'
         base_name, extension = ospath.splitext(path)
-        split_size -= 5000000
-        while i <= parts or start_time < duration - 4:
-            out_path = f"{base_name}.part{i:03}{extension}"
-            cmd = [FFMPEG_NAME, '-hide_banner', '-loglevel', 'error', '-ss', str(start_time), '-i', path, '-fs', str(split_size),
-                   '-map', '0', '-map_chapters', '-1', '-async', '1', '-strict', '-2', '-c', 'copy', out_path]
-            if not multi_streams:
-                del cmd[10:12]
+        out_paths = [f'{base_name}.part{i:03}{extension}' for i in range(1, len(cuts) + 2)]
+        cmd = [FFMPEG_NAME, '-hide_banner', '-nostats', '-ignore_unknown', '-i', path, '-map', '0', '-map_chapters', '-1', '-strict', '-2', '-c', 'copy',
+               '-f', 'segment', '-segment_times', ','.join(f'{cut:.6f}' for cut in cuts), '-segment_start_number', '1', '-reset_timestamps', '1',
+               f'{base_name}.part%03d{extension}']
+        if not multi_streams:
+            del cmd[6:8]
+        while True:
+            obj.part, obj.parts = 0, len(out_paths)
             async with subprocess_lock:
                 if listener.suproc == 'cancelled':
                     return False
                 listener.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
-            _, stderr = await listener.suproc.communicate()
-            code = listener.suproc.returncode
+            errors = []
+            async for line in listener.suproc.stderr:
+                line = line.decode().strip()
+                if line.startswith('[segment') and 'Opening' in line:
+                    obj.part += 1
+                elif 'rror' in line:
+                    errors.append(line)
+            code = await listener.suproc.wait()
             if code == -9:
                 return
-            if code != 0:
-                stderr = stderr.decode().strip()
-                await clean_target(out_path)
-                if multi_streams:
-                    LOGGER.warning('%s. Retrying without map, -map 0 not working in all situations. Path: %s', stderr, path)
-                    return await split_file(path, size, dirpath, split_size, listener, obj, start_time, i, True, False)
+            if code == 0:
+                break
+            stderr = '\n'.join(errors[-5:])
+            await gather(*[clean_target(out_path) for out_path in out_paths])
+            if not multi_streams:
                 LOGGER.warning('%s. Unable to split this video, if it\'s size less than {MAX_SPLIT_SIZE} will be uploaded as it is. Path: %s', stderr, path)
                 return 'errored'
-            out_size = await get_path_size(out_path)
-            while out_size > listener.maxSplitSize:
-                dif = out_size - listener.maxSplitSize
-                split_size -= dif + 5000000
-                await clean_target(out_path)
-                LOGGER.info(f"Retrying split for {path} with new split size {split_size}")
-                cmd = [FFMPEG_NAME, '-hide_banner', '-loglevel', 'error', '-ss', str(start_time), '-i', path, '-fs', str(split_size),
-                       '-map', '0', '-map_chapters', '-1', '-async', '1', '-strict', '-2', '-c', 'copy', out_path]
-                if not multi_streams:
-                    del cmd[10:12]
-                async with subprocess_lock:
-                    if listener.suproc == 'cancelled':
-                        return False
-                    listener.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
-                _, stderr = await listener.suproc.communicate()
-                code = listener.suproc.returncode
-                if code == -9:
-                    return
-                if code != 0:
-                    stderr = stderr.decode().strip()
-                    LOGGER.warning('%s. Unable to split this video, if it\'s size less than {MAX_SPLIT_SIZE} will be uploaded as it is. Path: %s', stderr, path)
-                    return 'errored'
-                out_size = await get_path_size(out_path)
-            lpd = (await get_media_info(out_path))[0]
-            if lpd == 0:
-                LOGGER.error('Something went wrong while splitting, mostly file is corrupted. Path: %s', path)
-                break
-            if duration == lpd:
-                LOGGER.warning('This file has been splitted with default stream and audio, so you will only see one part with less size from orginal one because it doesn\'t have all streams and audios. This happens mostly with MKV videos. Path: %s', path)
-                break
-            if lpd <= 3:
-                await clean_target(out_path)
-                break
-            start_time += lpd - 3
-            i += 1
-    else:
-        obj.state = 'archive'
-        out_path = f'{path}.'
-        async with subprocess_lock:
-            if listener.suproc == 'cancelled':
-                return False
-            listener.suproc = await create_subprocess_exec('split', '--numeric-suffixes=1', '--suffix-length=3', f'--bytes={split_size}', path, out_path, stderr=PIPE)
-        _, stderr = await listener.suproc.communicate()
-        code = listener.suproc.returncode
-        if code == -9:
-            return
-        if code != 0:
-            LOGGER.error(stderr.decode().strip())
-    listener.total_size += await get_path_size(out_path)
+            LOGGER.warning('%s. Retrying without map, -map 0 not working in all situations. Path: %s', stderr, path)
+            multi_streams = False
+            del cmd[6:8]
+        for out_path in out_paths:
+            if await aiopath.exists(out_path):
+                if (out_size := await get_path_size(out_path)) > listener.maxSplitSize:
+                    LOGGER.warning('Part %s is %s, over the split limit; a single GOP is larger than the budget.', out_path, out_size)
+                listener.total_size += out_size
+        return True
+    if config_dict['VIRTUAL_SPLIT']:
+        listener.virtualSplits[path] = split_size
+        return 'virtual'
+    obj.state = 'archive'
+    async with subprocess_lock:
+        if listener.suproc == 'cancelled':
+            return False
+        listener.suproc = await create_subprocess_exec('split', '--numeric-suffixes=1', '--suffix-length=3', f'--bytes={split_size}', path, f'{path}.', stderr=PIPE)
+    _, stderr = await listener.suproc.communicate()
+    code = listener.suproc.returncode
+    if code == -9:
+        return
+    if code != 0:
+        LOGGER.error(stderr.decode().strip())
+        return 'errored'
+    listener.total_size += size
     return True
 
 
@@ -406,8 +462,8 @@ class SampleVideo(FFProgress):
         return video_file
 
 
-async def createArchive(listener, scr_path, dest_path, size, pswd, mpart=False):
-    cmd = ['7z', f'-v{listener.splitSize}b', 'a', '-mx=0', f'-p{pswd}', dest_path, scr_path]
+async def createArchive(listener, status, scr_path, dest_path, size, pswd, mpart=False):
+    cmd = ['7z', f'-v{listener.splitSize}b', 'a', '-mx=0', f'-p{pswd}', dest_path, scr_path, '-bsp1', '-bso0']
     cmd.extend(f'-xr!*.{ext}' for ext in listener.extensionFilter)
     if listener.isLeech and int(size) > listener.splitSize or mpart and int(size) > listener.splitSize:
         if not pswd:
@@ -421,8 +477,8 @@ async def createArchive(listener, scr_path, dest_path, size, pswd, mpart=False):
     async with subprocess_lock:
         if listener.suproc == 'cancelled':
             return
-        listener.suproc = await create_subprocess_exec(*cmd, stderr=PIPE)
-    _, stderr = await listener.suproc.communicate()
+        listener.suproc = await create_subprocess_exec(*cmd, stdout=PIPE, stderr=PIPE)
+    stderr = await communicate_7z(listener.suproc, status, int(size))
     code = listener.suproc.returncode
     if code == -9:
         return
@@ -455,23 +511,12 @@ class GenSS:
     def rimage(self):
         return self._images
 
-    async def _combine_image(self):
-        await cmd_exec([FFMPEG_NAME, '-hide_banner', '-loglevel', 'quiet', '-i', str(ospath.join(self._ss_path, '%1d.jpg')),
-                        '-filter_complex', 'scale=1920:-1,tile=3x3', self._images, '-y'])
-        if not await aiopath.exists(self._images):
-            self._images = ''
-
-    async def _run_genss(self, duration, index):
-        await makedirs(self._ss_path, exist_ok=True)
-        des_dir = ospath.join(self._ss_path, f'{index}.jpg')
-        cmds = [FFMPEG_NAME, '-hide_banner', '-loglevel', 'error', '-start_at_zero', '-copyts', '-ss', f'{duration}', '-i', self._path, '-vf',
-                "drawtext=fontfile=font.ttf:fontsize=70:fontcolor=white:box=1:boxcolor=black@0.7:x=(W-tw)/1.05:y=h-(2*lh):text='%{pts\:hms}'",
-                '-vframes', '1', des_dir, '-y']
-        await cmd_exec(cmds)
-        if await aiopath.exists(des_dir):
-            with Image.open(des_dir) as img:
-                img.convert('RGB').save(des_dir, 'JPEG')
-            return des_dir
+    @staticmethod
+    def _timestamp_filter(seconds):
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return ("drawtext=fontfile=font.ttf:fontsize=70:fontcolor=white:box=1:boxcolor=black@0.7:x=(W-tw)/1.05:y=h-(2*lh):"
+                f"text='{hours:02}\\:{minutes:02}\\:{seconds:02}'")
 
     async def file_ss(self):
         min_dur, max_photo = 5, 10
@@ -479,16 +524,21 @@ class GenSS:
         if not duration:
             self._error = 'Failed fetch info from url, something wrong with url or not video in url!'
             return
+        images = []
         if duration > min_dur:
+            await makedirs(self._ss_path, exist_ok=True)
             cur_step = duration // max_photo
-            current = cur_step
-            images = []
-            for x in range(max_photo):
-                images.append(await self._run_genss(current, str(x)))
-                current += cur_step
-            if any(images):
-                await self._combine_image()
-        if not self._images:
+            timestamps = [cur_step * (x + 1) for x in range(max_photo)]
+            outputs = [ospath.join(self._ss_path, f'{x}.jpg') for x in range(max_photo)]
+            images = await extract_frames(self._path, timestamps, outputs, [self._timestamp_filter(ts) for ts in timestamps])
+        if images:
+            try:
+                await sync_to_async(make_grid, images, self._images)
+            except Exception as e:
+                LOGGER.error('Failed combining screenshots: %s', e)
+                images = []
+        if not images:
+            self._images = ''
             self._error = 'Failed generated screenshot, something wrong with url or not video in url!'
             LOGGER.info('Failed Generating Screenshot: %s', ospath.basename(self._path))
         await clean_target(self._ss_path)
@@ -510,7 +560,7 @@ async def get_metavideo(url):
         if process.returncode != 0:
             LOGGER.error(f"ffprobe error for URL {url}: {stderr.decode().strip()}")
             return None, None
-        media_info = literal_eval(stdout.decode().strip())
+        media_info = loads(stdout.decode().strip())
         duration = media_info.get('format', {}).get('duration', 0)
         size = media_info.get('format', {}).get('size', 0)
         return duration, {'size': size}
@@ -1,10 +1,13 @@
+from asyncio import gather
 from html import escape
-from psutil import virtual_memory, cpu_percent, disk_usage, net_io_counters
 from pyrogram.types import Message
 from time import time
 from pytz import timezone
+from typing import Any, NamedTuple
 
-from bot import bot_name, task_dict, task_dict_lock, botStartTime, config_dict
+from bot import bot_loop, bot_name, task_dict, task_dict_lock, botStartTime, config_dict
+from bot.helper.ext_utils.bot_utils import sync_to_async
+from bot.helper.ext_utils.sys_metrics import sys_metrics
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from .status_constants import MirrorStatus
@@ -29,16 +32,86 @@ STATUS_VALUES = [('ALL', 'All'),
                  ('SD', MirrorStatus.STATUS_SEEDING)]
 
 
+class TaskSnapshot(NamedTuple):
+    gid: str
+    name: str
+    status: str
+    engine: str
+    size: str
+    elapsed: str
+    listener: Any
+    progress: str = ''
+    processed_bytes: str = ''
+    speed: str = ''
+    eta: str = ''
+    timeout: str = ''
+    upload_speed: str = ''
+    uploaded_bytes: str = ''
+    ratio: str = ''
+    seeding_time: str = ''
+    seeders_leechers: str = ''
+
+
+class TaskStatus:
+    """Base of every status object, gives the renderer an immutable copy of its state."""
+
+    live = False
+
+    def _report(self, status=None, gid=None):
+        """Push a status or gid computed from engine state into task_dict's indexes.
+
+        Called from worker threads as well, so the update runs on the bot loop."""
+        if listener := getattr(self, 'listener', None) or getattr(self, '_listener', None):
+            bot_loop.call_soon_threadsafe(self._index, listener.mid, status, gid)
+        return status
+
+    def _index(self, mid, status, gid):
+        task_dict.add_gid(mid, gid, self)
+        if status:
+            task_dict.set_status(mid, status, self)
+
+    async def snapshot(self):
+        return await sync_to_async(self._snapshot)
+
+    def _snapshot(self):
+        status = self.status()
+        listener = getattr(self, 'listener', None) or getattr(self, '_listener', None)
+        extra = {}
+        if status == MirrorStatus.STATUS_SEEDING:
+            extra.update(upload_speed=self.upload_speed(), uploaded_bytes=self.uploaded_bytes(), ratio=self.ratio(), seeding_time=self.seeding_time())
+        elif status not in [MirrorStatus.STATUS_METADATA, MirrorStatus.STATUS_SUBSYNC]:
+            extra.update(progress=self.progress(), processed_bytes=self.processed_bytes(), speed=self.speed(), eta=self.eta())
+            if status == MirrorStatus.STATUS_WAIT:
+                extra['timeout'] = self.timeout()
+        if hasattr(self, 'seeders_num'):
+            try:
+                extra['seeders_leechers'] = f'{self.seeders_num()}/{self.leechers_num()}'
+            except:
+                pass
+        return TaskSnapshot(self.gid(), self.name(), status, self.engine(), self.size(), self.elapsed(), listener, **extra)
+
+
+async def get_task_snapshots(user_id: int=None):
+    async with task_dict_lock:
+        tasks = task_dict.user_tasks(user_id) if user_id else list(task_dict.values())
+    snapshots = []
+    for task, snapshot in zip(tasks, await gather(*[task.snapshot() for task in tasks], return_exceptions=True)):
+        if isinstance(snapshot, TaskSnapshot):
+            task_dict.set_status(snapshot.listener.mid, snapshot.status, task)
+            snapshots.append(snapshot)
+    return snapshots
+
+
 async def getTaskByGid(gid: str):
     async with task_dict_lock:
-        return next((tk for tk in task_dict.values() if tk.gid() == gid), None)
+        return task_dict.get_by_gid(gid)
 
 
-async def getAllTasks(req_status: str):
+async def getAllTasks(req_status: str, user_id: int=0):
     async with task_dict_lock:
         if req_status == 'all':
-            return list(task_dict.values())
-        return [tk for tk in task_dict.values() if tk.status() == req_status]
+            return task_dict.user_tasks(user_id) if user_id else list(task_dict.values())
+        return task_dict.status_tasks(req_status, user_id or None)
 
 
 def get_readable_file_size(size_in_bytes: int | str):
@@ -128,16 +201,11 @@ def _get_video_stream_info(task):
             msg += f"\n{_format_stream_details(stream)}"
     return msg
 
-def get_readable_message(sid: int, is_user: bool, page_no: int=1, status : str='All', page_step: int=1):
+def get_status_text(snapshots: list, sid: int, is_user: bool, page_no: int=1, status : str='All', page_step: int=1):
     msg = "<b>Powered By TeamLeech</b>\n\n"
     dl_speed = up_speed = 0
 
-    if status == 'All':
-        tasks = [tk for tk in task_dict.values() if tk.listener.user_id == sid] if is_user else list(task_dict.values())
-    elif is_user:
-        tasks = [tk for tk in task_dict.values() if tk.status() == status and tk.listener.user_id == sid]
-    else:
-        tasks = [tk for tk in task_dict.values() if tk.status() == status]
+    tasks = [tk for tk in snapshots if (not is_user or tk.listener.user_id == sid) and status in ('All', tk.status)]
 
     STATUS_LIMIT = config_dict['STATUS_LIMIT']
     tasks_no = len(tasks)
@@ -148,9 +216,9 @@ def get_readable_message(sid: int, is_user: bool, page_no: int=1, status : str='
         page_no = pages - (abs(page_no) % pages)
     start_position = (page_no - 1) * STATUS_LIMIT
     for index, task in enumerate(tasks[start_position:STATUS_LIMIT + start_position], start=1):
-        tstatus = task.status()
-        task_name = task.name().replace('[METADATA]', '')
-        listener = getattr(task, 'listener', None) or getattr(task, '_listener', None)
+        tstatus = task.status
+        task_name = task.name.replace('[METADATA]', '')
+        listener = task.listener
         msg += f'<b>{index+start_position}.</b> <code>{escape(str(task_name)) or "N/A"}</code>'
         if listener.isSuperChat:
             reply_to = listener.message.reply_to_message
@@ -158,60 +226,68 @@ def get_readable_message(sid: int, is_user: bool, page_no: int=1, status : str='
             msg += f'\n\n<b>┌ <a href="{link}"><i>{tstatus}...</i></a></b>'
         else:
             msg += f'\n<b>┌ <i>{tstatus}...</i></b>'
-        ext_msg = (f'\n<b>├ Engine:<i> {task.engine()}</i></b>'
+        ext_msg = (f'\n<b>├ Engine:<i> {task.engine}</i></b>'
                    f'\n<b>├ By:</b> <a href="https://t.me/{listener.message.from_user.username}">{listener.message.from_user.first_name}</a>' if listener.isSuperChat else ''
                    f'\n<b>├ Action:</b> {action(listener.message)}')
         if tstatus not in [MirrorStatus.STATUS_SEEDING, MirrorStatus.STATUS_METADATA, MirrorStatus.STATUS_SUBSYNC]:
-            msg += (f'\n<b>├ </b>{get_progress_bar_string(task.progress())}'
-                    f'\n<b>├ Progress:</b> {task.progress()}')
+            msg += (f'\n<b>├ </b>{get_progress_bar_string(task.progress)}'
+                    f'\n<b>├ Progress:</b> {task.progress}')
             if tstatus == MirrorStatus.STATUS_SPLITTING and listener.isLeech:
                 msg += f'\n<b>├ Split Size:</b> {get_readable_file_size(listener.splitSize)}'
-            msg += (f'\n<b>├ Processed:</b> {task.processed_bytes()}'
-                    f'\n<b>├ Total Size:</b> {task.size()}'
-                    f'\n<b>├ Speed:</b> {task.speed()}'
-                    f'\n<b>├ ETA:</b> {task.eta() or "~"}'
-                    f'\n<b>├ Elapsed: </b>{task.elapsed() or "~"}')
+            msg += (f'\n<b>├ Processed:</b> {task.processed_bytes}'
+                    f'\n<b>├ Total Size:</b> {task.size}'
+                    f'\n<b>├ Speed:</b> {task.speed}'
+                    f'\n<b>├ ETA:</b> {task.eta or "~"}'
+                    f'\n<b>├ Elapsed: </b>{task.elapsed or "~"}')
             if tstatus == MirrorStatus.STATUS_WAIT:
-                msg += f'\n<b>├ Timeout: </b>{task.timeout()}'
-            if hasattr(task, 'seeders_num'):
-                try:
-                    msg += f'\n<b>├ S/L:</b> {task.seeders_num()}/{task.leechers_num()}'
-                except:
-                    pass
+                msg += f'\n<b>├ Timeout: </b>{task.timeout}'
+            if task.seeders_leechers:
+                msg += f'\n<b>├ S/L:</b> {task.seeders_leechers}'
         elif tstatus == MirrorStatus.STATUS_SEEDING:
-            msg += (f'\n<b>├ Size:</b> {task.size()}'
-                    f'\n<b>├ Speed:</b> {task.upload_speed()}'
-                    f'\n<b>├ Uploaded:</b> {task.uploaded_bytes()}'
-                    f'\n<b>├ Ratio:</b> {task.ratio()}'
-                    f'\n<b>├ Time:</b> {task.seeding_time()}'
-                    f'\n<b>├ S/L:</b> {task.seeders_num()}/{task.leechers_num()}')
+            msg += (f'\n<b>├ Size:</b> {task.size}'
+                    f'\n<b>├ Speed:</b> {task.upload_speed}'
+                    f'\n<b>├ Uploaded:</b> {task.uploaded_bytes}'
+                    f'\n<b>├ Ratio:</b> {task.ratio}'
+                    f'\n<b>├ Time:</b> {task.seeding_time}'
+                    f'\n<b>├ S/L:</b> {task.seeders_leechers}')
         else:
-            msg += (f'\n<b>├ Size:</b> {task.size()}'
-                    f'\n<b>├ Elapsed:</b> {task.elapsed() or "~"}')
+            msg += (f'\n<b>├ Size:</b> {task.size}'
+                    f'\n<b>├ Elapsed:</b> {task.elapsed or "~"}')
         if listener and hasattr(listener, 'streams_kept') and listener.streams_kept:
             msg += _get_video_stream_info(task)
-        msg += f'{ext_msg}\n<b>└ </b><code>/{BotCommands.CancelTaskCommand} {task.gid()}</code>\n\n'
+        msg += f'{ext_msg}\n<b>└ </b><code>/{BotCommands.CancelTaskCommand} {task.gid}</code>\n\n'
 
     if not msg:
         if status == 'All':
-            return None, None
+            return None, 0
         msg = f'No Active {status} Task!\n'
 
     for task in tasks:
-        tstatus = task.status()
-        if tstatus == MirrorStatus.STATUS_DOWNLOADING or task.engine() == 'JDownloader':
-            dl_speed += speed_string_to_bytes(task.speed())
+        tstatus = task.status
+        if tstatus == MirrorStatus.STATUS_DOWNLOADING or task.engine == 'JDownloader':
+            dl_speed += speed_string_to_bytes(task.speed)
         elif tstatus == MirrorStatus.STATUS_UPLOADING:
-            up_speed += speed_string_to_bytes(task.speed())
+            up_speed += speed_string_to_bytes(task.speed)
         elif tstatus == MirrorStatus.STATUS_SEEDING:
-            up_speed += speed_string_to_bytes(task.upload_speed())
+            up_speed += speed_string_to_bytes(task.upload_speed)
+
+    if tasks_no > STATUS_LIMIT:
+        msg += f'<b>Page:</b> {page_no}/{pages} | <b>Tasks:</b> {tasks_no} | <b>Step:</b> {page_step}\n'
+    sample, rates = sys_metrics.latest(), sys_metrics.rates()
+    msg += ('▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬\n'
+            f'<b>CPU:</b> {sample.cpu}% <b>| RAM:</b> {sample.mem}% <b>| FREE:</b> {get_readable_file_size(sample.disk_free)}\n'
+            f'<b>IN:</b> {get_readable_file_size(sample.recv)} ({get_readable_file_size(rates.dl)}/s)<b> | OUT:</b> {get_readable_file_size(sample.sent)} ({get_readable_file_size(rates.ul)}/s)\n'
+            f'<b>DL:</b> {get_readable_file_size(dl_speed)}/s<b> | UL:</b> {get_readable_file_size(up_speed)}/s <b>|</b> {get_readable_time(time() - botStartTime)}')
+    return msg, tasks_no
 
+
+def get_status_buttons(sid: int, is_user: bool, status: str, tasks_no: int):
+    STATUS_LIMIT = config_dict['STATUS_LIMIT']
     buttons = ButtonMaker()
     if not is_user:
         buttons.button_data('☲', 'status 0 ov', 'header')
 
-    if len(tasks) > STATUS_LIMIT:
-        msg += f'<b>Page:</b> {page_no}/{pages} | <b>Tasks:</b> {tasks_no} | <b>Step:</b> {page_step}\n'
+    if tasks_no > STATUS_LIMIT:
         buttons.button_data('Back', f'status {sid} pre', 'header')
         buttons.button_data('Next', f'status {sid} nex', 'header')
         if tasks_no > 30:
@@ -224,8 +300,12 @@ def get_readable_message(sid: int, is_user: bool, page_no: int=1, status : str='
     buttons.button_data('♻️', f'status {sid} ref', 'header')
     if is_user:
         buttons.button_data('✘', f'status {sid} cls', 'header')
-    msg += ('▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬▬\n'
-            f'<b>CPU:</b> {cpu_percent()}% <b>| RAM:</b> {virtual_memory().percent}% <b>| FREE:</b> {get_readable_file_size(disk_usage(config_dict["DOWNLOAD_DIR"]).free)}\n'
-            f'<b>IN:</b> {get_readable_file_size(net_io_counters().bytes_recv)}<b> | OUT:</b> {get_readable_file_size(net_io_counters().bytes_sent)}\n'
-            f'<b>DL:</b> {get_readable_file_size(dl_speed)}/s<b> | UL:</b> {get_readable_file_size(up_speed)}/s <b>|</b> {get_readable_time(time() - botStartTime)}')
-    return msg, buttons.build_menu(6)
+    return buttons.build_menu(6)
+
+
+async def get_readable_message(sid: int, is_user: bool, page_no: int=1, status : str='All', page_step: int=1):
+    snapshots = await get_task_snapshots(sid if is_user else None)
+    msg, tasks_no = get_status_text(snapshots, sid, is_user, page_no, status, page_step)
+    if msg is None:
+        return None, None
+    return msg, get_status_buttons(sid, is_user, status, tasks_no)
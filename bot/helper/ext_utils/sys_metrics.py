@@ -0,0 +1,94 @@
+from collections import deque
+from psutil import cpu_percent, disk_usage, net_io_counters, swap_memory, virtual_memory
+from threading import Lock
+from time import time
+from typing import NamedTuple
+
+from bot import config_dict, LOGGER
+from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async
+
+
+class Sample(NamedTuple):
+    time: float
+    cpu: float
+    mem: float
+    mem_used: int
+    mem_free: int
+    mem_total: int
+    swap: float
+    swap_total: int
+    disk: float
+    disk_used: int
+    disk_free: int
+    disk_total: int
+    sent: int
+    recv: int
+
+
+class Rates(NamedTuple):
+    dl: float = 0
+    ul: float = 0
+    disk_fill: float = 0
+
+
+class SystemMetrics:
+    """Samples host metrics once per `interval` into a ring buffer.
+
+    Renderers read `latest()` and `rates()` instead of hitting psutil
+    themselves, so a status tick costs no syscalls at all."""
+
+    def __init__(self, interval=1, size=60):
+        self.interval = interval
+        self.samples = deque(maxlen=size)
+        self._lock = Lock()
+        self._task = None
+        cpu_percent()
+
+    def sample(self):
+        mem, swap, net = virtual_memory(), swap_memory(), net_io_counters()
+        disk = disk_usage(config_dict.get('DOWNLOAD_DIR') or '/')
+        sample = Sample(time(), cpu_percent(), mem.percent, mem.used, mem.available, mem.total, swap.percent, swap.total,
+                        disk.percent, disk.used, disk.free, disk.total, net.bytes_sent, net.bytes_recv)
+        with self._lock:
+            self.samples.append(sample)
+        return sample
+
+    async def _tick(self):
+        try:
+            await sync_to_async(self.sample)
+        except Exception as e:
+            LOGGER.error('%s: while sampling system metrics', e)
+
+    def start(self):
+        if self._task is None:
+            self.sample()
+            self._task = setInterval(self.interval, self._tick)
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def latest(self):
+        with self._lock:
+            if self.samples:
+                return self.samples[-1]
+        return self.sample()
+
+    def rates(self, window=5):
+        """DL/UL bytes/s from NIC counters and disk fill bytes/s over the last `window` seconds."""
+        with self._lock:
+            if len(self.samples) < 2:
+                return Rates()
+            last = self.samples[-1]
+            first = next((s for s in self.samples if last.time - s.time <= window), self.samples[-2])
+            if first is last:
+                first = self.samples[-2]
+        if (elapsed := last.time - first.time) <= 0:
+            return Rates()
+        return Rates(max(last.recv - first.recv, 0) / elapsed,
+                     max(last.sent - first.sent, 0) / elapsed,
+                     (last.disk_used - first.disk_used) / elapsed)
+
+
+sys_metrics = SystemMetrics()
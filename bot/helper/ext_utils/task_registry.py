@@ -0,0 +1,111 @@
+from logging import getLogger
+
+LOGGER = getLogger(__name__)
+
+
+class TaskDict(dict):
+    """mid -> status object mapping with gid, user and status indexes.
+
+    Indexes are kept in step with inserts, transitions (re-assigning a mid)
+    and removals, so lookups never have to walk every task. Status objects
+    whose status or gid follows engine state (`live`) are indexed by the gid
+    they were created with and report changes through set_status/add_gid
+    when they compute them, so inserting never queries an engine."""
+
+    def __init__(self):
+        super().__init__()
+        self._gids = {}
+        self._mid_gids = {}
+        self._users = {}
+        self._statuses = {}
+        self._status_of = {}
+
+    @staticmethod
+    def _user_id(task):
+        listener = getattr(task, 'listener', None) or getattr(task, '_listener', None)
+        return getattr(listener, 'user_id', None)
+
+    def _drop_status(self, mid):
+        if (status := self._status_of.pop(mid, None)) is not None:
+            mids = self._statuses[status]
+            mids.discard(mid)
+            if not mids:
+                del self._statuses[status]
+
+    def _unindex(self, mid):
+        task = super().get(mid)
+        if (user_id := self._user_id(task)) in self._users:
+            mids = self._users[user_id]
+            mids.discard(mid)
+            if not mids:
+                del self._users[user_id]
+        self._drop_status(mid)
+        for gid in self._mid_gids.pop(mid, ()):
+            if self._gids.get(gid) == mid:
+                del self._gids[gid]
+
+    def __setitem__(self, mid, task):
+        if mid in self:
+            self._unindex(mid)
+        super().__setitem__(mid, task)
+        self._users.setdefault(self._user_id(task), set()).add(mid)
+        try:
+            if getattr(task, 'live', False):
+                self.add_gid(mid, getattr(task, '_gid', None))
+            else:
+                self.add_gid(mid, task.gid())
+                self.set_status(mid, task.status())
+        except Exception as e:
+            LOGGER.error('TaskDict: %s, while indexing task %s', e, mid)
+
+    def __delitem__(self, mid):
+        self._unindex(mid)
+        super().__delitem__(mid)
+
+    def pop(self, mid, *args):
+        if mid in self:
+            task = self[mid]
+            del self[mid]
+            return task
+        return super().pop(mid, *args)
+
+    def clear(self):
+        super().clear()
+        self._gids.clear()
+        self._mid_gids.clear()
+        self._users.clear()
+        self._statuses.clear()
+        self._status_of.clear()
+
+    def get_by_gid(self, gid):
+        if (mid := self._gids.get(gid)) in self:
+            return self[mid]
+        return None
+
+    def add_gid(self, mid, gid, task=None):
+        if gid and mid in self and (task is None or super().get(mid) is task):
+            self._gids[gid] = mid
+            self._mid_gids.setdefault(mid, set()).add(gid)
+
+    def user_mids(self, user_id):
+        return sorted(self._users.get(user_id, ()))
+
+    def user_tasks(self, user_id):
+        return [self[mid] for mid in self.user_mids(user_id)]
+
+    def user_count(self, user_id):
+        return len(self._users.get(user_id, ()))
+
+    def set_status(self, mid, status, task=None):
+        if mid not in self or task is not None and super().get(mid) is not task:
+            return
+        if self._status_of.get(mid) != status:
+            self._drop_status(mid)
+            self._status_of[mid] = status
+            self._statuses.setdefault(status, set()).add(mid)
+
+    def status_tasks(self, status, user_id=None):
+        mids = self._statuses.get(status, set())
+        if user_id is not None:
+            mids = mids & self._users.get(user_id, set())
+        return [self[mid] for mid in sorted(mids) if mid in self]
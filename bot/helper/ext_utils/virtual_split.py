@@ -0,0 +1,60 @@
+from io import RawIOBase, SEEK_SET, SEEK_CUR, SEEK_END
+from os import path as ospath
+
+
+def virtual_parts(path: str, size: int, split_size: int):
+    """`split --numeric-suffixes=1 --suffix-length=3` layout of a file: (part path, offset, length)."""
+    return [(f'{path}.{i:03}', offset, min(split_size, size - offset)) for i, offset in enumerate(range(0, size, split_size), 1)]
+
+
+class FileSlice(RawIOBase):
+    """Read-only window over [offset, offset + length) of a file.
+
+    Passed to pyrogram in place of a path, so a part of a split is read from
+    the original file instead of being written out first. `name` is the part
+    name, which pyrogram uses for the document file name."""
+
+    def __init__(self, path: str, offset: int, length: int, name: str):
+        super().__init__()
+        self.name = ospath.basename(name)
+        self._fp = open(path, 'rb')
+        self._offset = offset
+        self._length = length
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, pos, whence=SEEK_SET):
+        if whence == SEEK_CUR:
+            pos += self._pos
+        elif whence == SEEK_END:
+            pos += self._length
+        self._pos = min(max(pos, 0), self._length)
+        return self._pos
+
+    def read(self, size=-1):
+        remaining = self._length - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b''
+        self._fp.seek(self._offset + self._pos)
+        data = self._fp.read(size)
+        self._pos += len(data)
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        self._fp.close()
+        super().close()
@@ -4,6 +4,7 @@ from time import time
 
 from bot import bot_loop, task_dict, task_dict_lock, Intervals, config_dict, QbTorrents, qb_listener_lock, get_client, LOGGER
 from bot.helper.ext_utils.bot_utils import sync_to_async, new_task
+from bot.helper.ext_utils.engine_snapshot import qb_snapshot
 from bot.helper.ext_utils.files_utils import clean_unwanted, clean_target
 from bot.helper.ext_utils.status_utils import get_readable_file_size, get_readable_time, getTaskByGid
 from bot.helper.ext_utils.task_manager import stop_duplicate_check, check_limits_size
@@ -105,11 +106,14 @@ async def _qb_listener():
     while True:
         async with qb_listener_lock:
             try:
-                if len(await sync_to_async(client.torrents_info)) == 0:
+                torrents = await sync_to_async(qb_snapshot.refresh, True)
+                if qb_snapshot.stale:
+                    raise ConnectionError('Unable to refresh torrents, skipping this check')
+                if not torrents:
                     Intervals['qb'] = ''
                     await sync_to_async(client.auth_log_out)
                     return
-                for tor_info in await sync_to_async(client.torrents_info):
+                for tor_info in list(torrents.values()):
                     tag = tor_info.tags
                     if tag not in QbTorrents:
                         continue
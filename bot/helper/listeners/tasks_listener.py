@@ -15,7 +15,7 @@ from bot.helper.ext_utils.bot_utils import is_premium_user, UserDaily, default_b
 from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.files_utils import get_path_size, clean_download, clean_target, join_files
 from bot.helper.ext_utils.links_utils import is_magnet, is_url, get_link, is_media, is_gdrive_link, get_stream_link, is_gdrive_id
-from bot.helper.ext_utils.media_utils import get_document_type
+from bot.helper.ext_utils.media_utils import get_document_type, get_split_cuts, get_split_size
 from bot.helper.ext_utils.shortenurl import short_url
 from bot.helper.ext_utils.status_utils import action, get_date_time, get_readable_file_size, get_readable_time
 from bot.helper.ext_utils.task_manager import start_from_queued, check_running_tasks
@@ -33,6 +33,7 @@ from bot.helper.mirror_utils.upload_utils.telegram_uploader import TgUploader
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.message_utils import limit, sendCustom, sendMedia, sendMessage, auto_delete_message, sendSticker, sendFile, copyMessage, sendingMessage, update_status_message, delete_status
 from bot.helper.video_utils.processor import process_video
+from bot.helper.video_utils.remux import RemuxPlan
 
 
 class TaskListener(TaskConfig):
@@ -43,9 +44,8 @@ class TaskListener(TaskConfig):
     async def clean():
         try:
             if st := Intervals['status']:
-                for intvl in list(st.values()):
-                    intvl.cancel()
-            Intervals['status'].clear()
+                st.cancel()
+            Intervals['status'] = ''
             await gather(sync_to_async(aria2.purge), delete_status())
         except:
             pass
@@ -55,9 +55,21 @@ class TaskListener(TaskConfig):
             self.sameDir['tasks'].remove(self.mid)
             self.sameDir['total'] -= 1
 
+    @property
+    def taskKey(self):
+        """Incomplete-task DB key; bulk/multi entries share the command message link, so they add their task id."""
+        if self.mid == self.message.id:
+            return self.message.link
+        return f'{self.message.link}#{-self.mid}'
+
+    def _entry(self):
+        if self.mid == self.message.id:
+            return None, None
+        return self.message.text, self.message.reply_to_message_id
+
     async def onDownloadStart(self):
         if self.isSuperChat and config_dict['INCOMPLETE_TASK_NOTIFIER'] and DATABASE_URL:
-            await DbManager().add_incomplete_task(self.message.chat.id, self.message.link, self.tag)
+            await DbManager().add_incomplete_task(self.message.chat.id, self.taskKey, self.tag, *self._entry())
 
     async def onDownloadComplete(self):
         async with task_dict_lock:
@@ -90,7 +102,7 @@ class TaskListener(TaskConfig):
                 multi_links = True
             task = task_dict[self.mid]
             self.name = task.name()
-            gid = task.gid()
+            gid = await sync_to_async(task.gid)
             self.gid = gid
 
         up_path = ospath.join(self.dir, self.name)
@@ -145,16 +157,23 @@ class TaskListener(TaskConfig):
             if not up_path:
                 return
 
+        plan = None
         if (await get_document_type(up_path))[0]:
-            processed_path = await process_video(up_path, self)
-            if processed_path:
-                up_path = processed_path
-            else:
+            plan = RemuxPlan(up_path)
+            if not await process_video(up_path, self, plan):
                 return
 
         if not self.compress and not self.extract and not self.vidMode:
             up_path = await self.preName(up_path)
-            await self.editMetadata(up_path, gid)
+            if plan:
+                plan.path = up_path
+            await self.editMetadata(up_path, gid, plan)
+
+        if plan and plan.needed:
+            if self.isLeech and not self.compress and (file_size := await aiopath.getsize(up_path)) > self.splitSize:
+                plan.cuts = await get_split_cuts(up_path, file_size, get_split_size(file_size, self.splitSize, self.equalSplits) - 5000000)
+            if not (up_path := await plan.run(self, gid)):
+                return
 
         if one_path := await self.isOneFile(up_path):
             up_path = one_path
@@ -216,7 +235,7 @@ class TaskListener(TaskConfig):
     async def onUploadComplete(self, name, link, size, files, folders, mime_type, rclonePath='', dir_id=''):
         msg = ''
         if self.isSuperChat and config_dict['INCOMPLETE_TASK_NOTIFIER'] and DATABASE_URL:
-            await DbManager().rm_complete_task(self.message.link)
+            await DbManager().rm_complete_task(self.taskKey)
 
         LOGGER.info('Task Done: %s', name)
         dt_date, dt_time = get_date_time(self.message)
@@ -434,7 +453,7 @@ class TaskListener(TaskConfig):
         else:
             await update_status_message(self.message.chat.id)
         if self.isSuperChat and config_dict['INCOMPLETE_TASK_NOTIFIER'] and DATABASE_URL:
-            await DbManager().rm_complete_task(self.message.link)
+            await DbManager().rm_complete_task(self.taskKey)
 
         if not isinstance(error, str):
             error = str(error)
@@ -507,7 +526,7 @@ class TaskListener(TaskConfig):
         else:
             await update_status_message(self.message.chat.id)
         if self.isSuperChat and config_dict['INCOMPLETE_TASK_NOTIFIER'] and DATABASE_URL:
-            await DbManager().rm_complete_task(self.message.link)
+            await DbManager().rm_complete_task(self.taskKey)
 
         if not isinstance(error, str):
             error = str(error)
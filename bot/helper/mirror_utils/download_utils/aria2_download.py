@@ -69,7 +69,7 @@ async def add_aria2c_download(listener: task.TaskListener, dpath: str, header: s
                 return
             task = task_dict[listener.mid]
             task.queued = False
-            new_gid = task.gid()
+            new_gid = await sync_to_async(task.gid)
         await sync_to_async(aria2.client.unpause, new_gid)
         LOGGER.info('Start Queued Download from Aria2c: %s. Gid: %s', name, gid)
         async with queue_dict_lock:
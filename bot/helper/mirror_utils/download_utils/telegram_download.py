@@ -1,17 +1,22 @@
 from __future__ import annotations
-from asyncio import Lock, gather
+from aiofiles.os import makedirs
+from asyncio import Lock, gather, sleep
 from logging import getLogger, ERROR
-from os import path as ospath
-from pyrogram import Client
+from math import ceil
+from os import path as ospath, open as osopen, close as osclose, ftruncate, posix_fallocate, pwrite, O_CREAT, O_WRONLY
+from pyrogram import Client, raw
+from pyrogram.errors import FloodWait, FileReferenceExpired, FileReferenceInvalid
+from pyrogram.file_id import FileId
 from time import time
 
-from bot import bot, task_dict, task_dict_lock, non_queued_dl, queue_dict_lock, LOGGER
+from bot import bot, bot_loop, task_dict, task_dict_lock, non_queued_dl, queue_dict_lock, LOGGER
 from bot.helper.ext_utils.links_utils import is_media
 from bot.helper.ext_utils.status_utils import get_readable_file_size
 from bot.helper.ext_utils.task_manager import check_running_tasks, stop_duplicate_check, check_limits_size
 from bot.helper.listeners import tasks_listener as task
 from bot.helper.mirror_utils.status_utils.queue_status import QueueStatus
 from bot.helper.mirror_utils.status_utils.telegram_status import TelegramStatus
+from bot.helper.stream_utils.custom_dl import ByteStreamer
 from bot.helper.telegram_helper.message_utils import sendStatusMessage
 
 
@@ -19,6 +24,10 @@ global_lock = Lock()
 GLOBAL_GID = set()
 getLogger('pyrogram').setLevel(ERROR)
 
+CHUNK_SIZE = 1024 * 1024
+CHUNKED_MIN_SIZE = 20 * CHUNK_SIZE
+DOWNLOAD_SESSIONS = 4
+
 
 class TelegramDownloadHelper:
 
@@ -29,6 +38,8 @@ class TelegramDownloadHelper:
         self._id = ''
         self._is_cancelled = False
         self._client: Client = bot
+        self._location = None
+        self._location_lock = Lock()
         self.download_completed = False
 
     @property
@@ -79,18 +90,76 @@ class TelegramDownloadHelper:
 
     async def _download(self, message, path):
         try:
-            download = await self._client.download_media(message, file_name=path, progress=self._onDownloadProgress)
+            media = is_media(message)
+            if media.file_size >= CHUNKED_MIN_SIZE and not message.photo:
+                download = await self._download_chunks(message, media, path)
+            else:
+                download = await self._client.download_media(message, file_name=path, progress=self._onDownloadProgress)
             if self._is_cancelled:
                 return
         except Exception as e:
             LOGGER.error(e)
-            self._onDownloadError(str(e))
+            await self._onDownloadError(str(e))
             return
         if download:
             await self._onDownloadComplete()
         elif not self._is_cancelled:
             await self._onDownloadError('Internal error occurred')
 
+    async def _download_chunks(self, message, media, path):
+        """Fetch 1 MiB GetFile ranges over several media sessions of the file's DC into a preallocated file."""
+        file_id = FileId.decode(media.file_id)
+        sessions = await ByteStreamer.get_media_sessions(file_id, self._client, DOWNLOAD_SESSIONS)
+        self._location = await ByteStreamer.get_location(file_id)
+        await makedirs(ospath.dirname(path), exist_ok=True)
+        fd = osopen(path, O_WRONLY | O_CREAT, 0o644)
+        parts = iter(range(ceil(media.file_size / CHUNK_SIZE)))
+        tasks = [bot_loop.create_task(self._fetch_parts(session, message, parts, fd)) for session in sessions]
+        try:
+            try:
+                posix_fallocate(fd, 0, media.file_size)
+            except OSError:
+                ftruncate(fd, media.file_size)
+            await gather(*tasks)
+        finally:
+            for part_task in tasks:
+                part_task.cancel()
+            await gather(*tasks, return_exceptions=True)
+            osclose(fd)
+        return path
+
+    async def _fetch_parts(self, session, message, parts, fd):
+        for part in parts:
+            if self._is_cancelled:
+                return
+            offset = part * CHUNK_SIZE
+            chunk = await self._get_part(session, message, offset)
+            pwrite(fd, chunk, offset)
+            self._processed_bytes += len(chunk)
+
+    async def _get_part(self, session, message, offset):
+        for attempt in range(1, 6):
+            location = self._location
+            try:
+                r = await session.invoke(raw.functions.upload.GetFile(location=location, offset=offset, limit=CHUNK_SIZE))
+                return r.bytes
+            except FloodWait as f:
+                await sleep(f.value * 1.2)
+            except (FileReferenceExpired, FileReferenceInvalid):
+                await self._refresh_location(message, location)
+            except Exception as e:
+                if attempt == 5 or self._is_cancelled:
+                    raise e
+                LOGGER.warning('%s. Retrying range at %s of %s', e, offset, self._listener.name)
+                await sleep(attempt)
+        raise Exception(f'Failed to fetch range at {offset} after 5 attempts!')
+
+    async def _refresh_location(self, message, stale):
+        async with self._location_lock:
+            if self._location is stale:
+                message = await self._client.get_messages(message.chat.id, message.id)
+                self._location = await ByteStreamer.get_location(FileId.decode(is_media(message).file_id))
+
     async def add_download(self, message, path):
         if self._listener.session and self._listener.session != bot:
             self._client = self._listener.session
@@ -3,7 +3,8 @@ from time import time
 
 from bot import aria2, LOGGER
 from bot.helper.ext_utils.bot_utils import sync_to_async
-from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_time
+from bot.helper.ext_utils.engine_snapshot import aria2_snapshot
+from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_time, TaskStatus
 
 
 def get_download(gid, old_info=None):
@@ -14,7 +15,9 @@ def get_download(gid, old_info=None):
         return old_info
 
 
-class Aria2Status:
+class Aria2Status(TaskStatus):
+    live = True
+
     def __init__(self, listener, gid, seeding=False, queued=False):
         self._gid = gid
         self._download = None
@@ -32,14 +35,12 @@ class Aria2Status:
         return get_readable_time(time() - self._elapsed)
 
     def _update(self):
-        if not self._download:
-            self._download = get_download(self._gid, self._download)
-        else:
-            self._download = self._download.live
+        self._download = aria2_snapshot.get(self._gid) or get_download(self._gid, self._download)
 
         if self._download.followed_by_ids:
             self._gid = self._download.followed_by_ids[0]
-            self._download = get_download(self._gid)
+            self._download = aria2_snapshot.get(self._gid) or get_download(self._gid)
+            self._report(gid=self._gid)
 
     def progress(self):
         return self._download.progress_string()
@@ -60,6 +61,9 @@ class Aria2Status:
         return self._download.eta_string()
 
     def status(self):
+        return self._report(self._state())
+
+    def _state(self):
         self._update()
         if self._download.is_waiting or self.queued:
             return MirrorStatus.STATUS_QUEUEUP if self.seeding else MirrorStatus.STATUS_QUEUEDL
@@ -1,9 +1,9 @@
 from time import time
 
-from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_file_size, get_readable_time
+from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_file_size, get_readable_time, TaskStatus
 
 
-class DirectStatus:
+class DirectStatus(TaskStatus):
     def __init__(self, listener, obj, gid):
         self._gid = gid
         self._obj = obj
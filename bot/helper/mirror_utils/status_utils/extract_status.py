@@ -1,16 +1,15 @@
 from time import time
 
 from bot import subprocess_lock, LOGGER
-from bot.helper.ext_utils.bot_utils import async_to_sync
-from bot.helper.ext_utils.files_utils import get_path_size
-from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time
+from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time, TaskStatus
 
 
-class ExtractStatus:
+class ExtractStatus(TaskStatus):
     def __init__(self, listener, size, gid):
         self._size = size
         self._gid = gid
         self._start_time = time()
+        self._processed = 0
         self.listener = listener
 
     @staticmethod
@@ -58,8 +57,10 @@ class ExtractStatus:
         return get_readable_file_size(self.processed_raw())
 
     def processed_raw(self):
-        return (async_to_sync(get_path_size, self.listener.newDir) if self.listener.newDir
-                else async_to_sync(get_path_size, self.listener.dir) - self._size)
+        return min(self._processed, self._size)
+
+    def set_processed(self, processed):
+        self._processed = processed
 
     def task(self):
         return self
@@ -3,10 +3,10 @@ from time import time
 from bot import LOGGER, VID_MODE
 from bot.helper.ext_utils.bot_utils import async_to_sync
 from bot.helper.ext_utils.files_utils import get_path_size
-from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time
+from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time, TaskStatus
 
 
-class FFMpegStatus:
+class FFMpegStatus(TaskStatus):
     def __init__(self, listener, obj, gid, status):
         self._gid = gid
         self._obj = obj
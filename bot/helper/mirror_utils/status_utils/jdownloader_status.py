@@ -4,7 +4,7 @@ from time import time
 from bot import LOGGER, jd_lock, jd_downloads
 from bot.helper.ext_utils.bot_utils import retry_function
 from bot.helper.ext_utils.jdownloader_booter import jdownloader
-from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_file_size, get_readable_time
+from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_file_size, get_readable_time, TaskStatus
 
 
 def _get_combined_info(result, start_time):
@@ -49,7 +49,9 @@ def get_download(gid, old_info, start_time):
         return old_info
 
 
-class JDownloaderStatus:
+class JDownloaderStatus(TaskStatus):
+    live = True
+
     def __init__(self, listener, gid):
         self.listener = listener
         self._gid = gid
@@ -88,6 +90,9 @@ class JDownloaderStatus:
         return get_readable_time(eta) if (eta := self._info.get('eta', False)) else '-'
 
     def status(self):
+        return self._report(self._state())
+
+    def _state(self):
         self._update()
         state = self._info.get('status', 'paused')
         if state.lower() == 'paused':
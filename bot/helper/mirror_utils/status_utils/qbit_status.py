@@ -3,7 +3,8 @@ from time import time
 
 from bot import QbTorrents, qb_listener_lock, get_client, LOGGER
 from bot.helper.ext_utils.bot_utils import sync_to_async
-from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_file_size, get_readable_time
+from bot.helper.ext_utils.engine_snapshot import qb_snapshot
+from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_file_size, get_readable_time, TaskStatus
 
 
 def get_download(client, tag, old_info=None):
@@ -14,7 +15,9 @@ def get_download(client, tag, old_info=None):
         return old_info
 
 
-class QbittorrentStatus:
+class QbittorrentStatus(TaskStatus):
+    live = True
+
     def __init__(self, listener, seeding=False, queued=False):
         self.listener = listener
         self.queued = queued
@@ -28,7 +31,10 @@ class QbittorrentStatus:
         return 'qBittorrent'
 
     def _update(self, attempt=0):
-        if new_info := get_download(self.client, f'{self.listener.mid}'):
+        tag = f'{self.listener.mid}'
+        if new_info := qb_snapshot.get(tag) or get_download(self.client, tag):
+            if self._info is None:
+                self._report(gid=new_info.hash[:12])
             self._info = new_info
         elif attempt < 3:
             return self._update(attempt+1)
@@ -55,6 +61,9 @@ class QbittorrentStatus:
         return get_readable_time(self._info.eta)
 
     def status(self):
+        return self._report(self._state())
+
+    def _state(self):
         self._update()
         state = self._info.state
         if state == 'queuedDL' or self.queued:
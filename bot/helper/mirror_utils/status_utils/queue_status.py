@@ -1,10 +1,10 @@
 from time import time
 
 from bot import LOGGER
-from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time
+from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time, TaskStatus
 
 
-class QueueStatus:
+class QueueStatus(TaskStatus):
     def __init__(self, listener, size, gid, status):
         self._size = size
         self._gid = gid
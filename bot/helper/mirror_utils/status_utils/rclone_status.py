@@ -1,9 +1,9 @@
 from time import time
 
-from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_time
+from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_time, TaskStatus
 
 
-class RcloneStatus:
+class RcloneStatus(TaskStatus):
     def __init__(self, listener, obj, gid, status):
         self._obj = obj
         self._gid = gid
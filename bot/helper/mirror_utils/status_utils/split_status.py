@@ -3,16 +3,17 @@ from time import time
 from bot import subprocess_lock, LOGGER
 from bot.helper.ext_utils.bot_utils import async_to_sync
 from bot.helper.ext_utils.files_utils import get_path_size
-from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time
+from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time, TaskStatus
 
 
-class SplitStatus:
+class SplitStatus(TaskStatus):
     def __init__(self, listener, size, gid):
         self._size = size
         self._gid = gid
         self._start_time = time()
         self.listener = listener
         self.state = ''
+        self.part = self.parts = 0
 
     def engine(self):
         return 'p7zip' if self.state == 'archive' else 'FFmpeg'
@@ -39,6 +40,8 @@ class SplitStatus:
         return f'{get_readable_file_size(self.speed_raw())}/s'
 
     def name(self):
+        if self.parts:
+            return f'{self.listener.name} (Part {self.part}/{self.parts})'
         return self.listener.name
 
     def size(self):
@@ -1,8 +1,8 @@
 from time import time
 from bot.helper.ext_utils.status_constants import MirrorStatus
-from bot.helper.ext_utils.status_utils import get_readable_file_size, get_readable_time
+from bot.helper.ext_utils.status_utils import get_readable_file_size, get_readable_time, TaskStatus
 
-class VideoStatus:
+class VideoStatus(TaskStatus):
     def __init__(self, listener, size, gid, process):
         self._listener = listener
         self._size = size
@@ -11,6 +11,13 @@ class VideoStatus:
         self._start_time = time()
         self._processed_bytes = 0
 
+    @staticmethod
+    def engine():
+        return 'FFmpeg'
+
+    def elapsed(self):
+        return get_readable_time(time() - self._start_time)
+
     def gid(self):
         return self._gid
 
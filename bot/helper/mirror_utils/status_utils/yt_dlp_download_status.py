@@ -2,10 +2,10 @@ from time import time
 
 from bot.helper.ext_utils.bot_utils import async_to_sync
 from bot.helper.ext_utils.files_utils import get_path_size
-from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_file_size, get_readable_time
+from bot.helper.ext_utils.status_utils import MirrorStatus, get_readable_file_size, get_readable_time, TaskStatus
 
 
-class YtDlpDownloadStatus:
+class YtDlpDownloadStatus(TaskStatus):
     def __init__(self, listener, obj, gid):
         self._obj = obj
         self._gid = gid
@@ -2,17 +2,17 @@ from time import time
 from os import path as ospath
 
 from bot import subprocess_lock, LOGGER
-from bot.helper.ext_utils.bot_utils import async_to_sync
-from bot.helper.ext_utils.files_utils import get_path_size
-from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time
+from bot.helper.ext_utils.status_utils import get_readable_file_size, MirrorStatus, get_readable_time, TaskStatus
 
 
-class ZipStatus:
-    def __init__(self, listener, size, gid, zpath=''):
+class ZipStatus(TaskStatus):
+    def __init__(self, listener, size, gid, zpath='', dir_size=0):
         self._size = size
         self._gid = gid
         self._zpath = zpath
+        self._dir_size = dir_size
         self._start_time = time()
+        self._processed = 0
         self._iszpath = False
         self.listener = listener
 
@@ -44,8 +44,7 @@ class ZipStatus:
     def name(self):
         if self._zpath and (zname := ospath.basename(self._zpath)) != self.listener.name:
             self._iszpath = True
-            zsize = get_readable_file_size(async_to_sync(get_path_size, self.listener.dir))
-            return f'{self.listener.name} ({zsize}) ~ {zname}.zip'
+            return f'{self.listener.name} ({get_readable_file_size(self._dir_size)}) ~ {zname}.zip'
         return self.listener.name
 
     def size(self):
@@ -62,7 +61,10 @@ class ZipStatus:
         return MirrorStatus.STATUS_ARCHIVING
 
     def processed_raw(self):
-        return async_to_sync(get_path_size, self.listener.newDir) if self.listener.newDir or self._zpath else async_to_sync(get_path_size, self.listener.dir) - self._size
+        return min(self._processed, self._size)
+
+    def set_processed(self, processed):
+        self._processed = processed
 
     def processed_bytes(self):
         return get_readable_file_size(self.processed_raw())
@@ -1,22 +1,26 @@
 from __future__ import annotations
 from aiofiles.os import path as aiopath, rename as aiorename, makedirs
 from aioshutil import copy
-from asyncio import sleep, gather
+from asyncio import CancelledError, gather
+from contextlib import nullcontext
 from logging import getLogger
 from natsort import natsorted
 from os import path as ospath, walk
 from PIL import Image
+from pyrogram import raw, utils
 from pyrogram.errors import FloodWait, RPCError
 from pyrogram.types import InputMediaVideo, InputMediaDocument, InputMediaPhoto, Message
 from re import match as re_match
 from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type, RetryError
 from time import time
 
-from bot import bot, bot_dict, bot_lock, config_dict, DEFAULT_SPLIT_SIZE, LOGGER
+from bot import bot, bot_loop, bot_dict, bot_lock, config_dict, DEFAULT_SPLIT_SIZE, LOGGER
 from bot.helper.ext_utils.bot_utils import sync_to_async, default_button
+from bot.helper.ext_utils.client_pool import client_pool
 from bot.helper.ext_utils.files_utils import clean_unwanted, clean_target, get_path_size, is_archive, get_base_name
-from bot.helper.ext_utils.media_utils import create_thumbnail, take_ss, get_document_type, get_media_info, get_audio_thumb, post_media_info, GenSS
+from bot.helper.ext_utils.media_utils import create_thumbnail, drop_thumbnail, take_ss, get_document_type, get_media_info, get_audio_thumb, post_media_info, GenSS
 from bot.helper.ext_utils.shortenurl import short_url
+from bot.helper.ext_utils.virtual_split import FileSlice, virtual_parts
 from bot.helper.listeners import tasks_listener as task
 from bot.helper.stream_utils.file_properties import gen_link
 from bot.helper.telegram_helper.button_build import ButtonMaker
@@ -45,6 +49,11 @@ class TgUploader:
         self._up_path = ''
         self._leech_log = config_dict['LEECH_LOG']
         self._uploaded_files = set()
+        self._slices = {}
+        self._transfers = {}
+        self._prepared = {}
+        self._prefetch = 2
+        self._workers = 1
 
     async def _upload_progress(self, current, _):
         if self._is_cancelled:
@@ -58,68 +67,83 @@ class TgUploader:
         await self._user_settings()
         await self._msg_to_reply()
         corrupted_files = total_files = 0
+        files_list = []
         for dirpath, _, files in sorted(await sync_to_async(walk, self._path)):
             if dirpath.endswith('/yt-dlp-thumb'):
                 continue
             for file_ in natsorted(files):
-                self._up_path = ospath.join(dirpath, file_)
-                LOGGER.info(f"Checking file: {self._up_path}")
-                LOGGER.info(f"Uploaded files set: {self._uploaded_files}")
-                if self._up_path in self._uploaded_files:
-                    LOGGER.info(f"Skipping already uploaded file: {self._up_path}")
+                f_path = ospath.join(dirpath, file_)
+                if split_size := self._listener.virtualSplits.get(f_path):
+                    for num, (part_path, offset, length) in enumerate(parts := virtual_parts(f_path, await aiopath.getsize(f_path), split_size), 1):
+                        self._slices[part_path] = (f_path, offset, length, num == len(parts))
+                        files_list.append((dirpath, ospath.basename(part_path)))
+                else:
+                    files_list.append((dirpath, file_))
+        for index, (dirpath, file_) in enumerate(files_list):
+            self._up_path = up_path = ospath.join(dirpath, file_)
+            LOGGER.info(f"Checking file: {self._up_path}")
+            LOGGER.info(f"Uploaded files set: {self._uploaded_files}")
+            if self._up_path in self._uploaded_files:
+                LOGGER.info(f"Skipping already uploaded file: {self._up_path}")
+                continue
+            if file_.lower().endswith(tuple(self._listener.extensionFilter)) or file_.startswith('Thumb'):
+                if not file_.startswith('Thumb'):
+                    await clean_target(self._up_path)
+                continue
+            try:
+                f_size = await self._get_size(self._up_path)
+                if file_ in o_files:
                     continue
-                if file_.lower().endswith(tuple(self._listener.extensionFilter)) or file_.startswith('Thumb'):
-                    if not file_.startswith('Thumb'):
-                        await clean_target(self._up_path)
+                if self._listener.seed and f_size in m_size:
                     continue
-                try:
-                    f_size = await get_path_size(self._up_path)
-                    if file_ in o_files:
-                        continue
-                    if self._listener.seed and f_size in m_size:
-                        continue
-                    if f_size == 0:
-                        corrupted_files += 1
-                        LOGGER.error('%s size is zero, telegram don\'t upload zero size files', self._up_path)
-                        continue
-                    if self._is_cancelled:
-                        return
-                    caption = await self._prepare_file(file_, dirpath)
-                    if self._last_msg_in_group:
-                        group_lists = [x for v in self._media_dict.values() for x in v.keys()]
-                        match = re_match(r'.+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)', self._up_path)
-                        if not match or match and match.group(0) not in group_lists:
-                            for key, value in list(self._media_dict.items()):
-                                for subkey, msgs in list(value.items()):
-                                    if len(msgs) > 1:
-                                        await self._send_media_group(msgs, subkey, key)
-                    self._last_msg_in_group = False
-                    self._last_uploaded = 0
-                    await self._upload_file(caption, file_)
-                    self._uploaded_files.add(self._up_path)
-                    LOGGER.info(f"Added to uploaded files set: {self._up_path}")
-                    LOGGER.info(f"Updated uploaded files set: {self._uploaded_files}")
-                    total_files += 1
-                    if self._is_cancelled:
-                        return
-                    if not self._is_corrupted and (self._listener.isSuperChat or self._leech_log):
-                        self._msgs_dict[self._send_msg.link] = file_
-                    await sleep(3)
-                except Exception as err:
-                    if isinstance(err, RetryError):
-                        LOGGER.info('Total Attempts: %s', err.last_attempt.attempt_number, exc_info=True)
-                        corrupted_files += 1
-                        self._is_corrupted = True
-                        err = err.last_attempt.exception()
-                    LOGGER.error('%s. Path: %s', err, self._up_path)
+                if f_size == 0:
                     corrupted_files += 1
-                    if self._is_cancelled:
-                        return
+                    LOGGER.error('%s size is zero, telegram don\'t upload zero size files', self._up_path)
                     continue
-                finally:
-                    if not self._is_cancelled and await aiopath.exists(self._up_path) and (not self._listener.seed or self._listener.newDir or
-                        dirpath.endswith('/splited_files_mltb') or '/copied_mltb/' in self._up_path):
-                        await clean_target(self._up_path)
+                if self._is_cancelled:
+                    return
+                await self._schedule_ahead(files_list, index, o_files, m_size)
+                caption = await self._prepare_file(file_, dirpath)
+                if self._last_msg_in_group:
+                    group_lists = [x for v in self._media_dict.values() for x in v.keys()]
+                    match = re_match(r'.+(?=\.0*\d+$)|.+(?=\.part\d+\..+$)', self._up_path)
+                    if not match or match and match.group(0) not in group_lists:
+                        for key, value in list(self._media_dict.items()):
+                            for subkey, msgs in list(value.items()):
+                                if len(msgs) > 1:
+                                    await self._send_media_group(msgs, subkey, key)
+                self._last_msg_in_group = False
+                self._last_uploaded = 0
+                await self._upload_file(caption, file_, media=await self._take_media(up_path))
+                self._uploaded_files.add(self._up_path)
+                LOGGER.info(f"Added to uploaded files set: {self._up_path}")
+                LOGGER.info(f"Updated uploaded files set: {self._uploaded_files}")
+                total_files += 1
+                if self._is_cancelled:
+                    return
+                if not self._is_corrupted and (self._listener.isSuperChat or self._leech_log):
+                    self._msgs_dict[self._send_msg.link] = file_
+            except Exception as err:
+                if isinstance(err, RetryError):
+                    LOGGER.info('Total Attempts: %s', err.last_attempt.attempt_number, exc_info=True)
+                    corrupted_files += 1
+                    self._is_corrupted = True
+                    err = err.last_attempt.exception()
+                LOGGER.error('%s. Path: %s', err, self._up_path)
+                corrupted_files += 1
+                if self._is_cancelled:
+                    return
+                continue
+            finally:
+                for tasks in (self._transfers, self._prepared):
+                    if pending := tasks.pop(up_path, None):
+                        pending.cancel()
+                if not self._is_cancelled and await aiopath.exists(self._up_path) and (not self._listener.seed or self._listener.newDir or
+                    dirpath.endswith('/splited_files_mltb') or '/copied_mltb/' in self._up_path):
+                    await clean_target(self._up_path)
+                await drop_thumbnail(up_path)
+                if (slice_ := self._slices.get(up_path)) and slice_[3] and not self._is_cancelled and (not self._listener.seed or self._listener.newDir):
+                    await clean_target(slice_[0])
 
         for key, value in list(self._media_dict.items()):
             for subkey, msgs in list(value.items()):
@@ -139,107 +163,29 @@ class TgUploader:
         await self._listener.onUploadComplete(self._listener.name, None, self._size, self._msgs_dict, total_files, corrupted_files)
 
     @retry(wait=wait_exponential(multiplier=2, min=4, max=8), stop=stop_after_attempt(4), retry=retry_if_exception_type(Exception))
-    async def _upload_file(self, caption, file, force_document=False):
+    async def _upload_file(self, caption, file, force_document=False, media=None):
         LOGGER.info(f"Uploading file: {self._up_path}")
-        if self._thumb and not await aiopath.exists(self._thumb):
-            self._thumb = None
-        thumb, ss_image = self._thumb, None
         if self._is_cancelled:
             return
+        thumb, key = None, 'documents'
         try:
-            upload_mode = self._listener.user_dict.get('upload_mode', 'split')
-            use_userbot = (bot_dict.get('IS_PREMIUM') and await get_path_size(self._up_path) > DEFAULT_SPLIT_SIZE and upload_mode == 'userbot') or \
-                          (bot_dict.get('USERBOT') and config_dict['USERBOT_LEECH'])
-
-            async with bot_lock:
-                self._client = bot_dict['USERBOT'] if use_userbot else bot
-            is_video, is_audio, is_image = await get_document_type(self._up_path)
-            if not is_image and thumb is None:
-                file_name = ospath.splitext(file)[0]
-                thumb_path = ospath.join(self._path, 'yt-dlp-thumb', f'{file_name}.jpg')
-                if await aiopath.isfile(thumb_path):
-                    thumb = thumb_path
-                elif is_audio and not is_video:
-                    thumb = await get_audio_thumb(self._up_path)
-            if is_video:
-                duration = (await get_media_info(self._up_path))[0]
-                ss_image = await self._gen_ss(self._up_path)
-                if self._listener.screenShots:
-                    await self._send_screenshots()
-                if not thumb:
-                    thumb = await create_thumbnail(self._up_path, duration)
-
-            if self._listener.as_doc or force_document or (not is_video and not is_audio and not is_image):
-                key = 'documents'
-                if self._is_cancelled:
-                    return
-                self._send_msg = await self._client.send_document(chat_id=self._send_msg.chat.id,
-                                                                  document=self._up_path,
-                                                                  thumb=thumb,
-                                                                  caption=caption,
-                                                                  disable_notification=True,
-                                                                  progress=self._upload_progress,
-                                                                  reply_to_message_id=self._send_msg.id)
-            elif is_video:
-                key = 'videos'
-                if thumb:
-                    with Image.open(thumb) as img:
-                        width, height = img.size
-                else:
-                    width, height = 480, 320
-                if not self._up_path.upper().endswith(('.MKV', '.MP4')):
-                    dirpath, file_ = ospath.split(self._up_path)
-                    if self._listener.seed and not self._listener.newDir and not dirpath.endswith('/splited_files_mltb'):
-                        dirpath = ospath.join(dirpath, 'copied_mltb')
-                        await makedirs(dirpath, exist_ok=True)
-                        new_path = ospath.join(dirpath, f'{ospath.splitext(file_)[0]}.mp4')
-                        self._up_path = await copy(self._up_path, new_path)
-                    else:
-                        new_path = f'{ospath.splitext(self._up_path)[0]}.mp4'
-                        await aiorename(self._up_path, new_path)
-                        self._up_path = new_path
-                if self._is_cancelled:
-                    return
-                self._send_msg = await self._client.send_video(chat_id=self._send_msg.chat.id,
-                                                               video=self._up_path,
-                                                               caption=caption,
-                                                               duration=duration,
-                                                               width=width,
-                                                               height=height,
-                                                               thumb=thumb,
-                                                               supports_streaming=True,
-                                                               disable_notification=True,
-                                                               progress=self._upload_progress,
-                                                               reply_to_message_id=self._send_msg.id)
-            elif is_audio:
-                key = 'audios'
-                duration, artist, title = await get_media_info(self._up_path)
-                if self._is_cancelled:
-                    return
-                self._send_msg = await self._client.send_audio(chat_id=self._send_msg.chat.id,
-                                                               audio=self._up_path,
-                                                               caption=caption,
-                                                               duration=duration,
-                                                               performer=artist,
-                                                               title=title,
-                                                               thumb=thumb,
-                                                               disable_notification=True,
-                                                               progress=self._upload_progress,
-                                                               reply_to_message_id=self._send_msg.id)
-            else:
-                key = 'photos'
-                if self._is_cancelled:
-                    return
-                self._send_msg = await bot.send_photo(chat_id=self._send_msg.chat.id,
-                                                      photo=self._up_path,
-                                                      caption=caption,
-                                                      disable_notification=True,
-                                                      progress=self._upload_progress,
-                                                      reply_to_message_id=self._send_msg.id)
+            if media is None:
+                media = await self._prepare_media(self._up_path, file)
+            media['path'] = await self._send_path(media)
+            if not media['file']:
+                media['client'] = await self._pick_client(media)
+            self._client, self._up_path, thumb = media['client'], media['path'], media['thumb']
+            if media['screenshots']:
+                await self._send_screenshots(media['screenshots'])
+                media['screenshots'] = None
+            key = self._media_key(media, force_document)
             if self._is_cancelled:
                 return
-            await self._final_message(ss_image, bool(is_video or is_audio))
-            
+            await self._send_media(media, key, caption)
+            if self._is_cancelled:
+                return
+            await self._final_message(media['ss_image'], bool(media['is_video'] or media['is_audio']))
+
             if self._send_msg.chat.id != self._listener.user_id:
                 await self._copy_Leech(self._listener.user_id, self._send_msg)
             if self._listener.upDest and self._send_msg.chat.id != self._listener.upDest:
@@ -262,17 +208,211 @@ class TgUploader:
                 await clean_target(thumb)
         except FloodWait as f:
             LOGGER.warning(f, exc_info=True)
-            await sleep(f.value * 1.2)
+            client_pool.penalize(self._client, f.value * 1.2)
+            raise f
         except Exception as err:
-            if not self._thumb and thumb:
-                await clean_target(thumb)
             err_type = 'RPCError: ' if isinstance(err, RPCError) else ''
             LOGGER.error('%s%s. Path: %s', err_type, err, self._up_path)
             if 'Telegram says: [400' in str(err) and key != 'documents':
                 LOGGER.error('Retrying As Document. Path: %s', self._up_path, exc_info=True)
-                return await self._upload_file(caption, file, True)
+                return await self._upload_file(caption, file, True, media)
             raise err
 
+    async def _prepare_media(self, up_path, file):
+        if self._thumb and not await aiopath.exists(self._thumb):
+            self._thumb = None
+        media = {'path': up_path, 'size': await self._get_size(up_path), 'client': None, 'thumb': self._thumb, 'ss_image': None, 'duration': 0,
+                 'width': 480, 'height': 320, 'artist': None, 'title': None, 'screenshots': None, 'file': None, 'thumb_file': None}
+        is_video, is_audio, is_image = (False, False, False) if up_path in self._slices else await get_document_type(up_path)
+        media.update(is_video=is_video, is_audio=is_audio, is_image=is_image)
+        if not is_image and media['thumb'] is None:
+            file_name = ospath.splitext(file)[0]
+            thumb_path = ospath.join(self._path, 'yt-dlp-thumb', f'{file_name}.jpg')
+            if await aiopath.isfile(thumb_path):
+                media['thumb'] = thumb_path
+            elif is_audio and not is_video:
+                media['thumb'] = await get_audio_thumb(up_path)
+        if is_video:
+            media['duration'] = (await get_media_info(up_path))[0]
+            media['ss_image'] = await self._gen_ss(up_path)
+            if self._listener.screenShots:
+                ss_nb = int(self._listener.screenShots) if isinstance(self._listener.screenShots, str) else 10
+                media['screenshots'] = await take_ss(up_path, ss_nb, media['duration'])
+            if not media['thumb']:
+                media['thumb'] = await create_thumbnail(up_path, media['duration'])
+        match self._media_key(media):
+            case 'videos':
+                if media['thumb']:
+                    with Image.open(media['thumb']) as img:
+                        media['width'], media['height'] = img.size
+            case 'audios':
+                media['duration'], media['artist'], media['title'] = await get_media_info(up_path)
+        return media
+
+    async def _send_path(self, media):
+        """Videos other than MKV/MP4 go out as .mp4. Done at send time, since media may be prepared ahead in the background."""
+        up_path = media['path']
+        if self._media_key(media) != 'videos' or up_path.upper().endswith(('.MKV', '.MP4')):
+            return up_path
+        dirpath, file_ = ospath.split(up_path)
+        if self._listener.seed and not self._listener.newDir and not dirpath.endswith('/splited_files_mltb'):
+            dirpath = ospath.join(dirpath, 'copied_mltb')
+            await makedirs(dirpath, exist_ok=True)
+            return await copy(up_path, ospath.join(dirpath, f'{ospath.splitext(file_)[0]}.mp4'))
+        new_path = f'{ospath.splitext(up_path)[0]}.mp4'
+        await aiorename(up_path, new_path)
+        return new_path
+
+    async def _pick_client(self, media):
+        upload_mode = self._listener.user_dict.get('upload_mode', 'split')
+        async with bot_lock:
+            if bot_dict.get('IS_PREMIUM') and media['size'] > DEFAULT_SPLIT_SIZE and upload_mode == 'userbot':
+                return bot_dict['USERBOT']
+            main = bot_dict['USERBOT'] if bot_dict.get('USERBOT') and config_dict['USERBOT_LEECH'] else bot
+            helpers = bot_dict.get('HELPERS', []) if self._send_msg.chat.id != self._listener.user_id else []
+            return client_pool.pick([main, *helpers])
+
+    def _media_key(self, media, force_document=False):
+        if self._listener.as_doc or force_document or not (media['is_video'] or media['is_audio'] or media['is_image']):
+            return 'documents'
+        if media['is_video']:
+            return 'videos'
+        return 'audios' if media['is_audio'] else 'photos'
+
+    async def _send_media(self, media, key, caption):
+        await client_pool.wait(self._client)
+        if media['file']:
+            await self._send_uploaded(media, key, caption)
+            return
+        with client_pool.use(self._client, media['size']):
+            await self._send_file(media, key, caption)
+
+    async def _send_file(self, media, key, caption):
+        match key:
+            case 'documents':
+                with self._open(self._up_path) as document:
+                    self._send_msg = await self._client.send_document(chat_id=self._send_msg.chat.id,
+                                                                      document=document,
+                                                                      thumb=media['thumb'],
+                                                                      caption=caption,
+                                                                      disable_notification=True,
+                                                                      progress=self._upload_progress,
+                                                                      reply_to_message_id=self._send_msg.id)
+            case 'videos':
+                self._send_msg = await self._client.send_video(chat_id=self._send_msg.chat.id,
+                                                               video=self._up_path,
+                                                               caption=caption,
+                                                               duration=media['duration'],
+                                                               width=media['width'],
+                                                               height=media['height'],
+                                                               thumb=media['thumb'],
+                                                               supports_streaming=True,
+                                                               disable_notification=True,
+                                                               progress=self._upload_progress,
+                                                               reply_to_message_id=self._send_msg.id)
+            case 'audios':
+                self._send_msg = await self._client.send_audio(chat_id=self._send_msg.chat.id,
+                                                               audio=self._up_path,
+                                                               caption=caption,
+                                                               duration=media['duration'],
+                                                               performer=media['artist'],
+                                                               title=media['title'],
+                                                               thumb=media['thumb'],
+                                                               disable_notification=True,
+                                                               progress=self._upload_progress,
+                                                               reply_to_message_id=self._send_msg.id)
+            case _:
+                self._send_msg = await bot.send_photo(chat_id=self._send_msg.chat.id,
+                                                      photo=self._up_path,
+                                                      caption=caption,
+                                                      disable_notification=True,
+                                                      progress=self._upload_progress,
+                                                      reply_to_message_id=self._send_msg.id)
+
+    # ================================================= PARALLEL ================================================
+    async def _should_transfer(self, up_path, file_, o_files, m_size):
+        if up_path in self._uploaded_files or file_ in o_files or file_.startswith('Thumb') or file_.lower().endswith(tuple(self._listener.extensionFilter)):
+            return False
+        f_size = await self._get_size(up_path)
+        return f_size > 0 and not (self._listener.seed and f_size in m_size)
+
+    async def _schedule_ahead(self, files_list, index, o_files, m_size):
+        """Prepare the next `_prefetch` files in the background, and with several workers also
+        transfer up to `_workers` of them ahead of the message that is sent next."""
+        ahead = 0
+        for dirpath, file_ in files_list[index:]:
+            if ahead > max(self._prefetch, self._workers - 1) or self._is_cancelled:
+                break
+            up_path = ospath.join(dirpath, file_)
+            if not await self._should_transfer(up_path, file_, o_files, m_size):
+                continue
+            if up_path not in self._prepared:
+                self._prepared[up_path] = bot_loop.create_task(self._prepare_media(up_path, file_))
+            if self._workers > 1 and ahead < self._workers and up_path not in self._transfers:
+                self._transfers[up_path] = bot_loop.create_task(self._transfer(self._prepared[up_path]))
+            ahead += 1
+
+    async def _take_media(self, up_path):
+        prepared, transfer = self._prepared.pop(up_path, None), self._transfers.pop(up_path, None)
+        if not (pending := transfer or prepared):
+            return None
+        try:
+            return await pending
+        except CancelledError:
+            if not self._is_cancelled:
+                raise
+        except Exception as e:
+            LOGGER.error('%s. Background preparation failed, uploading directly. Path: %s', e, up_path)
+
+    async def _transfer(self, prepared):
+        media = await prepared
+        if self._is_cancelled or self._media_key(media) == 'photos':
+            return media
+        media['client'] = client = await self._pick_client(media)
+        last = 0
+
+        async def progress(current, _):
+            nonlocal last
+            if self._is_cancelled:
+                client.stop_transmission()
+            self._processed_bytes += current - last
+            last = current
+
+        with client_pool.use(client, media['size']):
+            if media['thumb']:
+                media['thumb_file'] = await client.save_file(media['thumb'])
+            with self._open(media['path']) as source:
+                media['file'] = await client.save_file(source, progress=progress)
+        return media
+
+    async def _send_uploaded(self, media, key, caption):
+        """Send a file whose parts were already saved by `_transfer`, replying to the current message."""
+        client = media['client']
+        file_name = ospath.basename(media['path'])
+        attributes = [raw.types.DocumentAttributeFilename(file_name=file_name)]
+        if key == 'videos':
+            mime_type = client.guess_mime_type(file_name) or 'video/mp4'
+            attributes.insert(0, raw.types.DocumentAttributeVideo(supports_streaming=True, duration=media['duration'], w=media['width'], h=media['height']))
+        elif key == 'audios':
+            mime_type = client.guess_mime_type(file_name) or 'audio/mpeg'
+            attributes.insert(0, raw.types.DocumentAttributeAudio(duration=media['duration'], performer=media['artist'], title=media['title']))
+        else:
+            mime_type = client.guess_mime_type(file_name) or 'application/zip'
+        r = await client.invoke(raw.functions.messages.SendMedia(peer=await client.resolve_peer(self._send_msg.chat.id),
+                                                                 media=raw.types.InputMediaUploadedDocument(mime_type=mime_type,
+                                                                                                            file=media['file'],
+                                                                                                            thumb=media['thumb_file'],
+                                                                                                            attributes=attributes,
+                                                                                                            force_file=key == 'documents'),
+                                                                 silent=True,
+                                                                 reply_to=raw.types.InputReplyToMessage(reply_to_msg_id=self._send_msg.id),
+                                                                 random_id=client.rnd_id(),
+                                                                 **await utils.parse_text_entities(client, caption, None, None)))
+        msg_id = next(update.message.id for update in r.updates
+                      if isinstance(update, (raw.types.UpdateNewMessage, raw.types.UpdateNewChannelMessage)))
+        self._send_msg = await client.get_messages(self._send_msg.chat.id, msg_id)
+    # ===========================================================================================================
+
     async def _user_settings(self):
         self._media_group = self._listener.user_dict.get('media_group', False) or ('media_group' not in self._listener.user_dict and config_dict['MEDIA_GROUP'])
         self._cap_mode = self._listener.user_dict.get('caption_style', 'mono')
@@ -281,6 +421,7 @@ class TgUploader:
         self._enable_ss = self._listener.user_dict.get('enable_ss', False)
         self._user_caption = self._listener.user_dict.get('captions', False)
         self._user_fnamecap = self._listener.user_dict.get('fnamecap', True)
+        self._workers = max(int(self._listener.user_dict.get('upload_workers') or config_dict['LEECH_UPLOAD_WORKERS'] or 1), 1)
         if config_dict['AUTO_THUMBNAIL']:
             for dirpath, _, files in await sync_to_async(walk, self._path):
                 for file in files:
@@ -302,10 +443,23 @@ class TgUploader:
 
     async def cancel_task(self):
         self._is_cancelled = True
+        for pending in [*self._transfers.values(), *self._prepared.values()]:
+            pending.cancel()
         LOGGER.info('Cancelling Upload: %s', self._listener.name)
         await self._listener.onUploadError('Upload stopped by user!')
 
     # ================================================== UTILS ==================================================
+    async def _get_size(self, up_path):
+        if slice_ := self._slices.get(up_path):
+            return slice_[2]
+        return await get_path_size(up_path)
+
+    def _open(self, up_path):
+        """Virtual split parts are read from their range of the original file, other files by path."""
+        if slice_ := self._slices.get(up_path):
+            return FileSlice(slice_[0], slice_[1], slice_[2], up_path)
+        return nullcontext(up_path)
+
     async def _prepare_file(self, file_, dirpath):
         caption = self._caption_mode(file_)
         return caption
@@ -370,12 +524,7 @@ class TgUploader:
         self._send_msg = msgs_list[-1]
 
     @handle_message
-    async def _send_screenshots(self):
-        if isinstance(self._listener.screenShots, str):
-            ss_nb = int(self._listener.screenShots)
-        else:
-            ss_nb = 10
-        outputs = await take_ss(self._up_path, ss_nb)
+    async def _send_screenshots(self, outputs: list):
         inputs = []
         if outputs:
             for m in outputs:
@@ -425,8 +574,12 @@ class TgUploader:
 
         self._send_msg = await bot.get_messages(self._send_msg.chat.id, self._send_msg.id)
         try:
-            if (buttons := self._buttons.build_menu(2)) and (cmsg := await self._send_msg.edit_reply_markup(buttons)):
-                self._send_msg = cmsg
+            if buttons := self._buttons.build_menu(2):
+                if self._client in bot_dict.get('HELPERS', []):
+                    await self._client.edit_message_reply_markup(self._send_msg.chat.id, self._send_msg.id, buttons)
+                    self._send_msg.reply_markup = buttons
+                elif cmsg := await self._send_msg.edit_reply_markup(buttons):
+                    self._send_msg = cmsg
         except Exception as e:
             LOGGER.error('Error while editing reply markup: %s', e)
 
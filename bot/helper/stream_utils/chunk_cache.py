@@ -0,0 +1,103 @@
+from aiofiles import open as aiopen
+from aiofiles.os import makedirs, remove
+from collections import OrderedDict
+from os import path as ospath
+from shutil import rmtree
+
+from bot import config_dict, LOGGER
+
+
+class ChunkCache:
+    """Two-tier cache of stream chunks keyed by (file unique id, chunk index).
+
+    Recent chunks live in an in-memory LRU; every chunk is also written to an
+    on-disk LRU store, so head, tail and seek regions of popular files survive
+    memory eviction. Both tiers are capped in MiB by STREAM_CACHE_MEMORY and
+    STREAM_CACHE_DISK (0 disables a tier)."""
+
+    def __init__(self, path='stream_cache'):
+        self._path = path
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        self._disk = OrderedDict()
+        self._disk_size = 0
+        self.hits = {'memory': 0, 'disk': 0}
+        self.misses = 0
+        rmtree(path, ignore_errors=True)
+
+    @staticmethod
+    def _limit(key):
+        return (config_dict.get(key) or 0) * 1024 * 1024
+
+    def _file(self, key):
+        return ospath.join(self._path, f'{key[0]}_{key[1]}')
+
+    def _put_memory(self, key, chunk):
+        if (limit := self._limit('STREAM_CACHE_MEMORY')) < len(chunk):
+            return
+        if key in self._memory:
+            self._memory_size -= len(self._memory.pop(key))
+        self._memory[key] = chunk
+        self._memory_size += len(chunk)
+        while self._memory_size > limit:
+            self._memory_size -= len(self._memory.popitem(last=False)[1])
+
+    async def _put_disk(self, key, chunk):
+        if key in self._disk or (limit := self._limit('STREAM_CACHE_DISK')) < len(chunk):
+            return
+        self._disk[key] = len(chunk)
+        self._disk_size += len(chunk)
+        try:
+            await makedirs(self._path, exist_ok=True)
+            async with aiopen(self._file(key), 'wb') as f:
+                await f.write(chunk)
+        except OSError as e:
+            LOGGER.error('%s: while caching stream chunk %s', e, key)
+            await self._drop_disk(key)
+            return
+        while self._disk_size > limit:
+            await self._drop_disk(next(iter(self._disk)))
+
+    async def _drop_disk(self, key):
+        if (size := self._disk.pop(key, None)) is not None:
+            self._disk_size -= size
+            try:
+                await remove(self._file(key))
+            except OSError:
+                pass
+
+    async def get(self, key):
+        if (chunk := self._memory.get(key)) is not None:
+            self._memory.move_to_end(key)
+            self.hits['memory'] += 1
+            return chunk
+        if key in self._disk:
+            try:
+                async with aiopen(self._file(key), 'rb') as f:
+                    chunk = await f.read()
+            except OSError:
+                await self._drop_disk(key)
+            else:
+                self._disk.move_to_end(key)
+                self.hits['disk'] += 1
+                self._put_memory(key, chunk)
+                return chunk
+        self.misses += 1
+        return None
+
+    async def put(self, key, chunk):
+        self._put_memory(key, chunk)
+        await self._put_disk(key, chunk)
+
+    def stats(self):
+        return {'hits': self.hits['memory'] + self.hits['disk'],
+                'memory_hits': self.hits['memory'],
+                'disk_hits': self.hits['disk'],
+                'misses': self.misses,
+                'memory_chunks': len(self._memory),
+                'memory_bytes': self._memory_size,
+                'disk_chunks': len(self._disk),
+                'disk_bytes': self._disk_size}
+
+
+chunk_cache = ChunkCache()
@@ -1,68 +1,147 @@
-from asyncio import sleep
-from pyrogram import utils, raw
-from pyrogram.errors import AuthBytesInvalid
+from asyncio import Lock, sleep
+from collections import deque
+from pyrogram import Client, utils, raw
+from pyrogram.errors import AuthBytesInvalid, FloodWait
 from pyrogram.file_id import FileId, FileType, ThumbnailSource
 from pyrogram.session import Session, Auth
-from typing import Dict, Union
+from typing import Dict, List, Union
 
-from bot import bot, bot_loop, LOGGER
+from bot import bot, bot_dict, bot_loop, config_dict, LOGGER
+from bot.helper.ext_utils.client_pool import ClientPool
 from bot.helper.ext_utils.exceptions import FIleNotFound
+from bot.helper.stream_utils.chunk_cache import chunk_cache
 from bot.helper.stream_utils.file_properties import get_file_ids
 
+stream_pool = ClientPool()
+
+
+class StreamSource:
+    """Client, media session and file location serving one stream.
+
+    Streams are bound to the least-loaded of the main bot and the helper bots
+    (LEECH_HELPER_TOKENS) and re-bound to another client on FloodWait."""
+
+    def __init__(self, message_id: int, file_id: FileId):
+        self.message_id = message_id
+        self.file_id = file_id
+        self.client = self.session = self.location = None
+        self.lock = Lock()
+
+    @staticmethod
+    def clients() -> List[Client]:
+        return [bot, *bot_dict.get('HELPERS', [])]
+
+    async def bind(self):
+        self.release()
+        client, file_id = stream_pool.pick(self.clients()), self.file_id
+        if client is not bot:
+            try:
+                file_id = await get_file_ids(self.message_id, client)
+            except Exception as e:
+                LOGGER.warning('%s: @%s cannot stream message %s, using main bot', e, client.me.username, self.message_id)
+                stream_pool.penalize(client, 300)
+                client, file_id = bot, self.file_id
+        self.session = await ByteStreamer._generate_media_session(file_id, client)
+        self.location = await ByteStreamer.get_location(file_id)
+        self.client = client
+        stream_pool.acquire(client)
+
+    async def failover(self, client: Client, seconds: int):
+        stream_pool.penalize(client, seconds)
+        async with self.lock:
+            if self.client is client:
+                await self.bind()
+        if self.client is client:
+            await sleep(seconds)
+
+    def release(self):
+        if self.client:
+            stream_pool.release(self.client)
+            self.client = None
+
 
 class ByteStreamer:
-    def __init__(self):
-        self._cached_file_ids: Dict[int, FileId] = {}
-        bot_loop.create_task(self._clean_cache())
-
-    async def get_file_properties(self, message_id: int) -> FileId:
-        if message_id not in self._cached_file_ids:
-            file_id = await get_file_ids(message_id)
-            if not file_id:
-                LOGGER.info('Message with ID %s not found!', message_id)
-                raise FIleNotFound
-            self._cached_file_ids[message_id] = file_id
-        return self._cached_file_ids[message_id]
-
-    async def yield_file(self, file_id: FileId, offset: int, first_part_cut: int, last_part_cut: int, part_count: int, chunk_size: int) -> Union[str, None]:
-        media_session = await self._generate_media_session(file_id)
-        current_part = 1
-        location = await self._get_location(file_id)
+    _extra_sessions: Dict[tuple, List[Session]] = {}
+    _sessions_lock = Lock()
+
+    @staticmethod
+    async def get_file_properties(message_id: int) -> FileId:
         try:
-            r = await media_session.invoke(raw.functions.upload.GetFile(location=location, offset=offset, limit=chunk_size))
-            if isinstance(r, raw.types.upload.File):
-                while current_part <= part_count:
-                    chunk = r.bytes
-                    if not chunk:
-                        break
-                    offset += chunk_size
-                    if part_count == 1:
-                        yield chunk[first_part_cut:last_part_cut]
-                        break
-                    if current_part == 1:
-                        yield chunk[first_part_cut:]
-                    if 1 < current_part <= part_count:
-                        yield chunk
-                    r = await media_session.invoke(raw.functions.upload.GetFile(location=location, offset=offset, limit=chunk_size))
-                    current_part += 1
+            return await get_file_ids(message_id)
+        except FIleNotFound:
+            LOGGER.info('Message with ID %s not found!', message_id)
+            raise
+
+    async def yield_file(self, message_id: int, file_id: FileId, offset: int, first_part_cut: int, last_part_cut: int, part_count: int, chunk_size: int) -> Union[str, None]:
+        source = StreamSource(message_id, file_id)
+        window = max(config_dict['STREAM_READ_AHEAD'] or 1, 1)
+        pending, next_part = deque(), 0
+
+        def request_next():
+            nonlocal next_part
+            if next_part < part_count:
+                index = offset // chunk_size + next_part
+                pending.append(bot_loop.create_task(self._get_chunk(source, file_id.unique_id, index, chunk_size)))
+                next_part += 1
+
+        try:
+            await source.bind()
+            for _ in range(window):
+                request_next()
+            for current_part in range(1, part_count + 1):
+                chunk = await pending.popleft()
+                request_next()
+                if part_count == 1:
+                    yield chunk[first_part_cut:last_part_cut]
+                elif current_part == 1:
+                    yield chunk[first_part_cut:]
+                elif current_part == part_count:
+                    yield chunk[:last_part_cut]
+                else:
+                    yield chunk
         except (TimeoutError, AttributeError) as e:
             LOGGER.error(e, exc_info=True)
-        except Exception:
-            pass
+            raise
+        finally:
+            for task in pending:
+                if task.done() and not task.cancelled():
+                    task.exception()
+                task.cancel()
+            source.release()
 
     @staticmethod
-    async def _generate_media_session(file_id: FileId) -> Session:
-        media_session = bot.media_sessions.get(file_id.dc_id, None)
+    async def _get_chunk(source: StreamSource, unique_id: str, index: int, chunk_size: int) -> bytes:
+        key = (unique_id, index)
+        if (chunk := await chunk_cache.get(key)) is not None:
+            return chunk
+        for attempt in range(len(source.clients()) + 1):
+            client = source.client
+            try:
+                r = await source.session.invoke(raw.functions.upload.GetFile(location=source.location, offset=index * chunk_size, limit=chunk_size))
+                break
+            except FloodWait as f:
+                LOGGER.warning('FloodWait of %ss while streaming from @%s', f.value, client.me.username)
+                if attempt == len(source.clients()):
+                    raise
+                await source.failover(client, f.value)
+        if isinstance(r, raw.types.upload.File) and (chunk := r.bytes):
+            await chunk_cache.put(key, chunk)
+            return chunk
+        raise ConnectionError(f'Empty chunk {index} of {unique_id}, aborting stream')
+
+    @staticmethod
+    async def _generate_media_session(file_id: FileId, client: Client = bot) -> Session:
+        media_session = client.media_sessions.get(file_id.dc_id, None)
         if media_session is None:
-            if file_id.dc_id != await bot.storage.dc_id():
-                media_session = Session(bot,
+            if file_id.dc_id != await client.storage.dc_id():
+                media_session = Session(client,
                                         file_id.dc_id,
-                                        await Auth(bot, file_id.dc_id, await bot.storage.test_mode()).create(),
-                                        await bot.storage.test_mode(),
+                                        await Auth(client, file_id.dc_id, await client.storage.test_mode()).create(),
+                                        await client.storage.test_mode(),
                                         is_media=True)
                 await media_session.start()
                 for _ in range(6):
-                    exported_auth = await bot.invoke(raw.functions.auth.ExportAuthorization(dc_id=file_id.dc_id))
+                    exported_auth = await client.invoke(raw.functions.auth.ExportAuthorization(dc_id=file_id.dc_id))
                     try:
                         await media_session.invoke(raw.functions.auth.ImportAuthorization(id=exported_auth.id, bytes=exported_auth.bytes))
                         break
@@ -73,17 +152,40 @@ class ByteStreamer:
                     await media_session.stop()
                     raise AuthBytesInvalid
             else:
-                media_session = Session(bot,
+                media_session = Session(client,
                                         file_id.dc_id,
-                                        await bot.storage.auth_key(),
-                                        await bot.storage.test_mode(),
+                                        await client.storage.auth_key(),
+                                        await client.storage.test_mode(),
                                         is_media=True)
                 await media_session.start()
-            bot.media_sessions[file_id.dc_id] = media_session
+            client.media_sessions[file_id.dc_id] = media_session
         return media_session
 
+    @classmethod
+    async def get_media_sessions(cls, file_id: FileId, client: Client = bot, count: int = 1) -> List[Session]:
+        """Return `count` media sessions for the file's DC; extra sessions reuse the authorized key of the first one."""
+        async with cls._sessions_lock:
+            media_session = await cls._generate_media_session(file_id, client)
+            sessions = cls._extra_sessions.setdefault((client, file_id.dc_id), [])
+            while len(sessions) < count - 1:
+                session = Session(client, file_id.dc_id, media_session.auth_key, await client.storage.test_mode(), is_media=True)
+                await session.start()
+                sessions.append(session)
+        return [media_session, *sessions[:count - 1]]
+
+    @classmethod
+    async def drop_sessions(cls, client: Client):
+        """Stop the extra media sessions opened for a client that is no longer in use."""
+        async with cls._sessions_lock:
+            for key in [key for key in cls._extra_sessions if key[0] is client]:
+                for session in cls._extra_sessions.pop(key):
+                    try:
+                        await session.stop()
+                    except Exception as e:
+                        LOGGER.error('%s: while stopping stream session', e)
+
     @staticmethod
-    async def _get_location(file_id: FileId) -> Union[raw.types.InputPhotoFileLocation, raw.types.InputDocumentFileLocation, raw.types.InputPeerPhotoFileLocation]:
+    async def get_location(file_id: FileId) -> Union[raw.types.InputPhotoFileLocation, raw.types.InputDocumentFileLocation, raw.types.InputPeerPhotoFileLocation]:
         match file_id.file_type:
             case FileType.CHAT_PHOTO:
                 if file_id.chat_id > 0:
@@ -119,8 +221,3 @@ class ByteStreamer:
                     thumb_size=file_id.thumbnail_size,
                 )
         return location
-
-    async def _clean_cache(self) -> None:
-        while True:
-            await sleep(30 * 60)
-            self._cached_file_ids.clear()
@@ -1,28 +1,88 @@
+from asyncio import shield
+from collections import OrderedDict
 from html import escape
+from pyrogram import Client
 from pyrogram.file_id import FileId
 from pyrogram.types import Message
+from time import time
 from typing import Optional
 from urllib.parse import quote_plus
 
-from bot import bot, config_dict
+from bot import bot, bot_loop, config_dict
 from bot.helper.ext_utils.exceptions import FIleNotFound
 from bot.helper.ext_utils.links_utils import is_media
 
 
-async def get_file_ids(message_id: int) -> Optional[FileId]:
-    message = await bot.get_messages(config_dict['LEECH_LOG'], message_id)
-    if message.empty:
-        raise FIleNotFound
-    file_id = file_unique_id = None
-    if media := is_media(message):
-        file_id, file_unique_id = FileId.decode(media.file_id), media.file_unique_id
+class FilePropertiesCache:
+    """Bounded LRU of (client, LEECH_LOG message id) -> FileId with a TTL per entry.
+
+    FileIds carry per-account access hashes, so every streaming client keeps
+    its own entries. Missing messages are kept as negative entries for a
+    shorter TTL, and concurrent misses for the same key share a single
+    get_messages call."""
+
+    def __init__(self, max_size=2048, ttl=1800, negative_ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries = OrderedDict()
+        self._pending = {}
+
+    def put(self, key, file_id, ttl=None):
+        self._entries[key] = (time() + (ttl or self.ttl), file_id)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def _load(self, key):
+        try:
+            file_id = await _fetch_file_ids(*key)
+        except FIleNotFound:
+            self.put(key, None, self.negative_ttl)
+            raise
+        self.put(key, file_id)
+        return file_id
+
+    def _done(self, key, task):
+        if self._pending.get(key) is task:
+            del self._pending[key]
+
+    async def get(self, message_id, client=bot) -> FileId:
+        key = (client, message_id)
+        if entry := self._entries.get(key):
+            expires, file_id = entry
+            if expires > time():
+                self._entries.move_to_end(key)
+                if file_id is None:
+                    raise FIleNotFound
+                return file_id
+            del self._entries[key]
+        if not (task := self._pending.get(key)):
+            task = self._pending[key] = bot_loop.create_task(self._load(key))
+            task.add_done_callback(lambda t: self._done(key, t))
+        return await shield(task)
+
+
+def _file_properties(media) -> FileId:
+    file_id = FileId.decode(media.file_id)
     setattr(file_id, 'file_size', getattr(media, 'file_size', 0))
     setattr(file_id, 'mime_type', getattr(media, 'mime_type', ''))
     setattr(file_id, 'file_name', getattr(media, 'file_name', ''))
-    setattr(file_id, 'unique_id', file_unique_id)
+    setattr(file_id, 'unique_id', media.file_unique_id)
     return file_id
 
 
+async def _fetch_file_ids(client: Client, message_id: int) -> FileId:
+    message = await client.get_messages(config_dict['LEECH_LOG'], message_id)
+    if message.empty or not (media := is_media(message)):
+        raise FIleNotFound
+    return _file_properties(media)
+
+
+async def get_file_ids(message_id: int, client: Client = bot) -> Optional[FileId]:
+    return await file_cache.get(message_id, client)
+
+
 async def gen_link(message: Message):
     stream_link = dl_link = None
     if config_dict['ENABLE_STREAM_LINK'] and config_dict['STREAM_PORT'] and config_dict['LEECH_LOG'] and (base_url := config_dict['STREAM_BASE_URL']):
@@ -31,4 +91,9 @@ async def gen_link(message: Message):
         if getattr(media, 'mime_type', 'None/unknown').startswith('video'):
             stream_link = f'{base_url}/watch/{hash}{message.id}'
         dl_link = f'{base_url}/{message.id}/{quote_plus(escape(name))}?hash={hash}'
+        if getattr(message, '_client', None) is bot and str(message.chat.id) == str(config_dict['LEECH_LOG']):
+            file_cache.put((bot, message.id), _file_properties(media))
     return stream_link, dl_link
+
+
+file_cache = FilePropertiesCache()
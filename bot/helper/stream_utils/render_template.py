@@ -1,5 +1,3 @@
-from aiofiles import open as aiopen
-from aiohttp import ClientSession
 from os import path as ospath
 from time import time
 from urllib.parse import urljoin
@@ -11,14 +9,26 @@ from bot.helper.ext_utils.status_utils import get_readable_file_size, get_readab
 from bot.helper.stream_utils.file_properties import get_file_ids
 
 
-async def render_page(message_id, secure_hash, is_home=False, ddl=''):
+def _load_templates():
     tpath = ospath.join('bot', 'helper', 'stream_utils', 'template')
+    templates = {}
+    for name in ('home', 'req', 'dl'):
+        with open(ospath.join(tpath, f'{name}.html'), 'r') as f:
+            templates[name] = f.read()
+    for tag in ('video', 'audio'):
+        templates[tag] = templates['req'].replace('tag', tag)
+    return templates
+
+
+TEMPLATES = _load_templates()
+
+
+async def render_page(message_id, secure_hash, is_home=False, ddl=''):
     if is_home:
         channel = config_dict['CHANNEL_USERNAME']
         info = (f"<h1 style='text-align: center'><a href='https://t.me/{channel}'>@{channel}</a></h1><br>"
                 f"<h2 style='text-align: center'>Up Time: {get_readable_time(time() - botStartTime)}</h2>")
-        async with aiopen(ospath.join(tpath, 'home.html'), 'r') as f:
-            html = (await f.read()).replace("<!-- Print -->", info)
+        html = TEMPLATES['home'].replace("<!-- Print -->", info)
     else:
         if ddl:
             file_data = type('file_id', (object, ), {'file_name': get_url_name(ddl), 'mime_type': secure_hash or 'video'})
@@ -34,18 +44,12 @@ async def render_page(message_id, secure_hash, is_home=False, ddl=''):
         filename = file_data.file_name
         match file_data.mime_type.split('/')[0].strip():
             case 'video' as tag:
-                async with aiopen(ospath.join(tpath, 'req.html')) as r:
-                    heading = f'Watch: {filename}'
-                    html = (await r.read()).replace('tag', tag) % (heading, filename, src)
+                html = TEMPLATES[tag] % (f'Watch: {filename}', filename, src)
             case 'audio' as tag:
-                async with aiopen(ospath.join(tpath, 'req.html')) as r:
-                    heading = f'Listen {filename}'
-                    html = (await r.read()).replace('tag', tag) % (heading, filename, src)
+                html = TEMPLATES[tag] % (f'Listen {filename}', filename, src)
             case _:
                 if ddl:
                     raise FIleNotFound
-                async with aiopen(ospath.join(tpath, 'dl.html')) as r, ClientSession() as s, s.get(src) as u:
-                    heading = f'Download: {filename}'
-                    file_size = get_readable_file_size(int(u.headers.get('Content-Length')))
-                    html = (await r.read()) % (heading, filename, src, file_size)
+                file_size = get_readable_file_size(file_data.file_size or 0)
+                html = TEMPLATES['dl'] % (f'Download: {filename}', filename, src, file_size)
     return html
@@ -1,7 +1,6 @@
 from aiohttp import web
 from aiohttp.http_exceptions import BadStatusLine
 from base64 import b64decode
-from math import ceil, floor
 from mimetypes import guess_type
 from re import search as re_search
 
@@ -114,8 +113,8 @@ async def media_streamer(request: web.Request, message_id: int, secure_hash: str
     first_part_cut = from_bytes - offset
     last_part_cut = until_bytes % chunk_size + 1
     req_length = until_bytes - from_bytes + 1
-    part_count = ceil(until_bytes / chunk_size) - floor(offset / chunk_size)
-    body = stream.yield_file(file_id, offset, first_part_cut, last_part_cut, part_count, chunk_size)
+    part_count = until_bytes // chunk_size - offset // chunk_size + 1
+    body = stream.yield_file(message_id, file_id, offset, first_part_cut, last_part_cut, part_count, chunk_size)
     mime_type, file_name = file_id.mime_type, file_id.file_name
     disposition = 'attachment'
 
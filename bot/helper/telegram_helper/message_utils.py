@@ -1,4 +1,5 @@
-from asyncio import sleep, gather
+from asyncio import sleep, gather, wait_for, Event
+from collections import deque, OrderedDict
 from functools import wraps
 from pyrogram import Client
 from pyrogram.errors import FloodWait, UserBlocked, UserDeactivatedBan, UserDeactivated, UserIsBlocked, InputUserDeactivated
@@ -6,12 +7,12 @@ from pyrogram.types import Message, InlineKeyboardMarkup, InputMediaPhoto
 from re import match as re_match, findall as re_findall
 from time import time
 
-from bot import bot, bot_dict, bot_lock, bot_loop, Intervals, config_dict, task_dict_lock, status_dict, DATABASE_URL, LOGGER
-from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async
+from bot import bot, bot_dict, bot_lock, bot_loop, Intervals, config_dict, task_dict, task_dict_lock, status_dict, DATABASE_URL, LOGGER
+from bot.helper.ext_utils.bot_utils import setInterval, TokenBucket
 from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.exceptions import TgLinkException
 from bot.helper.ext_utils.files_utils import clean_target, downlod_content
-from bot.helper.ext_utils.status_utils import get_readable_message, get_progress_bar_string
+from bot.helper.ext_utils.status_utils import get_readable_message, get_status_text, get_status_buttons, get_task_snapshots, get_progress_bar_string
 from bot.helper.telegram_helper.bot_commands import BotCommands
 
 
@@ -36,18 +37,169 @@ class Limits:
 limit = Limits()
 
 
+class EditBudget:
+    """Global token bucket shared by every status edit, plus one bucket per chat.
+
+    Chat buckets are kept in last-use order; idle ones at the old end are
+    dropped, since a refilled, unblocked bucket is the same as a new one."""
+
+    def __init__(self, rate, chat_rate, chat_burst=1):
+        self.bucket = TokenBucket(rate, rate)
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self._chats = OrderedDict()
+
+    def _chat(self, chat_id):
+        if bucket := self._chats.get(chat_id):
+            self._chats.move_to_end(chat_id)
+        else:
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        while len(self._chats) > 1 and (oldest := next(iter(self._chats))) != chat_id and self._chats[oldest].idle():
+            del self._chats[oldest]
+        return bucket
+
+    def try_acquire(self, chat_id):
+        chat = self._chat(chat_id)
+        if not chat.try_acquire():
+            return False
+        if self.bucket.try_acquire():
+            return True
+        chat.refund()
+        return False
+
+    async def acquire(self, chat_id):
+        await self._chat(chat_id).acquire()
+        await self.bucket.acquire()
+
+    def penalize(self, chat_id, seconds):
+        self._chat(chat_id).penalize(seconds)
+
+
+status_budget = EditBudget(10, 1 / 3)
+
+
+class RequestScheduler:
+    """Single outbound queue for every call wrapped by handle_message.
+
+    Jobs are released by priority class under a global and a per chat token
+    bucket. A FloodWait penalises the bucket it came from and puts the job
+    back in front of its queue instead of sleeping inside the call, and a
+    queued edit of a message is superseded by a newer edit of the same one."""
+
+    REPLY, STATUS, LOG, BROADCAST = range(4)
+
+    def __init__(self, rate=25, chat_rate=1, chat_burst=3):
+        self.budget = EditBudget(rate, chat_rate, chat_burst)
+        self._queues = [deque() for _ in range(4)]
+        self._edits = {}
+        self._event = Event()
+        self._task = None
+        self._waits = deque(maxlen=100)
+
+    def submit(self, call, chat_id=None, priority=REPLY, key=None, block=True):
+        future = bot_loop.create_future()
+        if key and (job := self._edits.get(key)):
+            job.update(call=call, block=block)
+            job['futures'].append(future)
+            return future
+        job = {'call': call, 'chat_id': chat_id, 'priority': priority, 'key': key, 'block': block, 'futures': [future], 'time': time()}
+        if key:
+            self._edits[key] = job
+        self._queues[priority].append(job)
+        self._event.set()
+        if not self._task:
+            self._task = bot_loop.create_task(self._dispatch())
+        return future
+
+    def _acquire(self, chat_id):
+        return self.budget.bucket.try_acquire() if chat_id is None else self.budget.try_acquire(chat_id)
+
+    def _next(self):
+        for queue in self._queues:
+            for job in queue:
+                if self._acquire(job['chat_id']):
+                    queue.remove(job)
+                    return job
+        return None
+
+    async def _dispatch(self):
+        while True:
+            if not (job := self._next()):
+                self._event.clear()
+                try:
+                    await wait_for(self._event.wait(), 0.05 if self.depth() else None)
+                except TimeoutError:
+                    pass
+                continue
+            if job['key']:
+                self._edits.pop(job['key'], None)
+            self._waits.append(time() - job['time'])
+            bot_loop.create_task(self._run(job))
+
+    async def _run(self, job):
+        try:
+            result = await job['call']()
+        except FloodWait as f:
+            if job['chat_id'] is None:
+                self.budget.bucket.penalize(f.value)
+            else:
+                self.budget.penalize(job['chat_id'], f.value)
+            if job['block']:
+                LOGGER.warning('FloodWait of %ss on chat %s, request requeued', f.value, job['chat_id'])
+                job['time'] = time()
+                self._queues[job['priority']].appendleft(job)
+                self._event.set()
+                return
+            self._resolve(job, exception=f)
+        except Exception as e:
+            self._resolve(job, exception=e)
+        else:
+            self._resolve(job, result)
+
+    @staticmethod
+    def _resolve(job, result=None, exception=None):
+        for future in job['futures']:
+            if future.done():
+                continue
+            if exception:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+
+    def depth(self):
+        return sum(len(queue) for queue in self._queues)
+
+    def stats(self):
+        waits = list(self._waits)
+        return {'queued': [len(queue) for queue in self._queues],
+                'avg_wait': sum(waits) / len(waits) if waits else 0,
+                'max_wait': max(waits, default=0)}
+
+
+request_scheduler = RequestScheduler()
+_PRIORITIES = {'sendMedia': request_scheduler.LOG, 'copyMessage': request_scheduler.LOG, '_copy_Leech': request_scheduler.LOG, '_copy_media_group': request_scheduler.LOG}
+
+
+def _target(args):
+    ints = [arg for arg in args if isinstance(arg, int) and not isinstance(arg, bool)]
+    msgs = [arg for arg in args if isinstance(arg, Message)] or next((arg for arg in args if isinstance(arg, list) and arg and isinstance(arg[0], Message)), [])
+    chat_id = ints[0] if ints else (msgs[0].chat.id if msgs and msgs[0].chat else None)
+    message_id = msgs[0].id if msgs else (ints[1] if len(ints) > 1 else None)
+    return chat_id, message_id
+
+
 def handle_message(func):
     @wraps(func)
     async def wrapper(*args, **kwargs):
         func_name = func.__name__
+        priority = kwargs.pop('priority', _PRIORITIES.get(func_name, request_scheduler.REPLY))
+        chat_id, message_id = _target(args)
+        key = (func_name, chat_id, message_id) if 'edit' in func_name.lower() and message_id else None
         try:
-            return await func(*args, **kwargs)
+            return await request_scheduler.submit(lambda: func(*args, **kwargs), chat_id, priority, key, kwargs.get('block', True))
         except FloodWait as f:
             LOGGER.error('%s(): %s', func_name, f)
-            # if 'block' in kwargs and not kwargs['block'] and func_name in ['sendMessage', 'editMessage']:
-            #     return str(f)
-            await sleep(f.value * 1.2)
-            return await wrapper(*args, **kwargs)
+            return f
         except (UserBlocked, UserDeactivatedBan, UserDeactivated, UserIsBlocked, InputUserDeactivated):
             if DATABASE_URL:
                 user_id = args[0] if func_name == 'copyMessage' else args[1]
@@ -204,71 +356,91 @@ async def get_tg_link_message(link: str, user_id: int):
     raise TgLinkException('Failed getting data from link. Mostly message has been deleted or member chat required' + (f' try /{BotCommands.JoinChatCommand}!' if userbot == save_bot else '!'))
 
 
-async def update_status_message(sid, force=False):
-    LOGGER.info(f"Updating status message for sid: {sid}")
+async def _edit_status(sid, data, text, tasks_no):
+    if text is None:
+        async with task_dict_lock:
+            if status_dict.get(sid) is data:
+                del status_dict[sid]
+        return
+    if text == data['message'].text:
+        return
+    buttons = get_status_buttons(sid, data['is_user'], data['status'], tasks_no)
+    message = await editMessage(text, data['message'], buttons, block=False, priority=request_scheduler.STATUS)
+    if isinstance(message, FloodWait):
+        status_budget.penalize(data['message'].chat.id, message.value)
+    elif isinstance(message, str):
+        if message.startswith('Telegram says: [400'):
+            async with task_dict_lock:
+                if status_dict.get(sid) is data:
+                    del status_dict[sid]
+        else:
+            LOGGER.error('Status with id: %s haven\'t been updated. Error: %s', sid, message)
+    else:
+        data['message'].text = text
+        data['time'] = time()
+
+
+async def update_status_messages():
     async with task_dict_lock:
-        if not status_dict.get(sid):
-            if obj := Intervals['status'].get(sid):
+        if not status_dict:
+            if obj := Intervals['status']:
                 obj.cancel()
-                del Intervals['status'][sid]
+                Intervals['status'] = ''
             return
-        if not force and time() - status_dict[sid]['time'] < 3:
+        entries = [(sid, data) for sid, data in status_dict.items() if status_budget.try_acquire(data['message'].chat.id)]
+    if not entries:
+        return
+    snapshots = await get_task_snapshots()
+    views, edits = {}, []
+    for sid, data in entries:
+        key = (data['status'], data['page_no'], data['page_step'], sid if data['is_user'] else 0)
+        if key not in views:
+            views[key] = get_status_text(snapshots, sid, data['is_user'], data['page_no'], data['status'], data['page_step'])
+        edits.append(_edit_status(sid, data, *views[key]))
+    await gather(*edits)
+
+
+async def update_status_message(sid, force=False):
+    async with task_dict_lock:
+        if not (data := status_dict.get(sid)):
             return
-        status_dict[sid]['time'] = time()
-        page_no = status_dict[sid]['page_no']
-        status = status_dict[sid]['status']
-        is_user = status_dict[sid]['is_user']
-        page_step = status_dict[sid]['page_step']
-        text, buttons = await sync_to_async(get_readable_message, sid, is_user, page_no, status, page_step)
-        if text is None:
-            del status_dict[sid]
-            if obj := Intervals['status'].get(sid):
-                obj.cancel()
-                del Intervals['status'][sid]
+    chat_id = data['message'].chat.id
+    if force:
+        await status_budget.acquire(chat_id)
+    elif not status_budget.try_acquire(chat_id):
+        return
+    async with task_dict_lock:
+        if not (data := status_dict.get(sid)):
             return
-        if text != status_dict[sid]['message'].text:
-            message = await editMessage(text, status_dict[sid]['message'], buttons)
-            if isinstance(message, str):
-                if message.startswith('Telegram says: [400'):
-                    del status_dict[sid]
-                    if obj := Intervals['status'].get(sid):
-                        obj.cancel()
-                        del Intervals['status'][sid]
-                else:
-                    LOGGER.error('Status with id: %s haven\'t been updated. Error: %s', sid, message)
-                return
-            status_dict[sid]['message'].text = text
-            status_dict[sid]['time'] = time()
+    snapshots = await get_task_snapshots(sid if data['is_user'] else None)
+    text, tasks_no = get_status_text(snapshots, sid, data['is_user'], data['page_no'], data['status'], data['page_step'])
+    await _edit_status(sid, data, text, tasks_no)
 
 
 async def sendStatusMessage(msg, user_id=0):
+    sid = user_id or msg.chat.id
+    is_user = bool(user_id)
+    async with task_dict_lock:
+        data = status_dict.get(sid, {})
+    text, buttons = await get_readable_message(sid, is_user, data.get('page_no', 1), data.get('status', 'All'), data.get('page_step', 1))
     async with task_dict_lock:
-        sid = user_id or msg.chat.id
-        is_user = bool(user_id)
         if sid in list(status_dict):
-            page_no = status_dict[sid]['page_no']
-            status = status_dict[sid]['status']
-            page_step = status_dict[sid]['page_step']
-            text, buttons = await sync_to_async(get_readable_message, sid, is_user, page_no, status, page_step)
             if text is None:
                 del status_dict[sid]
-                if obj := Intervals['status'].get(sid):
-                    obj.cancel()
-                    del Intervals['status'][sid]
                 return
             message = status_dict[sid]['message']
-            _, message = await gather(deleteMessage(message), sendMessage(text, msg, buttons, block=False))
-            if isinstance(message, str):
+            _, message = await gather(deleteMessage(message), sendMessage(text, msg, buttons, block=False, priority=request_scheduler.STATUS))
+            if not isinstance(message, Message):
                 LOGGER.error('Status with id: %s haven\'t been updated. Error: %s', sid, message)
+                del status_dict[sid]
                 return
             message.text = text
             status_dict[sid].update({'message': message, 'time': time()})
         else:
-            text, buttons = await sync_to_async(get_readable_message, sid, is_user)
             if text is None:
                 return
-            message = await sendMessage(text, msg, buttons, block=False)
-            if isinstance(message, str):
+            message = await sendMessage(text, msg, buttons, block=False, priority=request_scheduler.STATUS)
+            if not isinstance(message, Message):
                 LOGGER.error('Status with id: %s haven\'t been updated. Error: %s', sid, message)
                 return
             message.text = text
@@ -278,8 +450,8 @@ async def sendStatusMessage(msg, user_id=0):
                                 'page_step': 1,
                                 'status': 'All',
                                 'is_user': is_user}
-    if not Intervals['status'].get(sid):
-        Intervals['status'][sid] = setInterval(config_dict['STATUS_UPDATE_INTERVAL'], update_status_message, sid)
+    if not Intervals['status']:
+        Intervals['status'] = setInterval(config_dict['STATUS_UPDATE_INTERVAL'], update_status_messages)
 
 
 async def update_dynamic_status(status_message, status_object):
@@ -290,7 +462,7 @@ async def update_dynamic_status(status_message, status_object):
     emoji_index = 0
     while True:
         async with task_dict_lock:
-            if status_object.gid() not in task_dict:
+            if not task_dict.get_by_gid(status_object.gid()):
                 break
 
         progress = status_object.progress()
@@ -304,7 +476,7 @@ async def update_dynamic_status(status_message, status_object):
         text += f"**Speed:** `{status_object.speed()}`\n"
         text += f"**ETA:** `{status_object.eta()}`"
 
-        await editMessage(text, status_message)
+        await editMessage(text, status_message, priority=request_scheduler.STATUS)
 
         emoji_index = (emoji_index + 1) % len(emojis)
         await sleep(5)
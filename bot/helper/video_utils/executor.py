@@ -2,7 +2,6 @@ from __future__ import annotations
 from aiofiles import open as aiopen
 from aiofiles.os import path as aiopath, makedirs, listdir
 from aioshutil import move
-from ast import literal_eval
 from asyncio import create_subprocess_exec, sleep, gather, Event
 from asyncio.subprocess import PIPE
 from natsort import natsorted
@@ -10,9 +9,10 @@ from os import path as ospath, walk
 from time import time
 
 from bot import config_dict, task_dict, task_dict_lock, queue_dict_lock, non_queued_dl, LOGGER, VID_MODE, FFMPEG_NAME
-from bot.helper.ext_utils.bot_utils import sync_to_async, cmd_exec, new_task
+from bot.helper.ext_utils.bot_utils import sync_to_async, new_task
 from bot.helper.ext_utils.files_utils import get_path_size, clean_target
 from bot.helper.ext_utils.links_utils import get_url_name
+from bot.helper.ext_utils.media_probe import media_probe
 from bot.helper.ext_utils.media_utils import get_document_type, get_media_info, FFProgress
 from bot.helper.ext_utils.task_manager import check_running_tasks
 from bot.helper.listeners import tasks_listener as task
@@ -23,11 +23,8 @@ from bot.helper.video_utils.extra_selector import ExtraSelect
 
 
 async def get_metavideo(video_file):
-    stdout, stderr, rcode = await cmd_exec(['ffprobe', '-hide_banner', '-print_format', 'json', '-show_format', '-show_streams', video_file])
-    if rcode != 0:
-        LOGGER.error(stderr)
+    if not (metadata := await media_probe.get(video_file)):
         return {}, {}
-    metadata = literal_eval(stdout)
     return metadata.get('streams', {}), metadata.get('format', {})
 
 
@@ -1,63 +1,13 @@
-from bot import config_dict, LOGGER, task_dict_lock, task_dict, bot_loop
-from bot.helper.ext_utils.files_utils import get_path_size
-from bot.helper.mirror_utils.status_utils.video_status import VideoStatus
-import asyncio
-import json
-from time import time
+from bot import config_dict, LOGGER
+from bot.helper.ext_utils.media_probe import media_probe
 import os.path as ospath
-from aiofiles.os import rename as aiorename
 
 async def get_media_info(path):
-    """Get media information using ffprobe."""
-    try:
-        process = await asyncio.create_subprocess_exec(
-            'ffprobe', '-hide_banner', '-loglevel', 'error', '-print_format', 'json',
-            '-show_format', '-show_streams', path,
-            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
-        )
-        stdout, stderr = await process.communicate()
-        if process.returncode != 0:
-            LOGGER.error(f"ffprobe error: {stderr.decode().strip()}")
-            return None
-        return json.loads(stdout)
-    except Exception as e:
-        LOGGER.error(f"Exception while getting media info: {e}")
-        return None
-
-async def run_ffmpeg(command, path, listener):
-    """Run the generated ffmpeg command and report progress."""
-    total_size = await get_path_size(path)
-    media_info = await get_media_info(path)
-    total_duration = float(media_info['format'].get('duration', 1))
-
-    process = await asyncio.create_subprocess_exec(
-        *command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE
-    )
-
-    status = VideoStatus(listener, total_size, listener.mid, process)
-    async with task_dict_lock:
-        task_dict[listener.mid] = status
-
-    async def _log_stderr():
-        async for line in process.stderr:
-            LOGGER.info(f"ffmpeg: {line.decode().strip()}")
-
-    stderr_task = bot_loop.create_task(_log_stderr())
-    await process.wait()
-    stderr_task.cancel()
-
-    if process.returncode == 0:
-        LOGGER.info(f"Video processing successful: {command[-1]}")
-        return command[-1]
-    else:
-        LOGGER.error(f"ffmpeg exited with non-zero return code: {process.returncode}")
-        await listener.onUploadError(f"ffmpeg exited with non-zero return code: {process.returncode}")
-        return None
+    """Get media information from the shared ffprobe cache."""
+    return await media_probe.get(path)
 
-async def process_video(path, listener):
-    """Main function to process the video based on user's final logic."""
+async def process_video(path, listener, plan):
+    """Decide which streams to keep and record them in the remux plan; the file is rewritten later in one pass."""
     LOGGER.info("Starting video processing for: %s", path)
 
     if hasattr(listener, 'streams_kept') and listener.streams_kept:
@@ -134,33 +84,11 @@ async def process_video(path, listener):
          listener.art_streams = art_streams
          return path
 
-    cmd = ['ffmpeg', '-i', path, '-v', 'error']
-    for stream in streams_to_keep_in_ffmpeg:
-        cmd.extend(['-map', f'0:{stream["index"]}'])
-
-    cmd.extend(['-c', 'copy', '-avoid_negative_ts', 'make_zero', '-fflags', '+genpts', '-max_interleave_delta', '0'])
-
-    base_name, _ = path.rsplit('.', 1)
-    output_path = f"{base_name}.processed.mkv"
-    cmd.extend(['-f', 'matroska', '-y', output_path])
-
-    LOGGER.info("Running ffmpeg command: %s", " ".join(cmd))
-    processed_path = await run_ffmpeg(cmd, path, listener)
-
-    if processed_path:
-        final_path = processed_path.replace('.processed.mkv', '.mkv')
-        await aiorename(processed_path, final_path)
-        LOGGER.info("Video processing successful. Output: %s", final_path)
-
-        listener.streams_kept = main_video_streams + selected_audio
-        listener.art_streams = art_streams
-
-        kept_indices = {s['index'] for s in listener.streams_kept + listener.art_streams}
-        listener.streams_removed = [s for s in all_streams if s['index'] not in kept_indices]
-
-        LOGGER.info("Final decision: Kept %d streams, Removed %d streams.", len(listener.streams_kept), len(listener.streams_removed))
-
-        return final_path
-
-    return None
-
+    plan.maps = [stream['index'] for stream in streams_to_keep_in_ffmpeg]
+    plan.container = 'matroska'
+    listener.streams_kept = main_video_streams + selected_audio
+    listener.art_streams = art_streams
+    kept_indices = {s['index'] for s in listener.streams_kept + listener.art_streams}
+    listener.streams_removed = [s for s in all_streams if s['index'] not in kept_indices]
+    LOGGER.info("Final decision: Keep %d streams, Remove %d streams.", len(listener.streams_kept), len(listener.streams_removed))
+    return path
@@ -0,0 +1,98 @@
+from aiofiles.os import rename as aiorename
+from asyncio import create_subprocess_exec, gather
+from asyncio.subprocess import PIPE
+from os import path as ospath
+
+from bot import subprocess_lock, task_dict, task_dict_lock, LOGGER, FFMPEG_NAME
+from bot.helper.ext_utils.files_utils import clean_target
+from bot.helper.mirror_utils.status_utils.ffmpeg_status import FFMpegStatus
+
+
+class RemuxPlan:
+    """Stream-copy operations requested for one video, applied in a single ffmpeg pass.
+
+    process_video fills the stream map and container, editMetadata the title
+    and metadata cleanup, and a leech that needs splitting the segment cut
+    points; run() then rewrites the file once instead of once per step."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.maps: list[int] | None = None
+        self.container = ''
+        self.title = ''
+        self.clean_metadata = False
+        self.cuts: list[float] = []
+
+    @property
+    def needed(self):
+        return self.maps is not None or bool(self.title) or self.clean_metadata
+
+    @property
+    def extension(self):
+        return '.mkv' if self.container == 'matroska' else ospath.splitext(self.path)[1]
+
+    def command(self, outfile: str):
+        cmd = [FFMPEG_NAME, '-hide_banner', '-ignore_unknown', '-loglevel', 'error', '-i', self.path]
+        fflags = []
+        if self.clean_metadata:
+            fflags.append('+bitexact')
+            cmd.extend(['-flags:v', '+bitexact', '-flags:a', '+bitexact', '-map_metadata', '-1'])
+        if self.maps is not None:
+            for index in self.maps:
+                cmd.extend(['-map', f'0:{index}'])
+            fflags.append('+genpts')
+            cmd.extend(['-avoid_negative_ts', 'make_zero', '-max_interleave_delta', '0'])
+        else:
+            cmd.extend(['-map', '0:v:0?', '-map', '0:a:?', '-map', '0:s:?'])
+        if fflags:
+            cmd.extend(['-fflags', ''.join(fflags)])
+        if title := self.title:
+            cmd.extend(['-metadata', f'title={title}', '-metadata:s:v', f'title={title}', '-metadata:s:a', f'title={title}', '-metadata:s:s', f'title={title}'])
+        cmd.extend(['-c', 'copy'])
+        if self.cuts:
+            cmd.extend(['-map_chapters', '-1', '-f', 'segment', '-segment_times', ','.join(f'{cut:.6f}' for cut in self.cuts),
+                        '-segment_start_number', '1', '-reset_timestamps', '1'])
+            if self.container:
+                cmd.extend(['-segment_format', self.container])
+        elif self.container:
+            cmd.extend(['-f', self.container])
+        cmd.extend(['-y', outfile])
+        return cmd
+
+    def _outputs(self, base_name):
+        if self.cuts:
+            return f'{base_name}.part%03d{self.extension}', [f'{base_name}.part{i:03}{self.extension}' for i in range(1, len(self.cuts) + 2)]
+        outfile = f'{base_name}.remux{self.extension}'
+        return outfile, [outfile]
+
+    async def run(self, listener, gid: str):
+        """Return the rewritten path, the untouched path if only metadata edits failed, or None to abort.
+
+        With cut points the parts are written next to the source and the
+        source is removed, as split_file does."""
+        base_name = ospath.splitext(self.path)[0]
+        (outfile, outputs), final_path = self._outputs(base_name), f'{base_name}{self.extension}'
+        async with task_dict_lock:
+            task_dict[listener.mid] = FFMpegStatus(listener, None, gid, 'meta')
+        LOGGER.info('Remuxing (%s): %s', ' '.join(self.command(outfile)[5:]), self.path)
+        async with subprocess_lock:
+            if listener.suproc == 'cancelled':
+                return None
+            listener.suproc = await create_subprocess_exec(*self.command(outfile), stderr=PIPE)
+        _, stderr = await listener.suproc.communicate()
+        code = listener.suproc.returncode
+        if code == -9:
+            await gather(*[clean_target(output) for output in outputs])
+            return None
+        if code != 0:
+            LOGGER.error('%s. Remux failed, Path %s', stderr.decode().strip(), self.path)
+            await gather(*[clean_target(output) for output in outputs])
+            if self.maps is not None:
+                await listener.onUploadError(f'ffmpeg exited with non-zero return code: {code}')
+                return None
+            return self.path
+        await clean_target(self.path)
+        if not self.cuts:
+            await aiorename(outfile, final_path)
+        listener.seed = False
+        return final_path
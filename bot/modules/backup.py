@@ -1,5 +1,5 @@
-from asyncio import sleep, gather
-from pyrogram import Client
+from asyncio import gather, sleep
+from pyrogram import Client, raw
 from pyrogram.enums import ChatMemberStatus
 from pyrogram.filters import command, regex
 from pyrogram.handlers import MessageHandler, CallbackQueryHandler
@@ -9,6 +9,7 @@ from time import time
 
 from bot import bot, bot_name, bot_dict, bot_lock, config_dict, user_data
 from bot.helper.ext_utils.bot_utils import new_task
+from bot.helper.ext_utils.checkpoints import checkpoints
 from bot.helper.ext_utils.commons_check import UseCheck
 from bot.helper.ext_utils.conf_loads import intialize_savebot
 from bot.helper.ext_utils.status_utils import get_readable_time, get_progress_bar_string
@@ -18,6 +19,7 @@ from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.message_utils import sendMessage, editMessage, deleteMessage, sendingMessage, handle_message, auto_delete_message
 
 hanlder_dict = {}
+FETCH_SIZE, SEND_SIZE, FETCH_RETRIES = 200, 100, 3
 
 
 class Backup:
@@ -81,39 +83,89 @@ async def backup_message(client: Client, message: Message):
     backup.ID = int(des_id)
     hanlder_dict[message.id] = backup
     cmsg = await sendMessage('Starting copy message(s)...', message, buttons.build_menu(3))
-    await sleep(2)
     succ = fail = empy = 0
-    status, first_id = 'Done', None
+    status, first_id, start, end = 'Done', None, int(start), int(end)
     same_id = source_id == des_id
-    count_time = time()
+    key = f'{source_id}_{des_id}'
+    if (checkpoint := await checkpoints.load('backup', key)) and checkpoint['start'] == start and checkpoint['end'] == end:
+        succ, fail, empy, first_id = checkpoint['succ'], checkpoint['fail'], checkpoint['empy'], checkpoint['first_id']
+        next_id = checkpoint['last'] + 1
+    else:
+        next_id = start
+    total_msg, processed = end - start + 1, next_id - start
+    run_time = count_time = time()
+    run_start = processed
 
     @handle_message
     async def _copy(chat_id: int, message: Message):
         return await Bot.copy_message(chat_id, message.chat.id, message.id, disable_notification=True)
 
     @handle_message
-    async def _get(message_id: int):
-        return await Bot.get_messages(int(source_id), message_id)
+    async def _forward(chat_id: int, message_ids: list[int]):
+        r = await Bot.invoke(raw.functions.messages.ForwardMessages(from_peer=await Bot.resolve_peer(int(source_id)),
+                                                                    id=message_ids,
+                                                                    random_id=[Bot.rnd_id() for _ in message_ids],
+                                                                    to_peer=await Bot.resolve_peer(chat_id),
+                                                                    silent=True,
+                                                                    drop_author=True))
+        return [update.message.id for update in r.updates if isinstance(update, (raw.types.UpdateNewMessage, raw.types.UpdateNewChannelMessage))]
+
+    @handle_message
+    async def _get(message_ids: list[int]):
+        return await Bot.get_messages(int(source_id), message_ids)
 
-    ids = list(range(int(start), int(end) + 1))
-    total_msg = len(ids)
-    for x, id_ in enumerate(ids, 1):
-        msg = await _get(id_)
+    @handle_message
+    async def _delete(chat_id: int, message_ids: list[int]):
+        return await Bot.delete_messages(chat_id, message_ids)
+
+    reached = False
+    for batch_start in range(next_id, end + 1, FETCH_SIZE):
         if backup.CANCEL:
-            status = f'Cancelled ({total_msg - x})'
+            status = f'Cancelled ({total_msg - processed})'
+            break
+        ids = list(range(batch_start, min(batch_start + FETCH_SIZE, end + 1)))
+        for attempt in range(1, FETCH_RETRIES + 1):
+            if isinstance(fetched := await _get(ids), list):
+                break
+            await sleep(attempt * 5)
+        else:
+            status = f'Stopped at {ids[0]}, unable to get messages. Run again to resume'
+            break
+        selected = []
+        for msg in fetched:
+            if not msg or msg.empty:
+                empy += 1
+                continue
+            if same_id and first_id and msg.id >= first_id:
+                reached = True
+                break
+            if (typee := backup.TYPE) and typee != 'all' and not getattr(msg, typee, None):
+                continue
+            selected.append(msg)
+
+        for index in range(0, len(selected), SEND_SIZE):
+            msgs = selected[index:index + SEND_SIZE]
+            if (copied := await _forward(int(des_id), [msg.id for msg in msgs])) is None:
+                copied = [copyed.id for msg in msgs if (copyed := await _copy(int(des_id), msg))]
+            succ += len(copied)
+            fail += len(msgs) - len(copied)
+            if same_id:
+                if copied and not first_id:
+                    first_id = copied[0]
+                await _delete(int(des_id), [msg.id for msg in msgs])
+
+        processed += len(ids)
+        await checkpoints.save('backup', key, {'start': start, 'end': end, 'last': ids[-1], 'succ': succ, 'fail': fail, 'empy': empy, 'first_id': first_id})
+        if reached:
             break
-        if msg.empty:
-            empy += 1
-            continue
-        if (typee := backup.TYPE) and typee != 'all' and not getattr(msg, typee, None):
-            continue
         if time() - count_time > 10:
-            progress = f'{round(x / total_msg * 100, 2)}%'
+            progress = f'{round(processed / total_msg * 100, 2)}%'
             text = (f'<b>┌ <i>Copying Message...</i></b>\n'
                     f'<b>├ </b>{get_progress_bar_string(progress)}\n'
                     f'<b>├ Progress:</b> {progress}\n'
-                    f'<b>├ Processed:</b> {x}\n'
+                    f'<b>├ Processed:</b> {processed}\n'
                     f'<b>├ Total:</b> {total_msg}\n'
+                    f'<b>├ Speed:</b> {(processed - run_start) / (time() - run_time):.2f} msg/s\n'
                     f'<b>├ Elapsed:</b> {get_readable_time(time() - message.date.timestamp())}\n'
                     f'<b>├ Source:</b> {stitle}\n'
                     f'<b>├ Destination:</b> {dtitle}\n'
@@ -122,18 +174,8 @@ async def backup_message(client: Client, message: Message):
             await editMessage(text, cmsg, buttons.build_menu(3))
             count_time = time()
 
-        if same_id and msg.id == first_id:
-            break
-        if copyed := await _copy(int(des_id), msg):
-            await sleep(10)
-            succ += 1
-            if same_id and not first_id:
-                first_id = copyed.id
-        else:
-            fail += 1
-        if same_id:
-            await deleteMessage(msg)
-
+    if status == 'Done':
+        await checkpoints.clear('backup', key)
     del hanlder_dict[message.id]
     text = (f'<b>Backup Message {status}!</b>\n'
             f'<b>┌ By:</b> {message.from_user.mention}\n'
@@ -143,6 +185,7 @@ async def backup_message(client: Client, message: Message):
             f'<b>├ Success:</b> {succ}\n'
             f'<b>├ Empty:</b> {empy}\n'
             f'<b>├ Failed:</b> {fail}\n'
+            f'<b>├ Speed:</b> {(processed - run_start) / max(time() - run_time, 1):.2f} msg/s\n'
             f'<b>├ Client:</b> {"USER" if is_session else "BOT"}\n'
             f'<b>└ Time Taken:</b> {get_readable_time(time() - message.date.timestamp())}')
     await gather(deleteMessage(cmsg), sendingMessage(text, message, choice(config_dict['IMAGE_COMPLETE'].split())))
@@ -15,7 +15,7 @@ from bot import (bot, bot_dict, bot_lock, aria2, config_dict, Intervals, aria2_o
                  LOGGER, DATABASE_URL, DRIVES_IDS, DRIVES_NAMES, INDEX_URLS, GLOBAL_EXTENSION_FILTER, SHORTENERES, SHORTENER_APIS)
 from bot.helper.ext_utils.argo_tunnel import ping_base_route, kill_route
 from bot.helper.ext_utils.bot_utils import setInterval, sync_to_async, new_thread, cmd_exec
-from bot.helper.ext_utils.conf_loads import default_values, load_config, intialize_userbot, intialize_savebot
+from bot.helper.ext_utils.conf_loads import default_values, load_config, intialize_userbot, intialize_savebot, intialize_helpers
 from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.files_utils import clean_target
 from bot.helper.ext_utils.jdownloader_booter import jdownloader
@@ -25,7 +25,7 @@ from bot.helper.stream_utils.web_services import server, start_server
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.filters import CustomFilters
-from bot.helper.telegram_helper.message_utils import sendFile, sendMessage, sendingMessage, editMessage, editPhoto, deleteMessage, update_status_message
+from bot.helper.telegram_helper.message_utils import sendFile, sendMessage, sendingMessage, editMessage, editPhoto, deleteMessage, update_status_messages
 from bot.modules.rss import addJob
 from bot.modules.torrent_search import initiate_search_tools
 
@@ -173,9 +173,8 @@ async def edit_variable(_, message: Message, omsg: Message, key: str):
     elif key == 'STATUS_UPDATE_INTERVAL':
         value = int(value)
         if len(task_dict) != 0 and (st := Intervals['status']):
-            for skey, intvl in list(st.items()):
-                intvl.cancel()
-                Intervals['status'][skey] = setInterval(value, update_status_message, skey)
+            st.cancel()
+            Intervals['status'] = setInterval(value, update_status_messages)
     elif key == 'TORRENT_TIMEOUT':
         value = int(value)
         downloads = await sync_to_async(aria2.get_downloads)
@@ -222,6 +221,8 @@ async def edit_variable(_, message: Message, omsg: Message, key: str):
         await intialize_savebot(value)
     elif key == 'USER_SESSION_STRING':
         await intialize_userbot()
+    elif key == 'LEECH_HELPER_TOKENS':
+        await intialize_helpers()
     LOGGER.info('Change var %s = %s: %s', key, value.__class__.__name__.upper(), value)
     await gather(update_buttons(omsg, 'var'), deleteMessage(message))
     if DATABASE_URL:
@@ -450,9 +451,8 @@ async def edit_bot_settings(client: Client, query: CallbackQuery):
                 async with bot_lock:
                     value = bot_dict['MAX_SPLIT_SIZE']
             if data[2] == 'STATUS_UPDATE_INTERVAL' and len(task_dict) != 0 and (st := Intervals['status']):
-                for key, intvl in list(st.items()):
-                    intvl.cancel()
-                    Intervals['status'][key] = setInterval(value, update_status_message, key)
+                st.cancel()
+                Intervals['status'] = setInterval(value, update_status_messages)
         elif data[2] == 'ARGO_TOKEN':
             await kill_route()
         elif data[2] == 'EXTENSION_FILTER':
@@ -498,6 +498,8 @@ async def edit_bot_settings(client: Client, query: CallbackQuery):
         LOGGER.info('Change var %s = %s: %s', data[2], value.__class__.__name__.upper(), value)
         if data[2] == 'USER_SESSION_STRING':
             await intialize_userbot()
+        elif data[2] == 'LEECH_HELPER_TOKENS':
+            await intialize_helpers()
         await update_buttons(message, 'var')
         if DATABASE_URL:
             await DbManager().update_config({data[2]: value})
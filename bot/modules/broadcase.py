@@ -1,15 +1,102 @@
-from asyncio import sleep
+from asyncio import gather, Semaphore
+from pyrogram.errors import UserBlocked, UserDeactivatedBan, UserDeactivated, UserIsBlocked, InputUserDeactivated
 from pyrogram.filters import command
 from pyrogram.handlers import MessageHandler
 from pyrogram.types import Message
 from time import time
 
-from bot import bot, user_data, OWNER_ID
+from bot import bot, user_data, DATABASE_URL, OWNER_ID, LOGGER
 from bot.helper.ext_utils.bot_utils import new_task
+from bot.helper.ext_utils.db_handler import DbManager
 from bot.helper.ext_utils.status_utils import get_readable_time
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.filters import CustomFilters
-from bot.helper.telegram_helper.message_utils import sendMessage, editMessage, copyMessage, sendCustom
+from bot.helper.telegram_helper.message_utils import sendMessage, sendCustom, editMessage, request_scheduler
+
+BATCH_SIZE, WORKERS = 100, 10
+_BLOCKED = (UserBlocked, UserDeactivatedBan, UserDeactivated, UserIsBlocked, InputUserDeactivated)
+_running = {}
+
+
+class BroadcastJob:
+    """Sends one broadcast to a fixed user list in batches.
+
+    Sends run WORKERS at a time through the request scheduler's broadcast
+    class. After every batch the cursor and counters are written to the
+    database, so a restart resumes from the last batch."""
+
+    def __init__(self, job: dict):
+        self._job = job
+        self._semaphore = Semaphore(WORKERS)
+        self._status = None
+
+    async def _send(self, user_id):
+        job = self._job
+        if job['message_id']:
+            call = lambda: bot.copy_message(user_id, job['from_chat'], job['message_id'], disable_notification=True)
+        else:
+            call = lambda: bot.send_message(user_id, job['text'], disable_notification=True, disable_web_page_preview=True)
+        async with self._semaphore:
+            try:
+                await request_scheduler.submit(call, user_id, request_scheduler.BROADCAST)
+                return 'sent'
+            except _BLOCKED:
+                return 'blocked'
+            except Exception:
+                return 'failed'
+
+    def _text(self, title, elapsed, done):
+        job = self._job
+        total = len(job['users'])
+        speed = done / elapsed if elapsed else 0
+        text = (f'<b>{title}</b>\n'
+                f'<b>┌ Total:</b> {total}\n'
+                f'<b>├ Processed:</b> {job["cursor"]}\n'
+                f'<b>├ Success:</b> {job["sent"]}\n'
+                f'<b>├ Blocked:</b> {job["blocked"]}\n'
+                f'<b>├ Failed:</b> {job["failed"]}\n'
+                f'<b>├ Speed:</b> {speed:.2f} users/s\n')
+        if job['cursor'] < total:
+            text += f'<b>└ ETA:</b> {get_readable_time((total - job["cursor"]) / speed) if speed else "-"}'
+        else:
+            text += f'<b>└ Time Taken:</b> {get_readable_time(time() - job["started"])}'
+        return text
+
+    async def run(self):
+        job, users = self._job, self._job['users']
+        _running['job'] = self
+        start_cursor = job['cursor']
+        start_time = count_time = time()
+        self._status = await sendCustom(self._text('Sending Broadcast...', 0, 0), job['chat_id'])
+        try:
+            for index in range(job['cursor'], len(users), BATCH_SIZE):
+                batch = users[index:index + BATCH_SIZE]
+                results = dict(zip(batch, await gather(*[self._send(user_id) for user_id in batch])))
+                for result in results.values():
+                    job[result] += 1
+                job['cursor'] = index + len(batch)
+                if DATABASE_URL:
+                    if blocked := [user_id for user_id, result in results.items() if result == 'blocked']:
+                        await DbManager().delete_users(blocked)
+                    await DbManager().broadcast_update(job['cursor'], {key: job[key] for key in ('sent', 'blocked', 'failed')})
+                if self._status and time() - count_time > 10:
+                    await editMessage(self._text('Sending Broadcast...', time() - start_time, job['cursor'] - start_cursor), self._status)
+                    count_time = time()
+        finally:
+            _running.clear()
+        if DATABASE_URL:
+            await DbManager().broadcast_delete()
+        text = self._text('Broadcast Message Done!', time() - start_time, job['cursor'] - start_cursor)
+        if self._status:
+            await editMessage(text, self._status)
+        else:
+            await sendCustom(text, job['chat_id'])
+
+
+async def resume_broadcast():
+    if DATABASE_URL and not _running and (job := await DbManager().broadcast_get()):
+        LOGGER.info('Resuming broadcast from %s/%s users', job['cursor'], len(job['users']))
+        await BroadcastJob(job).run()
 
 
 @new_task
@@ -19,37 +106,31 @@ async def broadcast_message(_, message: Message):
     if not reply_to and len(args) == 1:
         await sendMessage('Please provide message along with command or reply the message', message)
         return
+    if _running:
+        await sendMessage('Another broadcast is still running!', message)
+        return
     users = {x for x in user_data if not user_data[x].get('is_auth')}
     if message.chat.type.name != 'PRIVATE':
         async for x in message.chat.get_members():
             if not x.user.is_bot or x.user.id != OWNER_ID:
                 users.add(x.user.id)
-    count = len(users)
-    msg = await sendMessage('<i>Checking user data, please wait...</i>', message)
-    await sleep(2)
-    if count:
-        await editMessage(f'<i>Found {count} entry</i>', msg)
-        await sleep(1)
-        await editMessage(f'<i>Sending brodcase message to {count} users, please wait...</i>', msg)
-        succ = fail = 0
-        for user_id in users:
-            if reply_to:
-                bmsg = await copyMessage(user_id, reply_to, nolog=True)
-            else:
-                bmsg = await sendCustom(args[1], user_id, nolog=True)
-
-            if bmsg:
-                succ += 1
-            else:
-                fail += 1
-        text = ('Broadcase Message Done!\n'
-                f'<b>Time Taken:</b> {get_readable_time(time() - message.date.timestamp())}\n'
-                f'<b>Total:</b> {count}\n'
-                f'<b>Success:</b> {succ}\n'
-                f'<b>Failed:</b> {fail}')
-    else:
-        text = 'Not found any user to send broadcse message!'
-    await editMessage(text, msg)
+    if not users:
+        await sendMessage('Not found any user to send broadcse message!', message)
+        return
+    job = {'_id': 'job',
+           'users': sorted(users),
+           'cursor': 0,
+           'sent': 0,
+           'blocked': 0,
+           'failed': 0,
+           'chat_id': message.chat.id,
+           'from_chat': reply_to.chat.id if reply_to else None,
+           'message_id': reply_to.id if reply_to else None,
+           'text': None if reply_to else args[1],
+           'started': message.date.timestamp()}
+    if DATABASE_URL:
+        await DbManager().broadcast_save(job)
+    await BroadcastJob(job).run()
 
 
 bot.add_handler(MessageHandler(broadcast_message, filters=command(BotCommands.BroadcaseCommand) & CustomFilters.owner))
@@ -64,12 +64,10 @@ async def cancel_multi(_, query: CallbackQuery):
 
 
 async def cancel_all(message: Message, status: str, user_id: int):
-    matches = await getAllTasks(status)
+    matches = await getAllTasks(status, user_id)
     if matches:
         success = 0
         for task in matches:
-            if user_id and task.listener.user_id != user_id:
-                continue
             obj = task.task()
             await obj.cancel_task()
             success += 1
@@ -163,12 +163,7 @@ class Mirror(TaskListener):
             b_msg = input_list[:1]
             self.options = ' '.join(input_list[1:]).replace(self.link, '')
             b_msg.append(f'{self.bulk[0]} -i {len(self.bulk)} {self.options}')
-            nextmsg = await sendMessage(' '.join(b_msg), self.message)
-            nextmsg = await self.client.get_messages(self.message.chat.id, nextmsg.id)
-            if self.message.from_user:
-                nextmsg.from_user = self.message.from_user
-            else:
-                nextmsg.sender_chat = self.message.sender_chat
+            nextmsg = self._sub_message(' '.join(b_msg))
             Mirror(self.client, nextmsg, self.isQbit, self.isJd, self.isLeech, self.vidMode, self.sameDir, self.bulk, self.multiTag, self.options).newEvent()
             await deleteMessage(self.editable)
             return
@@ -1,6 +1,6 @@
 from aiofiles.os import path as aiopath, makedirs
 from aiohttp import ClientSession
-from asyncio import sleep, gather, Event, wrap_future, wait_for
+from asyncio import gather, Event, wrap_future, wait_for
 from functools import partial
 from gtts import gTTS
 from os import path as ospath
@@ -235,8 +235,6 @@ class Misc(MiscTool):
                     await editMessage(f'{text}. <i>Sending the files...</i>', self.editable)
                     for png in pngs:
                         await sendPhoto(f'<code>{ospath.basename(png)}</code>', self.message, png)
-                        if len(pngs) > 1:
-                            await sleep(5)
                     await clean_target(dirpath)
                 else:
                     text = f'Failed getting thumbnail for <b>{text.title()}</b>!\n{self.error}'
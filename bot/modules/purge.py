@@ -1,4 +1,4 @@
-from asyncio import gather
+from asyncio import gather, Semaphore
 from pyrogram import Client
 from pyrogram.filters import command
 from pyrogram.handlers import MessageHandler
@@ -12,6 +12,8 @@ from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.filters import CustomFilters
 from bot.helper.telegram_helper.message_utils import sendMessage, editMessage, deleteMessage, handle_message
 
+PURGE_WORKERS = 4
+
 
 @new_task
 async def purge_message(client: Client, message: Message):
@@ -21,11 +23,15 @@ async def purge_message(client: Client, message: Message):
         await editMessage('Reply to a message to purge from.', msg)
         return
 
+    semaphore = Semaphore(PURGE_WORKERS)
+
     @handle_message
-    async def _delete(mid, nolog=True):
-        await client.delete_messages(message.chat.id, mid)
+    async def _delete(chat_id, mids, nolog=True):
+        async with semaphore:
+            await client.delete_messages(chat_id, mids)
 
-    await gather(*[_delete(mid) for mid in range(reply_to.id, message.id)])
+    mids = list(range(reply_to.id, message.id))
+    await gather(*[_delete(message.chat.id, mids[i:i + 100]) for i in range(0, len(mids), 100)])
     await gather(deleteMessage(message), editMessage(f'Purged message successfully in {get_readable_time(time() - message.date.timestamp()) or "0s"}.', msg))
 
 
@@ -17,7 +17,7 @@ from bot.modules.ytdlp import YtDlp
 incompte_dict = {}
 
 
-async def set_incomplte_task(cid, link):
+async def set_incomplte_task(cid, link, text=None, reply_id=None):
     message: Message = await bot.get_messages(cid, int(link.split('/')[-1]))
     if not message.empty:
         try:
@@ -30,6 +30,9 @@ async def set_incomplte_task(cid, link):
                     LOGGER.error(e)
             elif message.from_user.is_bot and (reply := message.reply_to_message):
                 message.from_user = reply.from_user
+            if text:
+                message.text = text
+                message.reply_to_message = await bot.get_messages(cid, reply_id) if reply_id else None
             uid = message.from_user.id
             incompte_dict.setdefault(uid, {'msgs': []})
             incompte_dict[uid]['msgs'].append(message)
@@ -74,7 +77,6 @@ async def start_resume_task(client: Client, tasks: list):
             Clone(client, message).newEvent()
         else:
             Mirror(client, message, isQbit, isJd, isLeech).newEvent()
-        await sleep(config_dict['MULTI_TIMEGAP'])
     incompte_dict.pop(user_id, None)
 
 
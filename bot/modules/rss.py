@@ -16,11 +16,10 @@ from bot import bot, scheduler, rss_dict, config_dict, LOGGER, DATABASE_URL
 from bot.helper.ext_utils.bot_utils import new_thread, new_task
 from bot.helper.ext_utils.help_messages import HelpString
 from bot.helper.ext_utils.db_handler import DbManager
-from bot.helper.ext_utils.exceptions import RssShutdownException
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.filters import CustomFilters
-from bot.helper.telegram_helper.message_utils import deleteMessage, editMessage, sendMessage, sendCustom, auto_delete_message, sendFile
+from bot.helper.telegram_helper.message_utils import deleteMessage, editMessage, sendMessage, sendCustom, auto_delete_message, sendFile, request_scheduler
 
 
 rss_dict_lock = Lock()
@@ -576,10 +575,6 @@ async def rssMonitor():
                     continue
                 feed_count = 0
                 while True:
-                    try:
-                        await sleep(10)
-                    except:
-                        raise RssShutdownException('Rss Monitor Stopped!')
                     try:
                         item_title = rss_d.entries[feed_count]['title']
                         try:
@@ -616,7 +611,7 @@ async def rssMonitor():
                         feed_msg = f"<b>Name: </b><code>{item_title.replace('>', '').replace('<', '')}</code>\n\n"
                         feed_msg += f"<b>Link: </b><code>{url}</code>"
                     feed_msg += f"\n<b>Tag: </b>{data['tag']} <code>{user}</code>"
-                    await sendCustom(feed_msg, config_dict['RSS_CHAT'])
+                    await sendCustom(feed_msg, config_dict['RSS_CHAT'], priority=request_scheduler.LOG)
                     feed_count += 1
                 async with rss_dict_lock:
                     if user not in rss_dict or not rss_dict[user].get(title, False):
@@ -625,9 +620,6 @@ async def rssMonitor():
                 await DbManager().rss_update(user)
                 LOGGER.info('Feed Name: %s', title)
                 LOGGER.info('Last item: %s', last_link)
-            except RssShutdownException as ex:
-                LOGGER.info(ex)
-                break
             except Exception as e:
                 LOGGER.error('%s - Feed Name: %s - Feed Link: %s', e, title, data['link'])
                 continue
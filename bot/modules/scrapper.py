@@ -1,6 +1,6 @@
 from aiofiles import open as aiopen
 from aiohttp import ClientSession
-from asyncio import sleep, gather, wait_for, Event
+from asyncio import gather, wait_for, Event
 from functools import partial
 from lxml.etree import HTML
 from pyrogram import Client
@@ -20,7 +20,7 @@ from bot.helper.ext_utils.status_utils import get_readable_time, get_date_time,
 from bot.helper.telegram_helper.bot_commands import BotCommands
 from bot.helper.telegram_helper.button_build import ButtonMaker
 from bot.helper.telegram_helper.filters import CustomFilters
-from bot.helper.telegram_helper.message_utils import auto_delete_message, sendMedia, sendMessage, copyMessage, deleteMessage, editMessage, sendingMessage
+from bot.helper.telegram_helper.message_utils import auto_delete_message, sendMedia, sendMessage, copyMessage, deleteMessage, editMessage, sendingMessage, request_scheduler
 
 
 class ScrapeHelper():
@@ -148,13 +148,12 @@ class ScrapeHelper():
             mode = '<b>├ Mode: </b>Magnet\n'
             for index, link in enumerate(links, 1):
                 await self._tasks_buttons(index, links)
-                msg = await sendMessage(f'<code>{link}</code>', self.message)
+                msg = await sendMessage(f'<code>{link}</code>', self.message, priority=request_scheduler.LOG)
                 if self._pm and self._isSuperGroup:
                     await copyMessage(self._user_id , msg)
                 if self.is_cancelled:
                     mode += f'<b>├ Executed: </b>{index} Link\n'
                     break
-                await sleep(5)
             await self._onScrapSuccess(len(links), mode)
         else:
             arg_base = {'link': '', '-au': '', '-ap': ''}
@@ -168,13 +167,12 @@ class ScrapeHelper():
                 mode = '<b>├ Mode: </b>Index\n'
                 for index, link in enumerate(links, 1):
                     await self._tasks_buttons(index, links)
-                    msg = await sendMessage(f'<code>{link}</code>', self.message)
+                    msg = await sendMessage(f'<code>{link}</code>', self.message, priority=request_scheduler.LOG)
                     if self._pm and self._isSuperGroup:
                         await copyMessage(self._user_id , msg)
                     if self.is_cancelled:
                         mode += f'<b>├ Executed: </b>{index} Link\n'
                         break
-                    await sleep(5)
                 await self._onScrapSuccess(len(links), mode)
             else:
                 await self._onScrapError('ERROR: Can\'t find any link!')
@@ -194,13 +192,12 @@ class ScrapeHelper():
             mode = '<b>├ Mode: </b>TXT File\n'
             for index, link in enumerate(links, 1):
                 await self._tasks_buttons(index, links)
-                msg = await sendMessage(f'<code>{link}</code>', self.message)
+                msg = await sendMessage(f'<code>{link}</code>', self.message, priority=request_scheduler.LOG)
                 if self._pm and self._isSuperGroup:
                     await copyMessage(self._user_id , msg)
                 if self.is_cancelled:
                     mode += f'<b>├ Executed: </b>{index} Link\n'
                     break
-                await sleep(5)
             await self._onScrapSuccess(len(links), mode)
         else:
             await self._onScrapError('ERROR: Can\'t find any link!')
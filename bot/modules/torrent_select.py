@@ -45,7 +45,7 @@ async def select(_, message: Message):
         qbselmsg = await sendMessage(f'{task.listener.tag}, this task is not for you!', message)
         await auto_delete_message(message, qbselmsg)
         return
-    if task.status() not in {MirrorStatus.STATUS_DOWNLOADING, MirrorStatus.STATUS_PAUSED, MirrorStatus.STATUS_QUEUEDL}:
+    if await sync_to_async(task.status) not in {MirrorStatus.STATUS_DOWNLOADING, MirrorStatus.STATUS_PAUSED, MirrorStatus.STATUS_QUEUEDL}:
         qbselmsg = await sendMessage(f'{task.listener.tag}, task should be in download or pause (incase message deleted by wrong) or queued (status incase you used torrent file)!', message)
         await auto_delete_message(message, qbselmsg)
         return
@@ -56,11 +56,11 @@ async def select(_, message: Message):
 
     try:
         if task.listener.isQbit:
-            id_ = task.hash()
+            id_ = await sync_to_async(task.hash)
             if not task.queued:
                 await sync_to_async(task.client.torrents_pause, torrent_hashes=id_)
         else:
-            id_ = task.gid()
+            id_ = await sync_to_async(task.gid)
             if not task.queued:
                 try:
                     await sync_to_async(aria2.client.force_pause, id_)